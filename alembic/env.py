@@ -29,8 +29,14 @@ if config.config_file_name is not None:
 # Import models so they are registered on SQLModel.metadata
 try:
     from app.models.hardware import Hardware  # noqa: F401
-    from app.models.audit_log import AuditLog  # noqa: F401
+    from app.models.access_log import AccessLog  # noqa: F401
+    from app.models.entity_change import EntityChange  # noqa: F401
     from app.models.user import User  # noqa: F401
+    from app.models.revoked_session import RevokedSession  # noqa: F401
+    from app.models.request_rollup import RequestRollup  # noqa: F401
+    from app.models.hardware_snapshot import HardwareSnapshot, HardwareSnapshotItem  # noqa: F401
+    from app.models.slow_query import SlowQuery  # noqa: F401
+    from app.models.job import Job  # noqa: F401
 except ImportError:
     # It's okay to proceed; metadata may simply be empty if models can't be imported
     pass
@@ -0,0 +1,146 @@
+"""partition audit_logs by month
+
+Converts audit_logs into a table range-partitioned on "timestamp" by month.
+Each month is sub-partitioned by LIST ((action IS NULL)) into an _access leaf
+(request logs) and a _changes leaf (entity change history), so retention can
+drop old access logs without touching change history.
+
+Revision ID: 5a7e1c9d3b42
+Revises: 3f9d2c41b7a0
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from datetime import date
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5a7e1c9d3b42'
+down_revision: Union[str, None] = '3f9d2c41b7a0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+MONTHS_AHEAD = 3
+
+COLUMNS = (
+    'id, method, path, query_params, user_agent, remote_addr, status_code, response_time_ms, '
+    'user_id, username, "timestamp", error_message, request_body_size, response_body_size, '
+    'action, entity_name, entity_id, changes'
+)
+
+INDEXES = [
+    ('ix_audit_logs_id', 'id'),
+    ('ix_audit_logs_timestamp', '"timestamp"'),
+    ('ix_audit_logs_action', 'action'),
+    ('ix_audit_logs_entity_name', 'entity_name'),
+    ('ix_audit_logs_entity_id', 'entity_id'),
+]
+
+
+def _add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _create_month_partition(month: date) -> None:
+    name = f"audit_logs_y{month.year:04d}m{month.month:02d}"
+    upper = _add_months(month, 1)
+    op.execute(
+        f"CREATE TABLE {name} PARTITION OF audit_logs "
+        f"FOR VALUES FROM ('{month.isoformat()}') TO ('{upper.isoformat()}') "
+        f"PARTITION BY LIST ((action IS NULL))"
+    )
+    op.execute(f"CREATE TABLE {name}_access PARTITION OF {name} FOR VALUES IN (true)")
+    op.execute(f"CREATE TABLE {name}_changes PARTITION OF {name} FOR VALUES IN (false)")
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+
+    for index_name, _ in INDEXES:
+        op.execute(f"DROP INDEX IF EXISTS {index_name}")
+    op.execute("ALTER TABLE audit_logs RENAME TO audit_logs_legacy")
+    op.execute("ALTER TABLE audit_logs_legacy RENAME CONSTRAINT audit_logs_pkey TO audit_logs_legacy_pkey")
+
+    # No primary key: unique constraints can't cover an expression partition key.
+    # ids still come from the existing sequence and are indexed below.
+    op.execute("""
+        CREATE TABLE audit_logs (
+            id BIGINT NOT NULL DEFAULT nextval('audit_logs_id_seq'),
+            method VARCHAR(10) NOT NULL,
+            path VARCHAR(500) NOT NULL,
+            query_params TEXT,
+            user_agent VARCHAR(500),
+            remote_addr VARCHAR(45),
+            status_code INTEGER NOT NULL,
+            response_time_ms FLOAT,
+            user_id VARCHAR(255),
+            username VARCHAR(255),
+            "timestamp" TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            error_message TEXT,
+            request_body_size INTEGER,
+            response_body_size INTEGER,
+            action VARCHAR(50),
+            entity_name VARCHAR(255),
+            entity_id VARCHAR(255),
+            changes JSON
+        ) PARTITION BY RANGE ("timestamp")
+    """)
+    op.execute("ALTER SEQUENCE audit_logs_id_seq AS BIGINT OWNED BY audit_logs.id")
+
+    oldest = bind.execute(sa.text('SELECT min("timestamp") FROM audit_logs_legacy')).scalar()
+    current_month = date.today().replace(day=1)
+    month = oldest.date().replace(day=1) if oldest else current_month
+    last_month = _add_months(current_month, MONTHS_AHEAD)
+    while month <= last_month:
+        _create_month_partition(month)
+        month = _add_months(month, 1)
+
+    # safety net for rows outside the pre-created range
+    op.execute("CREATE TABLE audit_logs_default PARTITION OF audit_logs DEFAULT")
+
+    select_columns = COLUMNS.replace('"timestamp"', 'COALESCE("timestamp", CURRENT_TIMESTAMP)')
+    op.execute(f"INSERT INTO audit_logs ({COLUMNS}) SELECT {select_columns} FROM audit_logs_legacy")
+    op.execute("DROP TABLE audit_logs_legacy")
+
+    for index_name, column in INDEXES:
+        op.execute(f"CREATE INDEX {index_name} ON audit_logs ({column})")
+
+
+def downgrade() -> None:
+    for index_name, _ in INDEXES:
+        op.execute(f"DROP INDEX IF EXISTS {index_name}")
+    op.execute("ALTER TABLE audit_logs RENAME TO audit_logs_partitioned")
+
+    op.execute("""
+        CREATE TABLE audit_logs (
+            id INTEGER NOT NULL DEFAULT nextval('audit_logs_id_seq'),
+            method VARCHAR(10) NOT NULL,
+            path VARCHAR(500) NOT NULL,
+            query_params TEXT,
+            user_agent VARCHAR(500),
+            remote_addr VARCHAR(45),
+            status_code INTEGER NOT NULL,
+            response_time_ms FLOAT,
+            user_id VARCHAR(255),
+            username VARCHAR(255),
+            "timestamp" TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+            error_message TEXT,
+            request_body_size INTEGER,
+            response_body_size INTEGER,
+            action VARCHAR(50),
+            entity_name VARCHAR(255),
+            entity_id VARCHAR(255),
+            changes JSON,
+            CONSTRAINT audit_logs_pkey PRIMARY KEY (id)
+        )
+    """)
+    op.execute("ALTER SEQUENCE audit_logs_id_seq OWNED BY audit_logs.id")
+    op.execute(f"INSERT INTO audit_logs ({COLUMNS}) SELECT {COLUMNS} FROM audit_logs_partitioned")
+    op.execute("DROP TABLE audit_logs_partitioned CASCADE")
+
+    for index_name, column in INDEXES:
+        op.execute(f"CREATE INDEX {index_name} ON audit_logs ({column})")
@@ -0,0 +1,94 @@
+"""add request_rollups table
+
+Hourly (bucket, path, method, status_code) counters with latency sums and
+histograms, backfilled from the existing access logs.
+
+Revision ID: 8c2e4f6a1d93
+Revises: 5a7e1c9d3b42
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+from typing import List, Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c2e4f6a1d93'
+down_revision: Union[str, None] = '5a7e1c9d3b42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# The histogram layout of app/audit/histogram.py as of this revision, copied so
+# the migration does not import the app: 4 linear steps per power of two
+# starting at 1ms, bucket 0 below 1ms and the last bucket above the last bound.
+LATENCY_BOUNDS_MS = [2 ** exponent * (1 + step / 4) for exponent in range(16) for step in range(4)]
+
+
+def empty_histogram() -> List[int]:
+    return [0] * (len(LATENCY_BOUNDS_MS) + 1)
+
+
+def upgrade() -> None:
+    rollups = op.create_table('request_rollups',
+    sa.Column('bucket', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('path', sqlmodel.sql.sqltypes.AutoString(length=500), nullable=False),
+    sa.Column('method', sqlmodel.sql.sqltypes.AutoString(length=10), nullable=False),
+    sa.Column('status_code', sa.Integer(), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.Column('latency_sum_ms', sa.Float(), nullable=False),
+    sa.Column('latency_max_ms', sa.Float(), nullable=True),
+    sa.Column('histogram', sa.JSON(), nullable=True),
+    sa.PrimaryKeyConstraint('bucket', 'path', 'method', 'status_code')
+    )
+    op.create_index('ix_request_rollups_bucket', 'request_rollups', ['bucket'], unique=False)
+
+    # Backfill: aggregate access logs per hour and latency bucket in SQL,
+    # then fold the latency buckets into one histogram per row.
+    bounds = ", ".join(repr(float(bound)) for bound in LATENCY_BOUNDS_MS)
+    result = op.get_bind().execute(sa.text(f"""
+        SELECT date_trunc('hour', "timestamp") AS bucket, path, method, status_code,
+               width_bucket(COALESCE(response_time_ms, 0), ARRAY[{bounds}]::float8[]) AS latency_bucket,
+               count(*) AS count,
+               COALESCE(sum(response_time_ms), 0) AS latency_sum_ms,
+               max(response_time_ms) AS latency_max_ms
+        FROM audit_logs
+        WHERE action IS NULL AND "timestamp" IS NOT NULL
+        GROUP BY 1, 2, 3, 4, 5
+        ORDER BY 1, 2, 3, 4
+    """))
+
+    batch = []
+    current_key = None
+    current = None
+    for row in result:
+        key = (row.bucket, row.path, row.method, row.status_code)
+        if key != current_key:
+            if current is not None:
+                batch.append(current)
+            current_key = key
+            current = {
+                "bucket": row.bucket, "path": row.path, "method": row.method, "status_code": row.status_code,
+                "count": 0, "latency_sum_ms": 0.0, "latency_max_ms": None, "histogram": empty_histogram(),
+            }
+        current["count"] += row.count
+        current["latency_sum_ms"] += row.latency_sum_ms
+        if row.latency_max_ms is not None:
+            current["latency_max_ms"] = max(current["latency_max_ms"] or 0.0, row.latency_max_ms)
+        current["histogram"][row.latency_bucket] += row.count
+
+        if len(batch) >= 1000:
+            op.bulk_insert(rollups, batch)
+            batch = []
+
+    if current is not None:
+        batch.append(current)
+    if batch:
+        op.bulk_insert(rollups, batch)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_request_rollups_bucket', table_name='request_rollups')
+    op.drop_table('request_rollups')
@@ -0,0 +1,30 @@
+"""add request_rollups.logged_count
+
+Number of requests per rollup row that were written to access_logs. Rows
+recorded before access log sampling existed were all logged.
+
+Revision ID: a3d6f8b2c417
+Revises: f1c8e3a5b276
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3d6f8b2c417'
+down_revision: Union[str, None] = 'f1c8e3a5b276'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('request_rollups', sa.Column('logged_count', sa.Integer(), server_default='0', nullable=False))
+    op.execute("UPDATE request_rollups SET logged_count = count")
+
+
+def downgrade() -> None:
+    op.drop_column('request_rollups', 'logged_count')
@@ -0,0 +1,181 @@
+"""split audit_logs into access_logs and entity_changes
+
+access_logs is a lean append-only table for request logs, range-partitioned
+by month with a BRIN index on "timestamp". entity_changes holds the
+CREATE/UPDATE/DELETE history indexed for per-entity lookups. Rows are moved
+from audit_logs in id-range batches and audit_logs is dropped.
+
+Revision ID: b41d7e2f9c60
+Revises: 8c2e4f6a1d93
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from datetime import date
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b41d7e2f9c60'
+down_revision: Union[str, None] = '8c2e4f6a1d93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+MONTHS_AHEAD = 3
+BATCH_SIZE = 50000
+
+ACCESS_COLUMNS = (
+    'id, "timestamp", method, path, query_params, status_code, response_time_ms, user_id, username, '
+    'remote_addr, user_agent, error_message, request_body_size, response_body_size'
+)
+CHANGE_COLUMNS = (
+    'id, "timestamp", action, entity_name, entity_id, changes, user_id, username, method, path, '
+    'remote_addr, user_agent'
+)
+
+
+def _add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _move_in_batches(bind, insert_sql: str) -> None:
+    bounds = bind.execute(sa.text("SELECT min(id), max(id) FROM audit_logs")).one()
+    if bounds[0] is None:
+        return
+    low = bounds[0] - 1
+    while low < bounds[1]:
+        high = low + BATCH_SIZE
+        bind.execute(sa.text(insert_sql), {"low": low, "high": high})
+        low = high
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+
+    op.create_table('entity_changes',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('timestamp', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False),
+    sa.Column('action', sqlmodel.sql.sqltypes.AutoString(length=50), nullable=False),
+    sa.Column('entity_name', sqlmodel.sql.sqltypes.AutoString(length=255), nullable=False),
+    sa.Column('entity_id', sqlmodel.sql.sqltypes.AutoString(length=255), nullable=True),
+    sa.Column('changes', sa.JSON(), nullable=True),
+    sa.Column('user_id', sqlmodel.sql.sqltypes.AutoString(length=255), nullable=True),
+    sa.Column('username', sqlmodel.sql.sqltypes.AutoString(length=255), nullable=True),
+    sa.Column('method', sqlmodel.sql.sqltypes.AutoString(length=10), nullable=True),
+    sa.Column('path', sqlmodel.sql.sqltypes.AutoString(length=500), nullable=True),
+    sa.Column('remote_addr', sqlmodel.sql.sqltypes.AutoString(length=45), nullable=True),
+    sa.Column('user_agent', sqlmodel.sql.sqltypes.AutoString(length=500), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+    op.execute("CREATE SEQUENCE access_logs_id_seq AS BIGINT")
+    # the primary key has to include the partition key
+    op.execute("""
+        CREATE TABLE access_logs (
+            id BIGINT NOT NULL DEFAULT nextval('access_logs_id_seq'),
+            "timestamp" TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            method VARCHAR(10) NOT NULL,
+            path VARCHAR(500) NOT NULL,
+            query_params TEXT,
+            status_code INTEGER NOT NULL,
+            response_time_ms FLOAT,
+            user_id VARCHAR(255),
+            username VARCHAR(255),
+            remote_addr VARCHAR(45),
+            user_agent VARCHAR(500),
+            error_message TEXT,
+            request_body_size INTEGER,
+            response_body_size INTEGER,
+            CONSTRAINT access_logs_pkey PRIMARY KEY (id, "timestamp")
+        ) PARTITION BY RANGE ("timestamp")
+    """)
+    op.execute("ALTER SEQUENCE access_logs_id_seq OWNED BY access_logs.id")
+
+    oldest, newest = bind.execute(
+        sa.text('SELECT min("timestamp"), max("timestamp") FROM audit_logs WHERE action IS NULL')
+    ).one()
+    current_month = date.today().replace(day=1)
+    month = oldest.date().replace(day=1) if oldest else current_month
+    # up to the newest row too, so no copied row lands in the default partition,
+    # which would keep its month's partition from being created later
+    last_month = max(_add_months(current_month, MONTHS_AHEAD), newest.date().replace(day=1) if newest else current_month)
+    while month <= last_month:
+        op.execute(
+            f"CREATE TABLE access_logs_y{month.year:04d}m{month.month:02d} PARTITION OF access_logs "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{_add_months(month, 1).isoformat()}')"
+        )
+        month = _add_months(month, 1)
+    op.execute("CREATE TABLE access_logs_default PARTITION OF access_logs DEFAULT")
+
+    _move_in_batches(
+        bind,
+        f"INSERT INTO access_logs ({ACCESS_COLUMNS}) SELECT {ACCESS_COLUMNS} FROM audit_logs "
+        f"WHERE action IS NULL AND id > :low AND id <= :high",
+    )
+    _move_in_batches(
+        bind,
+        f"INSERT INTO entity_changes ({CHANGE_COLUMNS}) SELECT {CHANGE_COLUMNS} FROM audit_logs "
+        f"WHERE action IS NOT NULL AND id > :low AND id <= :high",
+    )
+
+    # indexes after the copy, it's faster than maintaining them row by row
+    op.execute('CREATE INDEX ix_access_logs_timestamp_brin ON access_logs USING brin ("timestamp")')
+    op.create_index('ix_entity_changes_entity_timestamp', 'entity_changes', ['entity_name', 'entity_id', 'timestamp'], unique=False)
+
+    op.execute("SELECT setval('access_logs_id_seq', COALESCE((SELECT max(id) FROM access_logs), 0) + 1, false)")
+    op.execute("SELECT setval('entity_changes_id_seq', COALESCE((SELECT max(id) FROM entity_changes), 0) + 1, false)")
+
+    op.execute("DROP TABLE audit_logs CASCADE")
+
+
+def downgrade() -> None:
+    op.create_table('audit_logs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('method', sqlmodel.sql.sqltypes.AutoString(length=10), nullable=False),
+    sa.Column('path', sqlmodel.sql.sqltypes.AutoString(length=500), nullable=False),
+    sa.Column('query_params', sa.Text(), nullable=True),
+    sa.Column('user_agent', sqlmodel.sql.sqltypes.AutoString(length=500), nullable=True),
+    sa.Column('remote_addr', sqlmodel.sql.sqltypes.AutoString(length=45), nullable=True),
+    sa.Column('status_code', sa.Integer(), nullable=False),
+    sa.Column('response_time_ms', sa.Float(), nullable=True),
+    sa.Column('user_id', sqlmodel.sql.sqltypes.AutoString(length=255), nullable=True),
+    sa.Column('username', sqlmodel.sql.sqltypes.AutoString(length=255), nullable=True),
+    sa.Column('timestamp', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+    sa.Column('error_message', sa.Text(), nullable=True),
+    sa.Column('request_body_size', sa.Integer(), nullable=True),
+    sa.Column('response_body_size', sa.Integer(), nullable=True),
+    sa.Column('action', sqlmodel.sql.sqltypes.AutoString(length=50), nullable=True),
+    sa.Column('entity_name', sqlmodel.sql.sqltypes.AutoString(length=255), nullable=True),
+    sa.Column('entity_id', sqlmodel.sql.sqltypes.AutoString(length=255), nullable=True),
+    sa.Column('changes', sa.JSON(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+    # ids of the two tables overlap, so they get new ids on the way back
+    op.execute(
+        f"INSERT INTO audit_logs ({ACCESS_COLUMNS.replace('id, ', '', 1)}) "
+        f"SELECT {ACCESS_COLUMNS.replace('id, ', '', 1)} FROM access_logs ORDER BY id"
+    )
+    op.execute(
+        "INSERT INTO audit_logs (\"timestamp\", action, entity_name, entity_id, changes, user_id, username, "
+        "method, path, remote_addr, user_agent, status_code) "
+        "SELECT \"timestamp\", action, entity_name, entity_id, changes, user_id, username, "
+        "COALESCE(method, ''), COALESCE(path, ''), remote_addr, user_agent, 200 FROM entity_changes ORDER BY id"
+    )
+
+    for index_name, column in [
+        ('ix_audit_logs_id', 'id'),
+        ('ix_audit_logs_timestamp', 'timestamp'),
+        ('ix_audit_logs_action', 'action'),
+        ('ix_audit_logs_entity_name', 'entity_name'),
+        ('ix_audit_logs_entity_id', 'entity_id'),
+    ]:
+        op.create_index(index_name, 'audit_logs', [column], unique=False)
+
+    op.drop_index('ix_entity_changes_entity_timestamp', table_name='entity_changes')
+    op.drop_table('entity_changes')
+    op.execute("DROP TABLE access_logs CASCADE")
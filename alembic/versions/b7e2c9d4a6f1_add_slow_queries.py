@@ -0,0 +1,39 @@
+"""add slow_queries table
+
+Revision ID: b7e2c9d4a6f1
+Revises: a3d6f8b2c417
+Create Date: 2026-10-19 17:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e2c9d4a6f1'
+down_revision: Union[str, None] = 'a3d6f8b2c417'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('slow_queries',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('timestamp', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False),
+    sa.Column('duration_ms', sa.Float(), nullable=False),
+    sa.Column('statement', sa.Text(), nullable=False),
+    sa.Column('parameters', sa.JSON(), nullable=True),
+    sa.Column('method', sqlmodel.sql.sqltypes.AutoString(length=10), nullable=True),
+    sa.Column('path', sqlmodel.sql.sqltypes.AutoString(length=500), nullable=True),
+    sa.Column('username', sqlmodel.sql.sqltypes.AutoString(length=255), nullable=True),
+    sa.Column('plan', sa.Text(), nullable=True),
+    sa.Column('plan_analyzed', sa.Boolean(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('slow_queries')
@@ -0,0 +1,148 @@
+"""compact entity change payloads
+
+entity_changes.changes becomes JSONB, and existing payloads are rewritten
+in id batches from str() values into the typed format of app.audit.codec.
+
+The conversion is a copy of the codec as of this revision, with the column
+types of the audited models frozen below, so the migration neither needs
+the app's settings nor changes when the models or the codec do.
+
+Revision ID: d7a3c5e91f28
+Revises: b41d7e2f9c60
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+import base64
+import gzip
+import json
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional, Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+try:
+    import zstandard
+except ImportError:  # only needed to downgrade payloads the app compressed with zstd
+    zstandard = None
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd7a3c5e91f28'
+down_revision: Union[str, None] = 'b41d7e2f9c60'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 5000
+FORMAT_VERSION = 2
+
+# Non-string columns of the entities audited up to this revision. The enums
+# (ModelEnum, StatusEnum) have member names equal to their values.
+LEGACY_COLUMN_KINDS: Dict[str, Dict[str, str]] = {
+    'Hardware': {
+        'id': 'int', 'model': 'enum', 'status': 'enum', 'missing': 'bool',
+        'created_at': 'datetime', 'updated_at': 'datetime', 'shipped_at': 'datetime',
+    },
+    'User': {
+        'id': 'int', 'is_active': 'bool', 'login_count': 'int', 'ad_last_sync': 'datetime', 'last_login': 'datetime',
+        'session_expires': 'datetime', 'created_at': 'datetime', 'updated_at': 'datetime',
+    },
+    'RevokedSession': {'expires_at': 'datetime', 'revoked_at': 'datetime'},
+}
+
+
+def _legacy_value(value: Any) -> Any:
+    return None if value == 'None' else value
+
+
+def _parse_legacy_value(text: Any, kind: Optional[str]) -> Any:
+    """Best-effort conversion of a version 1 str() value back to a typed value."""
+    if text is None or text == 'None':
+        return None
+    if not isinstance(text, str) or kind is None:
+        return text
+    try:
+        if kind == 'enum':
+            # str() of an enum member is "ClassName.MEMBER"
+            return text.split('.', 1)[1] if '.' in text else text
+        if kind == 'bool':
+            return text == 'True'
+        if kind == 'int':
+            return int(text)
+        if kind == 'datetime':
+            return datetime.fromisoformat(text).isoformat()
+    except (TypeError, ValueError):
+        return text
+    return text
+
+
+def _upgrade_legacy_payload(action: str, payload: Dict[str, Any], kinds: Dict[str, str]) -> Dict[str, Any]:
+    def typed(field: str, value: Any) -> Any:
+        return _parse_legacy_value(_legacy_value(value), kinds.get(field))
+
+    if action == 'UPDATE':
+        return {'v': FORMAT_VERSION, 'd': {
+            field: [typed(field, values.get('old')), typed(field, values.get('new'))]
+            for field, values in payload.items()
+            if isinstance(values, dict)
+        }}
+    key, packed_key = ('new_values', 'new') if action == 'CREATE' else ('old_values', 'old')
+    values = {field: typed(field, value) for field, value in (payload.get(key) or {}).items()}
+    return {'v': FORMAT_VERSION, packed_key: {field: value for field, value in values.items() if value is not None}}
+
+
+def _decode_payload(action: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+    codec = payload.get('z')
+    if codec:
+        data = base64.b64decode(payload['data'])
+        if codec == 'zstd':
+            if zstandard is None:
+                raise RuntimeError('zstandard is required to downgrade compressed audit entries')
+            payload = json.loads(zstandard.decompress(data))
+        else:
+            payload = json.loads(gzip.decompress(data))
+
+    if action == 'UPDATE':
+        return {key: {'old': old, 'new': new} for key, (old, new) in payload.get('d', {}).items()}
+    if action == 'CREATE':
+        return {'new_values': payload.get('new', {})}
+    return {'old_values': payload.get('old', {})}
+
+
+def _rewrite_in_batches(bind, where: str, convert: Callable[[sa.Row], dict]) -> None:
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.text(
+                f"SELECT id, action, entity_name, changes FROM entity_changes "
+                f"WHERE id > :last_id AND changes IS NOT NULL AND {where} ORDER BY id LIMIT :limit"
+            ),
+            {"last_id": last_id, "limit": BATCH_SIZE},
+        ).all()
+        if not rows:
+            return
+        bind.execute(
+            sa.text("UPDATE entity_changes SET changes = CAST(:changes AS JSONB) WHERE id = :id"),
+            [{"id": row.id, "changes": json.dumps(convert(row))} for row in rows],
+        )
+        last_id = rows[-1].id
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE entity_changes ALTER COLUMN changes TYPE JSONB USING changes::jsonb")
+
+    _rewrite_in_batches(
+        op.get_bind(),
+        "changes->'v' IS NULL",
+        lambda row: _upgrade_legacy_payload(row.action, row.changes, LEGACY_COLUMN_KINDS.get(row.entity_name, {})),
+    )
+
+
+def downgrade() -> None:
+    # back to the {field: {old, new}} / new_values / old_values layout, values stay typed
+    _rewrite_in_batches(
+        op.get_bind(),
+        "changes->'v' IS NOT NULL",
+        lambda row: _decode_payload(row.action, row.changes),
+    )
+    op.execute("ALTER TABLE entity_changes ALTER COLUMN changes TYPE JSON USING changes::json")
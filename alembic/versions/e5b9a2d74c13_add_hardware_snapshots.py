@@ -0,0 +1,42 @@
+"""add hardware_snapshots tables
+
+Revision ID: e5b9a2d74c13
+Revises: d7a3c5e91f28
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5b9a2d74c13'
+down_revision: Union[str, None] = 'd7a3c5e91f28'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('hardware_snapshots',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('taken_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False),
+    sa.Column('last_change_id', sa.Integer(), nullable=False),
+    sa.Column('item_count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_hardware_snapshots_taken_at'), 'hardware_snapshots', ['taken_at'], unique=False)
+    op.create_table('hardware_snapshot_items',
+    sa.Column('snapshot_id', sa.Integer(), nullable=False),
+    sa.Column('hardware_id', sa.Integer(), nullable=False),
+    sa.Column('state', sa.JSON(), nullable=False),
+    sa.ForeignKeyConstraint(['snapshot_id'], ['hardware_snapshots.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('snapshot_id', 'hardware_id')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('hardware_snapshot_items')
+    op.drop_index(op.f('ix_hardware_snapshots_taken_at'), table_name='hardware_snapshots')
+    op.drop_table('hardware_snapshots')
@@ -0,0 +1,69 @@
+"""add audit explorer indexes
+
+Composite indexes ending in ("timestamp", id) for the keyset-paged audit
+explorer. On the partitioned access_logs each partition is indexed
+CONCURRENTLY and attached to an index created ON ONLY the parent, so
+writes are not blocked while large partitions are indexed. Partitions
+created later inherit the indexes.
+
+Revision ID: f1c8e3a5b276
+Revises: e5b9a2d74c13
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1c8e3a5b276'
+down_revision: Union[str, None] = 'e5b9a2d74c13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+ACCESS_LOG_INDEXES = [
+    ('ix_access_logs_timestamp_id', '"timestamp", id'),
+    ('ix_access_logs_username_timestamp', 'username, "timestamp", id'),
+    ('ix_access_logs_status_code_timestamp', 'status_code, "timestamp", id'),
+    ('ix_access_logs_path_timestamp', 'path varchar_pattern_ops, "timestamp"'),
+]
+ENTITY_CHANGE_INDEXES = [
+    ('ix_entity_changes_timestamp_id', '"timestamp", id'),
+    ('ix_entity_changes_username_timestamp', 'username, "timestamp", id'),
+]
+
+
+def upgrade() -> None:
+    partitions = op.get_bind().execute(sa.text(
+        "SELECT child.relname FROM pg_inherits "
+        "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+        "WHERE pg_inherits.inhparent = 'access_logs'::regclass"
+    )).scalars().all()
+
+    for index_name, columns in ACCESS_LOG_INDEXES:
+        # invalid until every partition index is attached
+        op.execute(f"CREATE INDEX {index_name} ON ONLY access_logs ({columns})")
+
+    with op.get_context().autocommit_block():
+        for partition in partitions:
+            for index_name, columns in ACCESS_LOG_INDEXES:
+                op.execute(
+                    f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {partition}_{index_name[len('ix_access_logs_'):]} "
+                    f"ON {partition} ({columns})"
+                )
+        for index_name, columns in ENTITY_CHANGE_INDEXES:
+            op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {index_name} ON entity_changes ({columns})")
+
+    for partition in partitions:
+        for index_name, _ in ACCESS_LOG_INDEXES:
+            op.execute(f"ALTER INDEX {index_name} ATTACH PARTITION {partition}_{index_name[len('ix_access_logs_'):]}")
+
+
+def downgrade() -> None:
+    for index_name, _ in ENTITY_CHANGE_INDEXES:
+        op.drop_index(index_name, table_name='entity_changes')
+    # dropping the parent index drops the attached partition indexes
+    for index_name, _ in ACCESS_LOG_INDEXES:
+        op.drop_index(index_name, table_name='access_logs')
@@ -0,0 +1,179 @@
+"""Storage format of entity change payloads.
+
+Version 2 payloads store JSON-native typed values:
+
+    CREATE  {"v": 2, "new": {field: value, ...}}        non-null initial state
+    UPDATE  {"v": 2, "d": {field: [old, new], ...}}     changed fields only
+    DELETE  {"v": 2, "old": {field: value, ...}}        non-null final state
+
+Payloads larger than the configured threshold are stored compressed as
+{"v": 2, "z": "gzip", "data": <base64>}. Payloads with "z": "zstd", written
+by earlier versions where zstandard happened to be installed, are still
+read when it is. Version 1 payloads (the original format with str() values)
+are still decoded.
+"""
+import base64
+import gzip
+import json
+from datetime import date, datetime, time
+from decimal import Decimal
+from enum import Enum
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from sqlalchemy import types as sqltypes
+
+from app.core.config import settings
+
+try:
+    import zstandard
+except ImportError:  # optional, only to read entries written with zstd
+    zstandard = None
+
+FORMAT_VERSION = 2
+
+Serializer = Callable[[Any], Any]
+
+
+def _plain(value: Any) -> Any:
+    if isinstance(value, Enum):
+        return value.value
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return str(value)
+
+
+def _enum(value: Any) -> Any:
+    return value.value if isinstance(value, Enum) else value
+
+
+def _temporal(value: Any) -> Any:
+    return value.isoformat() if value is not None else None
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+def serializer_for(column_type: sqltypes.TypeEngine) -> Serializer:
+    if isinstance(column_type, sqltypes.Enum):
+        return _enum
+    if isinstance(column_type, (sqltypes.DateTime, sqltypes.Date, sqltypes.Time)):
+        return _temporal
+    if isinstance(column_type, (sqltypes.Integer, sqltypes.Boolean, sqltypes.Float)):
+        return _identity
+    return _plain
+
+
+def encode_create(values: Dict[str, Any]) -> Dict[str, Any]:
+    return _pack({"new": {key: value for key, value in values.items() if value is not None}})
+
+
+def encode_update(changes: Dict[str, Tuple[Any, Any]]) -> Dict[str, Any]:
+    return _pack({"d": {key: [old, new] for key, (old, new) in changes.items()}})
+
+
+def encode_delete(values: Dict[str, Any]) -> Dict[str, Any]:
+    return _pack({"old": {key: value for key, value in values.items() if value is not None}})
+
+
+def _pack(body: Dict[str, Any]) -> Dict[str, Any]:
+    threshold = settings.audit_compression_min_bytes
+    if threshold > 0:
+        raw = json.dumps(body, separators=(",", ":")).encode("utf-8")
+        if len(raw) >= threshold:
+            # gzip only: every host can read it, whatever is installed
+            return {"v": FORMAT_VERSION, "z": "gzip", "data": base64.b64encode(gzip.compress(raw)).decode("ascii")}
+    return {"v": FORMAT_VERSION, **body}
+
+
+def _unpack(payload: Dict[str, Any]) -> Dict[str, Any]:
+    codec = payload.get("z")
+    if not codec:
+        return payload
+    data = base64.b64decode(payload["data"])
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("zstandard is required to read this audit entry")
+        raw = zstandard.decompress(data)
+    else:
+        raw = gzip.decompress(data)
+    return json.loads(raw)
+
+
+def _legacy_value(value: Any) -> Any:
+    return None if value == "None" else value
+
+
+def decode_changes(action: str, payload: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Return changes in the display shape used by the history page.
+
+    UPDATE -> {field: {"old": .., "new": ..}}, CREATE -> {"new_values": {..}},
+    DELETE -> {"old_values": {..}}, for both the current and the legacy format.
+    """
+    if not payload:
+        return payload
+
+    if payload.get("v") != FORMAT_VERSION:
+        if action == "UPDATE":
+            return {
+                key: {"old": _legacy_value(values.get("old")), "new": _legacy_value(values.get("new"))}
+                for key, values in payload.items()
+                if isinstance(values, dict)
+            }
+        key = "new_values" if action == "CREATE" else "old_values"
+        return {key: {field: _legacy_value(value) for field, value in (payload.get(key) or {}).items()}}
+
+    body = _unpack(payload)
+    if action == "UPDATE":
+        return {key: {"old": old, "new": new} for key, (old, new) in body.get("d", {}).items()}
+    if action == "CREATE":
+        return {"new_values": body.get("new", {})}
+    return {"old_values": body.get("old", {})}
+
+
+def parse_legacy_value(text: Any, column_type: Optional[sqltypes.TypeEngine]) -> Any:
+    """Best-effort conversion of a version 1 str() value back to a typed value."""
+    if text is None or text == "None":
+        return None
+    if not isinstance(text, str) or column_type is None:
+        return text
+    try:
+        if isinstance(column_type, sqltypes.Enum):
+            # str() of an enum member is "ClassName.MEMBER"
+            name = text.split(".", 1)[1] if "." in text else text
+            enum_class = column_type.enum_class
+            if enum_class is not None and name in enum_class.__members__:
+                return enum_class[name].value
+            return name
+        if isinstance(column_type, sqltypes.Boolean):
+            return text == "True"
+        if isinstance(column_type, sqltypes.Integer):
+            return int(text)
+        if isinstance(column_type, sqltypes.Float):
+            return float(text)
+        if isinstance(column_type, (sqltypes.DateTime, sqltypes.Date, sqltypes.Time)):
+            return datetime.fromisoformat(text).isoformat()
+    except (TypeError, ValueError):
+        return text
+    return text
+
+
+def upgrade_legacy_payload(
+    action: str, payload: Dict[str, Any], column_types: Dict[str, sqltypes.TypeEngine]
+) -> Dict[str, Any]:
+    decoded = decode_changes(action, payload)
+
+    def typed(field: str, value: Any) -> Any:
+        return parse_legacy_value(value, column_types.get(field))
+
+    if action == "UPDATE":
+        return encode_update({
+            field: (typed(field, values["old"]), typed(field, values["new"])) for field, values in decoded.items()
+        })
+    if action == "CREATE":
+        return encode_create({field: typed(field, value) for field, value in decoded["new_values"].items()})
+    return encode_delete({field: typed(field, value) for field, value in decoded["old_values"].items()})
@@ -0,0 +1,138 @@
+"""Streaming export of access logs and entity changes.
+
+Rows are read through a server-side cursor in id order and encoded as they
+arrive, so memory use does not depend on the size of the exported range.
+Clients pull incrementally by passing the largest exported id as since_id.
+
+Ids are handed out when a row is inserted but become visible only when its
+transaction commits, so a lower id can appear after a higher one was
+exported. Exports therefore stop at rows younger than
+AUDIT_EXPORT_SETTLE_SECONDS: every row older than that whose transaction
+took less than the settle time (and whose worker's clock is within it) has
+committed, and a since_id pull never skips it. Rows of longer
+transactions can still be missed, raise the setting if imports or other
+writes run that long in one transaction.
+"""
+import csv
+import io
+import json
+import zlib
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterator, List, Optional
+
+from sqlalchemy import select
+
+from app.audit.codec import decode_changes
+from app.core.config import settings
+from app.core.db import SessionLocal
+from app.models.access_log import AccessLog
+from app.models.entity_change import EntityChange
+
+EXPORT_KINDS = {"access": AccessLog, "changes": EntityChange}
+EXPORT_FORMATS = ("ndjson", "csv")
+
+FETCH_SIZE = 2000
+# encoded output is handed to the server in chunks of about this size
+CHUNK_BYTES = 64 * 1024
+
+
+def export_columns(kind: str) -> List[str]:
+    return [column.key for column in EXPORT_KINDS[kind].__table__.columns]
+
+
+def build_export_query(
+    kind: str,
+    since_id: Optional[int] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    username: Optional[str] = None,
+    action: Optional[str] = None,
+    entity_name: Optional[str] = None,
+    entity_id: Optional[str] = None,
+    settle_seconds: Optional[int] = None,
+):
+    model = EXPORT_KINDS[kind]
+    query = select(*model.__table__.columns)
+
+    if settle_seconds is None:
+        settle_seconds = settings.audit_export_settle_seconds
+    if settle_seconds:
+        query = query.where(model.timestamp < datetime.now(timezone.utc) - timedelta(seconds=settle_seconds))
+
+    if since_id is not None:
+        query = query.where(model.id > since_id)
+    if start is not None:
+        query = query.where(model.timestamp >= start)
+    if end is not None:
+        query = query.where(model.timestamp < end)
+    if username:
+        query = query.where(model.username == username)
+    # action and entity filters only exist on the change history
+    if model is EntityChange:
+        if action:
+            query = query.where(EntityChange.action == action.upper())
+        if entity_name:
+            query = query.where(EntityChange.entity_name == entity_name)
+        if entity_id:
+            query = query.where(EntityChange.entity_id == entity_id)
+
+    return query.order_by(model.id)
+
+
+def _record(kind: str, row) -> Dict[str, Any]:
+    record = row._asdict()
+    if record.get("timestamp") is not None:
+        record["timestamp"] = record["timestamp"].isoformat()
+    if kind == "changes":
+        record["changes"] = decode_changes(record["action"], record["changes"])
+    return record
+
+
+def _encode_rows(kind: str, fmt: str, rows) -> Iterator[str]:
+    if fmt == "ndjson":
+        for row in rows:
+            yield json.dumps(_record(kind, row), default=str, separators=(",", ":")) + "\n"
+        return
+
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=export_columns(kind))
+    writer.writeheader()
+    for row in rows:
+        record = _record(kind, row)
+        if kind == "changes" and record["changes"] is not None:
+            record["changes"] = json.dumps(record["changes"], default=str, separators=(",", ":"))
+        writer.writerow(record)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    yield buffer.getvalue()
+
+
+def iter_export(kind: str, fmt: str, compress: bool = False, **filters) -> Iterator[bytes]:
+    """Yield the encoded export in chunks.
+
+    Opens its own session: the request session is closed before a streaming
+    response body is sent.
+    """
+    compressor = zlib.compressobj(wbits=31) if compress else None  # gzip container
+    pending: List[bytes] = []
+    pending_size = 0
+
+    with SessionLocal() as db:
+        rows = db.execute(build_export_query(kind, **filters).execution_options(yield_per=FETCH_SIZE))
+        for text in _encode_rows(kind, fmt, rows):
+            data = text.encode("utf-8")
+            if compressor is not None:
+                data = compressor.compress(data)
+            if not data:
+                continue
+            pending.append(data)
+            pending_size += len(data)
+            if pending_size >= CHUNK_BYTES:
+                yield b"".join(pending)
+                pending, pending_size = [], 0
+
+    if compressor is not None:
+        pending.append(compressor.flush())
+    if pending:
+        yield b"".join(pending)
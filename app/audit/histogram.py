@@ -0,0 +1,65 @@
+import bisect
+from typing import List, Optional
+
+
+def _log_linear_bounds(min_exponent: int = 0, max_exponent: int = 16, sub_buckets: int = 4) -> List[float]:
+    # 4 linear steps per power of two: 1, 1.25, 1.5, 1.75, 2, 2.5, ... ms
+    bounds = []
+    for exponent in range(min_exponent, max_exponent):
+        base = 2 ** exponent
+        for step in range(sub_buckets):
+            bounds.append(base * (1 + step / sub_buckets))
+    return bounds
+
+
+# Bucket i counts values in [LATENCY_BOUNDS_MS[i-1], LATENCY_BOUNDS_MS[i]).
+# Index 0 is everything below 1ms, the last index everything above ~65s.
+# Same semantics as Postgres width_bucket(value, thresholds).
+LATENCY_BOUNDS_MS: List[float] = _log_linear_bounds()
+BUCKET_COUNT = len(LATENCY_BOUNDS_MS) + 1
+
+
+def empty_histogram() -> List[int]:
+    return [0] * BUCKET_COUNT
+
+
+def bucket_index(value_ms: float) -> int:
+    return bisect.bisect_right(LATENCY_BOUNDS_MS, value_ms)
+
+
+def record(histogram: List[int], value_ms: float, count: int = 1) -> None:
+    histogram[bucket_index(value_ms)] += count
+
+
+def merge(target: List[int], other: Optional[List[int]]) -> List[int]:
+    """Add other into target in place. Histograms with a different layout are ignored."""
+    if other and len(other) == len(target):
+        for index, count in enumerate(other):
+            target[index] += count
+    return target
+
+
+def total(histogram: List[int]) -> int:
+    return sum(histogram)
+
+
+def percentile(histogram: List[int], quantile: float) -> Optional[float]:
+    """Estimate a quantile (0..1) by linear interpolation inside the matching bucket."""
+    count = sum(histogram)
+    if count == 0:
+        return None
+
+    rank = quantile * count
+    cumulative = 0
+    for index, bucket_count in enumerate(histogram):
+        if bucket_count == 0:
+            continue
+        if cumulative + bucket_count >= rank:
+            lower = LATENCY_BOUNDS_MS[index - 1] if index > 0 else 0.0
+            if index >= len(LATENCY_BOUNDS_MS):
+                # overflow bucket has no upper bound
+                return lower
+            upper = LATENCY_BOUNDS_MS[index]
+            return lower + (upper - lower) * ((rank - cumulative) / bucket_count)
+        cumulative += bucket_count
+    return LATENCY_BOUNDS_MS[-1]
@@ -1,98 +1,150 @@
-from sqlalchemy import event
-from sqlalchemy.orm import Session
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import event, insert
 from sqlalchemy.inspection import inspect
-from typing import Dict, Any
+from sqlalchemy.orm import Mapper, Session
+from sqlalchemy.orm.base import NO_VALUE
 
-from app.models.audit_log import AuditLog
+from app.models.access_log import AccessLog
+from app.models.entity_change import EntityChange
+from app.models.job import Job
+from app.audit import codec
 from app.audit.context import audit_context
 
+AUDIT_MODELS = (AccessLog, EntityChange)
+# job rows change at every progress checkpoint and carry whole import payloads and export files;
+# the changes the jobs make are audited like any other
+UNAUDITED_MODELS = AUDIT_MODELS + (Job,)
+CONTEXT_FIELDS = ("method", "path", "remote_addr", "user_id", "username", "user_agent")
+
+PENDING_KEY = "pending_entity_changes"
+NEW_INSTANCES_KEY = "pending_new_instances"
+
+
+class MapperCapture:
+    """Column attributes and serializers of one mapped class, computed once per class."""
+
+    def __init__(self, mapper: Mapper):
+        self.entity_name = mapper.class_.__name__
+        self.columns: List[Tuple[str, Callable[[Any], Any]]] = [
+            (prop.key, codec.serializer_for(prop.columns[0].type)) for prop in mapper.column_attrs
+        ]
+        self.column_keys = frozenset(key for key, _ in self.columns)
+        self.serializers = dict(self.columns)
+        self.pk_key = mapper.get_property_by_column(mapper.primary_key[0]).key
+
+    def snapshot(self, state) -> Dict[str, Any]:
+        values = state.dict
+        return {key: serialize(values.get(key)) for key, serialize in self.columns}
+
+    def diff(self, state) -> Dict[str, Tuple[Any, Any]]:
+        # committed_state holds the original value of every attribute changed
+        # since load, so only the modified columns are visited
+        changes = {}
+        values = state.dict
+        for key, old_value in state.committed_state.items():
+            if key not in self.column_keys:
+                continue
+            if old_value is NO_VALUE:
+                old_value = None
+            new_value = values.get(key)
+            if old_value != new_value:
+                serialize = self.serializers[key]
+                changes[key] = (serialize(old_value), serialize(new_value))
+        return changes
+
+    def entity_id(self, state) -> Optional[str]:
+        if state.identity:
+            return str(state.identity[0])
+        pk_val = state.dict.get(self.pk_key)
+        return str(pk_val) if pk_val is not None else None
+
+
+_captures: Dict[type, Optional[MapperCapture]] = {}
+
+
+def get_capture(instance) -> Optional[MapperCapture]:
+    cls = instance.__class__
+    try:
+        return _captures[cls]
+    except KeyError:
+        pass
+
+    capture = None
+    if hasattr(cls, "__tablename__") and not issubclass(cls, UNAUDITED_MODELS):
+        capture = MapperCapture(inspect(cls))
+    _captures[cls] = capture
+    return capture
+
+
+def get_change_context() -> Dict[str, Any]:
+    context = audit_context.get() or {}
+    return {key: context.get(key) for key in CONTEXT_FIELDS}
 
-def get_model_changes(model_instance) -> Dict[str, Any]:
-    state = inspect(model_instance)
-    changes = {}
-    for attr in state.attrs:
-        history = attr.history
-        if not history.has_changes():
-            continue
-
-        old_value = history.deleted[0] if history.deleted else None
-        new_value = history.added[0] if history.added else None
 
-        if old_value != new_value:
-            changes[attr.key] = {"old": str(old_value), "new": str(new_value)}
-    return changes
+def _change_row(action: str, capture: MapperCapture, entity_id: Optional[str], changes: Dict, context: Dict) -> Dict:
+    return {
+        "timestamp": datetime.now(timezone.utc),
+        "action": action,
+        "entity_name": capture.entity_name,
+        "entity_id": entity_id,
+        "changes": changes,
+        **context,
+    }
 
 
 def before_flush_listener(session: Session, flush_context, instances):
-    context = audit_context.get() or {}
+    context = get_change_context()
+    # anything left from a failed flush is recomputed below
+    pending: List[Dict] = []
+    new_instances: List[Tuple[Any, MapperCapture]] = []
 
-    session.info.setdefault("pending_audit_logs", [])
-
-    # Log Updated Objects
     for instance in session.dirty:
-        if not hasattr(instance, "__tablename__") or isinstance(instance, AuditLog):
-            continue
-        changes = get_model_changes(instance)
-        if not changes:
+        capture = get_capture(instance)
+        if capture is None:
             continue
-        pk_val = inspect(instance).identity[0] if inspect(instance).identity else None
-        log = AuditLog(
-            action="UPDATE",
-            entity_name=instance.__class__.__name__,
-            entity_id=str(pk_val) if pk_val else None,
-            changes=changes,
-            **context
-        )
-        session.add(log)
+        state = inspect(instance)
+        changes = capture.diff(state)
+        if changes:
+            pending.append(
+                _change_row("UPDATE", capture, capture.entity_id(state), codec.encode_update(changes), context)
+            )
 
-    # Log Deleted Objects
     for instance in session.deleted:
-        if not hasattr(instance, "__tablename__") or isinstance(instance, AuditLog):
+        capture = get_capture(instance)
+        if capture is None:
             continue
         state = inspect(instance)
-        old_values = {attr.key: str(getattr(instance, attr.key, None)) for attr in state.attrs}
-        pk_val = state.identity[0] if state.identity else None
-        log = AuditLog(
-            action="DELETE",
-            entity_name=instance.__class__.__name__,
-            entity_id=str(pk_val) if pk_val else None,
-            changes={"old_values": old_values},
-            **context
+        pending.append(
+            _change_row("DELETE", capture, capture.entity_id(state), codec.encode_delete(capture.snapshot(state)), context)
         )
-        session.add(log)
 
+    # new rows get their primary key during the flush, they are captured afterwards
     for instance in session.new:
-        if not hasattr(instance, "__tablename__") or isinstance(instance, AuditLog):
-            continue
+        capture = get_capture(instance)
+        if capture is not None:
+            new_instances.append((instance, capture))
 
-        state = inspect(instance)
-        new_values = {attr.key: str(getattr(instance, attr.key)) for attr in state.attrs}
-
-        session.info["pending_audit_logs"].append({"instance": instance, "new_values": new_values, "context": context})
+    session.info[PENDING_KEY] = pending
+    session.info[NEW_INSTANCES_KEY] = (new_instances, context)
 
 
 def after_flush_listener(session: Session, flush_context):
-    pending_logs = session.info.get("pending_audit_logs", [])
-    if not pending_logs:
-        return
+    pending = session.info.pop(PENDING_KEY, None) or []
+    new_instances, context = session.info.pop(NEW_INSTANCES_KEY, None) or ([], {})
 
-    for log_info in pending_logs:
-        instance = log_info["instance"]
-
-        pk_name = inspect(instance.__class__).primary_key[0].name
-        pk_val = getattr(instance, pk_name, None)
+    for instance, capture in new_instances:
+        state = inspect(instance)
+        entity_id = capture.entity_id(state)
+        if entity_id:
+            pending.append(_change_row("CREATE", capture, entity_id, codec.encode_create(capture.snapshot(state)), context))
 
-        if pk_val:
-            log = AuditLog(
-                action="CREATE",
-                entity_name=instance.__class__.__name__,
-                entity_id=str(pk_val),
-                changes={"new_values": log_info["new_values"]},
-                **log_info["context"]
-            )
-            session.add(log)
+    if not pending:
+        return
 
-    session.info["pending_audit_logs"] = []
+    # one executemany on the flush connection instead of an ORM object per change
+    session.connection().execute(insert(EntityChange.__table__), pending)
 
 
 def initialize_audit_listeners():
@@ -0,0 +1,153 @@
+import logging
+import re
+from datetime import date
+from typing import List
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+PARENT_TABLE = "access_logs"
+# catches rows outside every monthly partition (clock skew, months not created yet)
+DEFAULT_PARTITION = f"{PARENT_TABLE}_default"
+PARTITION_NAME_RE = re.compile(r"^access_logs_y(\d{4})m(\d{2})$")
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def month_partition_name(month: date) -> str:
+    return f"{PARENT_TABLE}_y{month.year:04d}m{month.month:02d}"
+
+
+def is_partitioned(db: Session) -> bool:
+    if db.get_bind().dialect.name != "postgresql":
+        return False
+    return bool(
+        db.execute(
+            text("SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(:table)"),
+            {"table": PARENT_TABLE},
+        ).scalar()
+    )
+
+
+def list_month_partitions(db: Session) -> List[date]:
+    rows = db.execute(
+        text(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "WHERE pg_inherits.inhparent = to_regclass(:table)"
+        ),
+        {"table": PARENT_TABLE},
+    ).scalars()
+    months = []
+    for name in rows:
+        match = PARTITION_NAME_RE.match(name)
+        if match:
+            months.append(date(int(match.group(1)), int(match.group(2)), 1))
+    return sorted(months)
+
+
+def has_default_partition(db: Session) -> bool:
+    return db.execute(text("SELECT to_regclass(:table) IS NOT NULL"), {"table": DEFAULT_PARTITION}).scalar()
+
+
+def create_month_partition(db: Session, month: date) -> int:
+    """Create the partition of one month, returns the rows moved into it from the default partition.
+
+    Postgres refuses to create a partition while the default partition holds
+    rows of its range, so those are taken out first and inserted again once
+    the partition exists, all in one transaction.
+    """
+    name = month_partition_name(month)
+    bounds = {"start": month, "end": add_months(month, 1)}
+    in_range = '"timestamp" >= :start AND "timestamp" < :end'
+    moved = 0
+    if has_default_partition(db):
+        # no new rows of the month may reach the default partition until the new one exists
+        db.execute(text(f"LOCK TABLE {DEFAULT_PARTITION} IN SHARE ROW EXCLUSIVE MODE"))
+        moved = db.execute(
+            text(f"SELECT count(*) FROM {DEFAULT_PARTITION} WHERE {in_range}"), bounds
+        ).scalar()
+    if moved:
+        db.execute(text(f"CREATE TEMPORARY TABLE moved_access_logs (LIKE {PARENT_TABLE}) ON COMMIT DROP"))
+        db.execute(
+            text(
+                f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} WHERE {in_range} RETURNING *) "
+                f"INSERT INTO moved_access_logs SELECT * FROM moved"
+            ),
+            bounds,
+        )
+    db.execute(
+        text(
+            f"CREATE TABLE {name} PARTITION OF {PARENT_TABLE} "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+        )
+    )
+    if moved:
+        db.execute(text(f"INSERT INTO {PARENT_TABLE} SELECT * FROM moved_access_logs"))
+    db.commit()
+    logger.info(f"Created access log partition {name}")
+    if moved:
+        logger.info(f"Moved {moved} access logs from {DEFAULT_PARTITION} into {name}")
+    return moved
+
+
+def ensure_month_partitions(db: Session, months_ahead: int, months_back: int = 0) -> int:
+    """Create monthly partitions from months_back before the current month up to months_ahead."""
+    existing = set(list_month_partitions(db))
+    current_month = date.today().replace(day=1)
+    created = 0
+
+    for offset in range(-months_back, months_ahead + 1):
+        month = add_months(current_month, offset)
+        if month in existing:
+            continue
+        create_month_partition(db, month)
+        created += 1
+
+    return created
+
+
+def drop_expired_access_partitions(db: Session, retention_months: int) -> int:
+    """Drop whole months of access logs older than the retention window.
+
+    Rows of those months in the default partition are deleted as well.
+    Entity change history lives in its own table and is not affected.
+    """
+    cutoff = add_months(date.today().replace(day=1), -retention_months)
+    dropped = 0
+
+    if has_default_partition(db):
+        deleted = db.execute(
+            text(f'DELETE FROM {DEFAULT_PARTITION} WHERE "timestamp" < :cutoff'), {"cutoff": cutoff}
+        ).rowcount
+        db.commit()
+        if deleted:
+            logger.info(f"Deleted {deleted} expired access logs from {DEFAULT_PARTITION}")
+
+    for month in list_month_partitions(db):
+        if month >= cutoff:
+            continue
+        name = month_partition_name(month)
+        db.execute(text(f"DROP TABLE {name}"))
+        db.commit()
+        dropped += 1
+        logger.info(f"Dropped expired access log partition {name}")
+
+    return dropped
+
+
+def maintain_audit_partitions(db: Session, months_ahead: int, retention_months: int) -> dict:
+    if not is_partitioned(db):
+        return {"created": 0, "dropped": 0}
+
+    created = ensure_month_partitions(db, months_ahead)
+    dropped = drop_expired_access_partitions(db, retention_months) if retention_months > 0 else 0
+    if has_default_partition(db) and db.execute(text(f"SELECT EXISTS (SELECT 1 FROM {DEFAULT_PARTITION})")).scalar():
+        # left over: timestamps beyond months_ahead, moved when their month is created
+        logger.warning(f"{DEFAULT_PARTITION} holds access logs outside every monthly partition")
+    return {"created": created, "dropped": dropped}
@@ -0,0 +1,153 @@
+import logging
+import threading
+from datetime import datetime, timezone
+from typing import Dict, List, Tuple
+
+from sqlalchemy import select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app.audit import histogram
+from app.models.request_rollup import RequestRollup
+
+logger = logging.getLogger(__name__)
+
+RollupKey = Tuple[datetime, str, str, int]
+
+UNMATCHED_ROUTE = "(unmatched)"
+
+
+def hour_bucket(timestamp: datetime) -> datetime:
+    return timestamp.replace(minute=0, second=0, microsecond=0)
+
+
+def _lookup_key(bucket: datetime, path: str, method: str, status_code: int) -> RollupKey:
+    # drivers differ in how they return timestamptz (offset-aware or naive UTC)
+    if bucket.tzinfo is not None:
+        bucket = bucket.astimezone(timezone.utc).replace(tzinfo=None)
+    return bucket, path, method, status_code
+
+
+class RollupAccumulator:
+    """Per-worker in-memory request counters, flushed into request_rollups.
+
+    Recording is a dict update under a lock, so it is cheap enough to do for
+    every request. Flushing merges into the stored rows, which makes the
+    rollups additive across workers and flushes.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending: Dict[RollupKey, dict] = {}
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def record(
+        self, timestamp: datetime, path: str, method: str, status_code: int, response_time_ms: float, logged: bool = True
+    ) -> None:
+        key = (hour_bucket(timestamp), path, method, status_code)
+        with self._lock:
+            entry = self._pending.get(key)
+            if entry is None:
+                entry = self._pending[key] = {
+                    "count": 0,
+                    "logged_count": 0,
+                    "latency_sum_ms": 0.0,
+                    "latency_max_ms": 0.0,
+                    "histogram": histogram.empty_histogram(),
+                }
+            entry["count"] += 1
+            if logged:
+                entry["logged_count"] += 1
+            entry["latency_sum_ms"] += response_time_ms
+            entry["latency_max_ms"] = max(entry["latency_max_ms"], response_time_ms)
+            histogram.record(entry["histogram"], response_time_ms)
+
+    def drain(self) -> Dict[RollupKey, dict]:
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        return pending
+
+    def restore(self, pending: Dict[RollupKey, dict]) -> None:
+        """Put back counters from a failed flush so they are retried next time."""
+        with self._lock:
+            for key, entry in pending.items():
+                current = self._pending.get(key)
+                if current is None:
+                    self._pending[key] = entry
+                    continue
+                current["count"] += entry["count"]
+                current["logged_count"] += entry["logged_count"]
+                current["latency_sum_ms"] += entry["latency_sum_ms"]
+                current["latency_max_ms"] = max(current["latency_max_ms"], entry["latency_max_ms"])
+                histogram.merge(current["histogram"], entry["histogram"])
+
+    def flush(self, db: Session) -> int:
+        pending = self.drain()
+        if not pending:
+            return 0
+        try:
+            merge_rollups(db, pending)
+            db.commit()
+        except Exception:
+            db.rollback()
+            self.restore(pending)
+            raise
+        return len(pending)
+
+
+def _insert_for(db: Session):
+    return pg_insert if db.get_bind().dialect.name == "postgresql" else sqlite_insert
+
+
+def merge_rollups(db: Session, pending: Dict[RollupKey, dict]) -> None:
+    # Make sure every row exists, then lock them in key order and add to them.
+    # Core statements on purpose: these rows must not go through the audit flush listener.
+    keys: List[RollupKey] = sorted(pending)
+    db.execute(
+        _insert_for(db)(RequestRollup)
+        .values([
+            {"bucket": bucket, "path": path, "method": method, "status_code": status_code,
+             "count": 0, "logged_count": 0, "latency_sum_ms": 0.0}
+            for bucket, path, method, status_code in keys
+        ])
+        .on_conflict_do_nothing()
+    )
+
+    key_columns = tuple_(RequestRollup.bucket, RequestRollup.path, RequestRollup.method, RequestRollup.status_code)
+    existing = db.execute(
+        select(
+            RequestRollup.bucket, RequestRollup.path, RequestRollup.method, RequestRollup.status_code,
+            RequestRollup.count, RequestRollup.logged_count, RequestRollup.latency_sum_ms,
+            RequestRollup.latency_max_ms, RequestRollup.histogram,
+        )
+        .where(key_columns.in_(keys))
+        .order_by(RequestRollup.bucket, RequestRollup.path, RequestRollup.method, RequestRollup.status_code)
+        .with_for_update()
+    ).all()
+
+    pending_by_key = {_lookup_key(*key): entry for key, entry in pending.items()}
+    updates = []
+    for row in existing:
+        entry = pending_by_key[_lookup_key(row.bucket, row.path, row.method, row.status_code)]
+        merged_histogram = histogram.merge(histogram.empty_histogram(), row.histogram)
+        histogram.merge(merged_histogram, entry["histogram"])
+        updates.append({
+            "bucket": row.bucket,
+            "path": row.path,
+            "method": row.method,
+            "status_code": row.status_code,
+            "count": row.count + entry["count"],
+            "logged_count": row.logged_count + entry["logged_count"],
+            "latency_sum_ms": row.latency_sum_ms + entry["latency_sum_ms"],
+            "latency_max_ms": max(row.latency_max_ms or 0.0, entry["latency_max_ms"]),
+            "histogram": merged_histogram,
+        })
+
+    if updates:
+        db.execute(update(RequestRollup), updates)
+
+
+rollup_accumulator = RollupAccumulator()
@@ -0,0 +1,123 @@
+"""Which requests are written to access_logs.
+
+Rules are matched in order against method and path. The first match decides:
+
+    always      log every request
+    sample:R    log a random fraction R (0..1) of requests
+    errors      log only error responses
+    never       log nothing
+
+Writes (anything but GET/HEAD/OPTIONS) and error responses (status >= 400)
+are always logged whatever the rules say. Requests no rule matches are
+logged. Request rollups count every request regardless, and record how
+many were logged, so counts from access_logs can be re-weighted.
+
+Rules are configured as ";"-separated "METHODS PATTERN=POLICY" entries,
+METHODS being "*" or "|"-separated methods and PATTERN a glob on the path:
+
+    GET /hardware=sample:0.05; GET|HEAD /api/*=errors
+"""
+import fnmatch
+import random
+from typing import Dict, FrozenSet, List, Optional
+
+from app.core.config import settings
+
+ALWAYS = "always"
+SAMPLE = "sample"
+ERRORS_ONLY = "errors"
+NEVER = "never"
+POLICIES = (ALWAYS, SAMPLE, ERRORS_ONLY, NEVER)
+
+READ_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+class AccessLogRule:
+    def __init__(self, pattern: str, policy: str, rate: float = 1.0, methods: Optional[FrozenSet[str]] = None):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown access log policy '{policy}', expected one of {', '.join(POLICIES)}")
+        if not 0.0 <= rate <= 1.0:
+            raise ValueError(f"Sample rate must be between 0 and 1, got {rate}")
+        self.pattern = pattern
+        self.policy = policy
+        self.rate = rate
+        self.methods = methods
+
+    def matches(self, method: str, path: str) -> bool:
+        if self.methods is not None and method not in self.methods:
+            return False
+        return fnmatch.fnmatchcase(path, self.pattern)
+
+    def __repr__(self) -> str:
+        methods = "|".join(sorted(self.methods)) if self.methods else "*"
+        policy = f"{self.policy}:{self.rate}" if self.policy == SAMPLE else self.policy
+        return f"{methods} {self.pattern}={policy}"
+
+
+def parse_rules(spec: str) -> List[AccessLogRule]:
+    rules = []
+    for entry in spec.split(";"):
+        entry = entry.strip()
+        if not entry:
+            continue
+        try:
+            target, policy = entry.rsplit("=", 1)
+            methods, pattern = target.split()
+        except ValueError:
+            raise ValueError(f"Invalid access log rule '{entry}', expected 'METHODS PATTERN=POLICY'")
+
+        policy, _, rate = policy.strip().lower().partition(":")
+        # a bare "sample" would silently log nothing
+        if policy == SAMPLE and not rate:
+            raise ValueError(f"Invalid access log rule '{entry}', sample needs a rate: 'sample:RATE'")
+        try:
+            rate = float(rate) if rate else 1.0
+        except ValueError:
+            raise ValueError(f"Invalid sample rate in access log rule '{entry}'")
+        rules.append(
+            AccessLogRule(
+                pattern=pattern,
+                policy=policy,
+                rate=rate,
+                methods=None if methods == "*" else frozenset(m.upper() for m in methods.split("|")),
+            )
+        )
+    return rules
+
+
+class AccessLogSampler:
+    """Applies the rules and counts dropped requests per rule."""
+
+    def __init__(self, rules: List[AccessLogRule]):
+        self.rules = rules
+        self.logged = 0
+        self.dropped: Dict[str, int] = {}
+
+    def should_log(self, method: str, path: str, status_code: int) -> bool:
+        rule = self._decide(method, path, status_code)
+        if rule is None:
+            self.logged += 1
+            return True
+        key = repr(rule)
+        self.dropped[key] = self.dropped.get(key, 0) + 1
+        return False
+
+    def _decide(self, method: str, path: str, status_code: int) -> Optional[AccessLogRule]:
+        """None when the request is logged, otherwise the rule that dropped it."""
+        if status_code >= 400 or method not in READ_METHODS:
+            return None
+        for rule in self.rules:
+            if not rule.matches(method, path):
+                continue
+            if rule.policy == ALWAYS:
+                return None
+            if rule.policy == SAMPLE and random.random() < rule.rate:
+                return None
+            return rule
+        return None
+
+    def stats(self) -> dict:
+        return {"logged": self.logged, "dropped": dict(self.dropped)}
+
+
+access_log_sampler = AccessLogSampler(parse_rules(settings.audit_log_rules))
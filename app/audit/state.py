@@ -0,0 +1,209 @@
+"""Point-in-time reconstruction of hardware state.
+
+A snapshot copies every hardware row together with an entity change id up
+to which every change is reflected in the copy. The state at time T is the
+newest snapshot taken at or before T plus the Hardware changes after that
+id, so a replay never reads much more than one snapshot interval of history.
+
+Ids are assigned at insert and become visible at commit, so the newest
+visible id says nothing about lower ids still being committed. The
+watermark therefore only covers changes older than COMMIT_MARGIN; the newer
+ones are replayed on top of the copy even if it already contains them,
+which apply_change tolerates. Transactions that stay open longer than the
+margin can still be missed.
+"""
+import logging
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.orm import Session
+
+from app.audit.codec import decode_changes, serializer_for
+from app.models.entity_change import EntityChange
+from app.models.hardware import Hardware
+from app.models.hardware_snapshot import HardwareSnapshot, HardwareSnapshotItem
+
+logger = logging.getLogger(__name__)
+
+ENTITY_NAME = "Hardware"
+INSERT_CHUNK_SIZE = 5000
+# changes older than this are assumed committed when a snapshot is taken
+COMMIT_MARGIN = timedelta(minutes=5)
+
+State = Dict[str, Any]
+
+
+def apply_change(state: Optional[State], action: str, changes: Optional[dict]) -> Optional[State]:
+    """Apply one entity change to a state, returns None once the row is deleted.
+
+    Only new values are applied, so replaying a change that the state
+    already contains leaves it unchanged.
+    """
+    decoded = decode_changes(action, changes) or {}
+    if action == "CREATE":
+        return dict(decoded.get("new_values", {}))
+    if action == "DELETE":
+        return None
+    # rows that predate the change history start out partially known
+    state = dict(state) if state is not None else {}
+    for field, values in decoded.items():
+        state[field] = values["new"]
+    return state
+
+
+def _to_utc(at: datetime) -> datetime:
+    return at.replace(tzinfo=timezone.utc) if at.tzinfo is None else at
+
+
+def _snapshot_before(db: Session, at: datetime) -> Optional[HardwareSnapshot]:
+    return db.execute(
+        select(HardwareSnapshot)
+        .where(HardwareSnapshot.taken_at <= at)
+        .order_by(HardwareSnapshot.taken_at.desc())
+        .limit(1)
+    ).scalar_one_or_none()
+
+
+def _changes_after(db: Session, last_change_id: int, at: datetime, entity_id: Optional[str] = None) -> Iterable:
+    query = select(EntityChange.entity_id, EntityChange.action, EntityChange.changes).where(
+        EntityChange.entity_name == ENTITY_NAME,
+        EntityChange.id > last_change_id,
+        EntityChange.timestamp <= at,
+    )
+    if entity_id is not None:
+        query = query.where(EntityChange.entity_id == entity_id)
+    return db.execute(query.order_by(EntityChange.id))
+
+
+def hardware_state_as_of(db: Session, hardware_id: int, at: datetime) -> Optional[State]:
+    at = _to_utc(at)
+    snapshot = _snapshot_before(db, at)
+    state = None
+    last_change_id = 0
+    if snapshot is not None:
+        last_change_id = snapshot.last_change_id
+        state = db.execute(
+            select(HardwareSnapshotItem.state).where(
+                HardwareSnapshotItem.snapshot_id == snapshot.id,
+                HardwareSnapshotItem.hardware_id == hardware_id,
+            )
+        ).scalar_one_or_none()
+
+    for _, action, changes in _changes_after(db, last_change_id, at, entity_id=str(hardware_id)):
+        state = apply_change(state, action, changes)
+    return state
+
+
+def hardware_states_as_of(db: Session, at: datetime) -> Tuple[Dict[str, State], Optional[HardwareSnapshot], int]:
+    """All hardware rows at time `at`, keyed by id, with the snapshot used and the number of replayed changes."""
+    at = _to_utc(at)
+    snapshot = _snapshot_before(db, at)
+    states: Dict[str, State] = {}
+    last_change_id = 0
+    if snapshot is not None:
+        last_change_id = snapshot.last_change_id
+        rows = db.execute(
+            select(HardwareSnapshotItem.hardware_id, HardwareSnapshotItem.state)
+            .where(HardwareSnapshotItem.snapshot_id == snapshot.id)
+        )
+        states = {str(hardware_id): state for hardware_id, state in rows}
+
+    replayed = 0
+    for entity_id, action, changes in _changes_after(db, last_change_id, at):
+        state = apply_change(states.get(entity_id), action, changes)
+        if state is None:
+            states.pop(entity_id, None)
+        else:
+            states[entity_id] = state
+        replayed += 1
+    return states, snapshot, replayed
+
+
+def stock_counts_as_of(db: Session, at: datetime) -> Dict[str, Any]:
+    states, snapshot, replayed = hardware_states_as_of(db, at)
+    by_status = Counter(state.get("status") for state in states.values())
+    by_model = Counter(state.get("model") for state in states.values())
+    in_stock = Counter(state.get("model") for state in states.values() if state.get("status") == "IN_STOCK")
+    return {
+        "as_of": _to_utc(at).isoformat(),
+        "total": len(states),
+        "by_status": dict(by_status),
+        "by_model": dict(by_model),
+        "in_stock_by_model": dict(in_stock),
+        "snapshot_taken_at": snapshot.taken_at.isoformat() if snapshot else None,
+        "replayed_changes": replayed,
+    }
+
+
+def take_hardware_snapshot(db: Session, min_interval: Optional[timedelta] = None) -> Optional[int]:
+    """Copy the hardware table, returns the snapshot id.
+
+    Returns None without copying when nothing changed since the last
+    snapshot or when it is younger than `min_interval`.
+    """
+    # Read the change id before the rows and leave out the last COMMIT_MARGIN:
+    # changes after the watermark are replayed whether or not the copy has them.
+    last_change_id = db.execute(
+        select(func.coalesce(func.max(EntityChange.id), 0)).where(
+            EntityChange.entity_name == ENTITY_NAME,
+            EntityChange.timestamp < datetime.now(timezone.utc) - COMMIT_MARGIN,
+        )
+    ).scalar()
+    previous = db.execute(
+        select(HardwareSnapshot.last_change_id, HardwareSnapshot.taken_at).order_by(HardwareSnapshot.id.desc()).limit(1)
+    ).first()
+    if previous is not None:
+        if previous.last_change_id == last_change_id:
+            return None
+        if min_interval is not None and _to_utc(previous.taken_at) > datetime.now(timezone.utc) - min_interval:
+            return None
+
+    columns = list(Hardware.__table__.columns)
+    serializers = [(column.key, serializer_for(column.type)) for column in columns]
+
+    # Core statements, snapshot rows are not audited entities
+    snapshot_id = db.execute(
+        insert(HardwareSnapshot)
+        .values(taken_at=datetime.now(timezone.utc), last_change_id=last_change_id, item_count=0)
+        .returning(HardwareSnapshot.id)
+    ).scalar_one()
+
+    # streamed and written in chunks, so memory does not grow with the hardware table
+    item_count = 0
+    rows = db.execute(select(*columns).execution_options(yield_per=INSERT_CHUNK_SIZE))
+    for chunk in rows.partitions():
+        db.execute(insert(HardwareSnapshotItem), [
+            {
+                "snapshot_id": snapshot_id,
+                "hardware_id": row.id,
+                "state": {key: serialize(value) for (key, serialize), value in zip(serializers, row)},
+            }
+            for row in chunk
+        ])
+        item_count += len(chunk)
+    db.execute(update(HardwareSnapshot).where(HardwareSnapshot.id == snapshot_id).values(item_count=item_count))
+    db.commit()
+
+    logger.info(f"Hardware snapshot {snapshot_id} taken with {item_count} items up to change {last_change_id}")
+    return snapshot_id
+
+
+def prune_hardware_snapshots(db: Session, retention_days: int) -> int:
+    """Delete snapshots older than the retention, the newest one is always kept."""
+    if retention_days <= 0:
+        return 0
+    cutoff = datetime.now(timezone.utc) - timedelta(days=retention_days)
+    newest_id = db.execute(select(func.max(HardwareSnapshot.id))).scalar()
+    expired_ids = db.execute(
+        select(HardwareSnapshot.id).where(HardwareSnapshot.taken_at < cutoff, HardwareSnapshot.id != newest_id)
+    ).scalars().all()
+    if not expired_ids:
+        return 0
+
+    db.execute(delete(HardwareSnapshotItem).where(HardwareSnapshotItem.snapshot_id.in_(expired_ids)))
+    db.execute(delete(HardwareSnapshot).where(HardwareSnapshot.id.in_(expired_ids)))
+    db.commit()
+    logger.info(f"Pruned {len(expired_ids)} hardware snapshots older than {cutoff.date().isoformat()}")
+    return len(expired_ids)
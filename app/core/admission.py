@@ -0,0 +1,118 @@
+"""Concurrency limits for expensive routes.
+
+Routes are grouped into classes (exports, imports) that each allow a fixed
+number of requests to run at once. Further requests wait up to the queue
+timeout for a slot and are then turned away with 429. Independently, one
+user may only have per_user requests of a class running or waiting, so a
+single user cannot take every slot.
+
+Limits are per worker process: with N workers, up to N x concurrency
+requests of a class run at the same time.
+"""
+import asyncio
+import fnmatch
+import math
+import time
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.metrics import ADMISSION_ACTIVE, ADMISSION_QUEUE_WAIT, ADMISSION_REJECTED
+
+
+class AdmissionRejected(Exception):
+    def __init__(self, route_class: str, reason: str, retry_after: int):
+        super().__init__(f"{route_class}: {reason}")
+        self.route_class = route_class
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class RouteClass:
+    def __init__(
+        self,
+        name: str,
+        routes: List[Tuple[FrozenSet[str], str]],
+        concurrency: int,
+        per_user: int,
+        queue_timeout: float,
+    ):
+        if concurrency < 1 or per_user < 1:
+            raise ValueError(f"Route class '{name}' needs a concurrency and per-user limit of at least 1")
+        self.name = name
+        # (methods, path glob) pairs, as in the access log rules
+        self.routes = routes
+        self.concurrency = concurrency
+        self.per_user = per_user
+        self.queue_timeout = queue_timeout
+        self.retry_after = max(1, math.ceil(queue_timeout))
+        self._slots = asyncio.Semaphore(concurrency)
+        self._per_user: Dict[str, int] = {}
+
+    def matches(self, method: str, path: str) -> bool:
+        return any(method in methods and fnmatch.fnmatchcase(path, pattern) for methods, pattern in self.routes)
+
+    async def acquire(self, user: str) -> None:
+        if self._per_user.get(user, 0) >= self.per_user:
+            ADMISSION_REJECTED.labels(self.name, "per_user").inc()
+            raise AdmissionRejected(self.name, "per-user limit reached", self.retry_after)
+
+        self._per_user[user] = self._per_user.get(user, 0) + 1
+        start_time = time.perf_counter()
+        try:
+            await asyncio.wait_for(self._slots.acquire(), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            self._release_user(user)
+            ADMISSION_QUEUE_WAIT.labels(self.name).observe(time.perf_counter() - start_time)
+            ADMISSION_REJECTED.labels(self.name, "queue_timeout").inc()
+            raise AdmissionRejected(self.name, "no free slot", self.retry_after)
+        except BaseException:
+            self._release_user(user)
+            raise
+        ADMISSION_QUEUE_WAIT.labels(self.name).observe(time.perf_counter() - start_time)
+        ADMISSION_ACTIVE.labels(self.name).inc()
+
+    def release(self, user: str) -> None:
+        self._slots.release()
+        self._release_user(user)
+        ADMISSION_ACTIVE.labels(self.name).dec()
+
+    def _release_user(self, user: str) -> None:
+        remaining = self._per_user.get(user, 0) - 1
+        if remaining > 0:
+            self._per_user[user] = remaining
+        else:
+            self._per_user.pop(user, None)
+
+
+class AdmissionController:
+    def __init__(self, route_classes: List[RouteClass]):
+        self.route_classes = route_classes
+
+    def route_class(self, method: str, path: str) -> Optional[RouteClass]:
+        for route_class in self.route_classes:
+            if route_class.matches(method, path):
+                return route_class
+        return None
+
+
+def build_admission_controller() -> AdmissionController:
+    get, post = frozenset({"GET"}), frozenset({"POST"})
+    return AdmissionController([
+        RouteClass(
+            "export",
+            [(get, "/hardware/export/excel"), (get, "/audit/export")],
+            concurrency=settings.admission_export_concurrency,
+            per_user=settings.admission_per_user_limit,
+            queue_timeout=settings.admission_queue_timeout_seconds,
+        ),
+        RouteClass(
+            "import",
+            [(post, "/hardware/import"), (post, "/hardware/import/confirm"), (post, "/api/hardware/import")],
+            concurrency=settings.admission_import_concurrency,
+            per_user=settings.admission_per_user_limit,
+            queue_timeout=settings.admission_queue_timeout_seconds,
+        ),
+    ])
+
+
+admission_controller = build_admission_controller()
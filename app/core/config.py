@@ -23,6 +23,69 @@ class Settings:
         self.session_expire_hours = int(os.getenv('SESSION_EXPIRE_HOURS', '8'))
         self.session_cookie_name = os.getenv('SESSION_COOKIE_NAME', 'inventory_session')
 
+        self.maintenance_enabled = os.getenv('MAINTENANCE_ENABLED', 'true').lower() == 'true'
+        self.session_cleanup_interval_seconds = int(os.getenv('SESSION_CLEANUP_INTERVAL_SECONDS', '900'))
+        self.session_cleanup_batch_size = int(os.getenv('SESSION_CLEANUP_BATCH_SIZE', '1000'))
+
+        self.audit_partition_months_ahead = int(os.getenv('AUDIT_PARTITION_MONTHS_AHEAD', '3'))
+        # 0 keeps access logs forever
+        self.audit_access_log_retention_months = int(os.getenv('AUDIT_ACCESS_LOG_RETENTION_MONTHS', '6'))
+        self.audit_rollup_flush_seconds = int(os.getenv('AUDIT_ROLLUP_FLUSH_SECONDS', '15'))
+        # which requests are written to access_logs, see app/audit/sampling.py
+        self.audit_log_rules = os.getenv('AUDIT_LOG_RULES', '')
+        # change payloads at least this large are stored compressed, 0 disables
+        self.audit_compression_min_bytes = int(os.getenv('AUDIT_COMPRESSION_MIN_BYTES', '2048'))
+        # as-of queries replay at most one interval of changes on top of a snapshot
+        self.hardware_snapshot_interval_hours = int(os.getenv('HARDWARE_SNAPSHOT_INTERVAL_HOURS', '24'))
+        # 0 keeps snapshots forever
+        self.hardware_snapshot_retention_days = int(os.getenv('HARDWARE_SNAPSHOT_RETENTION_DAYS', '365'))
+        # audit exports leave out rows younger than this, so transactions still open when they
+        # got their id have committed before a later since_id pull starts past it
+        self.audit_export_settle_seconds = int(os.getenv('AUDIT_EXPORT_SETTLE_SECONDS', '60'))
+
+        self.metrics_enabled = os.getenv('METRICS_ENABLED', 'true').lower() == 'true'
+        # bearer token required on /metrics, without one the route is not served
+        self.metrics_token = os.getenv('METRICS_TOKEN', '')
+
+        # off by default: any client can read the query counts and timings in Server-Timing
+        self.profiler_enabled = os.getenv('PROFILER_ENABLED', 'false').lower() == 'true'
+        # log the slowest statements of every request
+        self.profiler_log_queries = os.getenv('PROFILER_LOG_QUERIES', 'false').lower() == 'true'
+        # identical statements run this often in one request are reported as a possible N+1
+        self.profiler_repeat_threshold = int(os.getenv('PROFILER_REPEAT_THRESHOLD', '5'))
+
+        # statements slower than this are kept in slow_queries, 0 disables
+        self.slow_query_threshold_ms = int(os.getenv('SLOW_QUERY_THRESHOLD_MS', '500'))
+        # share of explained SELECTs re-run with EXPLAIN ANALYZE (Postgres only)
+        self.slow_query_explain_analyze_rate = float(os.getenv('SLOW_QUERY_EXPLAIN_ANALYZE_RATE', '0.0'))
+        self.slow_query_max_rows = int(os.getenv('SLOW_QUERY_MAX_ROWS', '1000'))
+
+        # with DATABASE_REPLICA_URLS: how long a client reads from the primary after a write
+        self.primary_pin_seconds = int(os.getenv('PRIMARY_PIN_SECONDS', '10'))
+        self.replica_check_interval_seconds = int(os.getenv('REPLICA_CHECK_INTERVAL_SECONDS', '10'))
+        # replicas further behind are taken out of rotation
+        self.replica_max_lag_seconds = int(os.getenv('REPLICA_MAX_LAG_SECONDS', '30'))
+
+        # concurrent exports / imports per worker, further requests queue and get a 429 after the timeout
+        self.admission_enabled = os.getenv('ADMISSION_ENABLED', 'true').lower() == 'true'
+        self.admission_export_concurrency = int(os.getenv('ADMISSION_EXPORT_CONCURRENCY', '2'))
+        self.admission_import_concurrency = int(os.getenv('ADMISSION_IMPORT_CONCURRENCY', '2'))
+        self.admission_per_user_limit = int(os.getenv('ADMISSION_PER_USER_LIMIT', '1'))
+        self.admission_queue_timeout_seconds = float(os.getenv('ADMISSION_QUEUE_TIMEOUT_SECONDS', '10'))
+
+        # background jobs for imports and large exports, run by every app worker
+        self.jobs_enabled = os.getenv('JOBS_ENABLED', 'true').lower() == 'true'
+        self.job_workers = int(os.getenv('JOB_WORKERS', '1'))
+        self.job_poll_seconds = float(os.getenv('JOB_POLL_SECONDS', '2'))
+        # a running job without a checkpoint for this long is assumed dead and run again
+        self.job_stale_seconds = int(os.getenv('JOB_STALE_SECONDS', '600'))
+        self.job_max_attempts = int(os.getenv('JOB_MAX_ATTEMPTS', '3'))
+        self.job_retention_hours = int(os.getenv('JOB_RETENTION_HOURS', '24'))
+        # rows committed per import checkpoint
+        self.job_import_chunk_size = int(os.getenv('JOB_IMPORT_CHUNK_SIZE', '500'))
+        # exports with more rows run as a job instead of inside the request
+        self.job_export_sync_max_rows = int(os.getenv('JOB_EXPORT_SYNC_MAX_ROWS', '5000'))
+
         self.log_level = os.getenv('LOG_LEVEL', 'INFO')
 
         self.threshold_all_in_one = int(os.getenv('THRESHOLD_ALL_IN_ONE', '4'))
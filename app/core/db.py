@@ -1,17 +1,45 @@
 from sqlmodel import SQLModel, create_engine, Session
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker
+from fastapi import Request
 from typing import Generator
 import os
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# after load_dotenv: prometheus_client picks its storage from PROMETHEUS_MULTIPROC_DIR on import
+from app.core.config import settings  # noqa: E402
+from app.core.metrics import DB_READ_SESSIONS, InstrumentedQueuePool, observe_pool  # noqa: E402
+from app.core.profiler import observe_queries  # noqa: E402
+from app.core.replicas import PRIMARY_PIN_COOKIE, ReplicaRouter  # noqa: E402
+
 DATABASE_URL = os.getenv("DATABASE_URL")
+# comma-separated, read-only routes (get_read_session) are spread over these
+DATABASE_REPLICA_URLS = [url.strip() for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if url.strip()]
+
+# SQLite keeps its own pool classes
+pool_options = {} if make_url(DATABASE_URL).get_backend_name() == "sqlite" else {"poolclass": InstrumentedQueuePool}
 
-engine = create_engine(DATABASE_URL, pool_pre_ping=True, pool_recycle=300)
+engine = create_engine(DATABASE_URL, pool_pre_ping=True, pool_recycle=300, **pool_options)
+observe_pool(engine)
+observe_queries(engine)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+replica_engines = []
+for replica_url in DATABASE_REPLICA_URLS:
+    # the pool metrics describe the primary, so replicas only feed the request profile
+    replica_engine = create_engine(replica_url, pool_pre_ping=True, pool_recycle=300)
+    observe_queries(replica_engine)
+    replica_engines.append(replica_engine)
+
+replica_router = ReplicaRouter(
+    replica_engines,
+    check_interval=settings.replica_check_interval_seconds,
+    max_lag_seconds=settings.replica_max_lag_seconds,
+)
+
 
 def create_db_and_tables():
     SQLModel.metadata.create_all(engine)
@@ -28,5 +56,39 @@ def get_session() -> Generator[Session, None, None]:
             session.close()
 
 
+def get_read_session(request: Request) -> Generator[Session, None, None]:
+    """Session for routes that only read, on a replica when one is configured and healthy.
+
+    Clients that wrote within the last PRIMARY_PIN_SECONDS carry the pin
+    cookie and read from the primary, so they see their own changes.
+    """
+    factory = None
+    if replica_router.enabled:
+        if PRIMARY_PIN_COOKIE in request.cookies:
+            DB_READ_SESSIONS.labels("pinned").inc()
+        else:
+            factory = replica_router.session_factory()
+            DB_READ_SESSIONS.labels("replica" if factory else "primary").inc()
+
+    with (factory or SessionLocal)() as session:
+        try:
+            yield session
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+
+def release_session(db: Session) -> None:
+    """Return the session's connection to the pool before rendering or building files.
+
+    Ends the transaction, so only call it once everything the response needs
+    has been copied out of the session (see app.services.views). The session
+    stays usable and checks out a new connection if it is queried again.
+    """
+    db.commit()
+
+
 def init_db():
     create_db_and_tables()
@@ -0,0 +1,246 @@
+import asyncio
+import logging
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import and_, delete, or_, select, update
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.audit.context import audit_context
+from app.core.config import settings
+from app.core.db import SessionLocal, engine
+from app.core.metrics import JOB_DURATION
+from app.models.job import FAILED, FINISHED_STATUSES, QUEUED, RUNNING, SUCCEEDED, Job
+
+logger = logging.getLogger(__name__)
+
+
+class JobContext:
+    """What a job handler gets: the session and a way to report progress."""
+
+    def __init__(self, db: Session, job: Job):
+        self.db = db
+        self.job = job
+
+    @property
+    def params(self) -> Dict[str, Any]:
+        return self.job.params or {}
+
+    def checkpoint(self, done: int, total: Optional[int] = None) -> None:
+        """Record progress and commit, together with the work done since the last checkpoint.
+
+        Committing both at once means a job picked up again after a crash
+        can resume from progress_done without repeating or skipping work.
+        """
+        self.job.progress_done = done
+        if total is not None:
+            self.job.progress_total = total
+        self.job.heartbeat_at = datetime.now(timezone.utc)
+        self.db.commit()
+
+
+class JobHeartbeat:
+    """Refreshes a running job's heartbeat_at from a thread, on its own connection.
+
+    Handlers checkpoint between chunks, but a single step (building a large
+    workbook) can outlast stale_seconds; without this another worker would
+    claim the job while it is still running.
+    """
+
+    def __init__(self, bind: Engine, job_id: int, attempt: int, interval: float):
+        self.bind = bind
+        self.job_id = job_id
+        self.attempt = attempt
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def __enter__(self) -> "JobHeartbeat":
+        self._thread = threading.Thread(target=self._run, name=f"job-heartbeat:{self.job_id}", daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._stop.set()
+        self._thread.join(timeout=self.interval + 1)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                with self.bind.begin() as connection:
+                    connection.execute(
+                        update(Job)
+                        .where(Job.id == self.job_id, Job.attempts == self.attempt, Job.status == RUNNING)
+                        .values(heartbeat_at=datetime.now(timezone.utc))
+                    )
+            except Exception as e:
+                logger.error(f"Heartbeat of job {self.job_id} failed: {e}")
+
+
+class JobQueue:
+    """Database-backed queue for imports and exports too long for a request.
+
+    Every app worker runs `workers` loops that claim the oldest queued job
+    with SELECT ... FOR UPDATE SKIP LOCKED, so concurrent workers never get
+    the same job and never wait for each other. The claim is committed right
+    away; a running job whose heartbeat is older than stale_seconds (its
+    worker died) is claimed again, up to max_attempts times. While a handler
+    runs, JobHeartbeat keeps the heartbeat fresh, and only the run holding
+    the latest claim (its attempt number) can record the outcome.
+    """
+
+    def __init__(
+        self,
+        bind: Engine,
+        workers: int = 1,
+        poll_interval: float = 2.0,
+        stale_seconds: float = 600.0,
+        max_attempts: int = 3,
+    ):
+        self.bind = bind
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.stale_seconds = stale_seconds
+        self.max_attempts = max_attempts
+        self.handlers: Dict[str, Callable[[JobContext], Dict[str, Any]]] = {}
+        self._tasks: List[asyncio.Task] = []
+
+    def register(self, kind: str, handler: Callable[[JobContext], Dict[str, Any]]) -> None:
+        if kind in self.handlers:
+            raise ValueError(f"Job handler '{kind}' is already registered")
+        self.handlers[kind] = handler
+
+    def enqueue(self, kind: str, params: Dict[str, Any], username: Optional[str], total: Optional[int] = None) -> int:
+        """Queue a job on the primary and return its id."""
+        context = dict(audit_context.get() or {})
+        context.pop("status_code", None)
+        with SessionLocal(bind=self.bind) as db:
+            job = Job(kind=kind, params=params, username=username, context=context, progress_total=total)
+            db.add(job)
+            db.commit()
+            return job.id
+
+    async def start(self) -> None:
+        for index in range(self.workers):
+            self._tasks.append(asyncio.create_task(self._run_forever(), name=f"jobs:{index}"))
+        logger.info(f"Job queue started with {self.workers} worker(s)")
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _run_forever(self) -> None:
+        while True:
+            try:
+                ran = await run_in_threadpool(self.run_next)
+            except Exception as e:
+                logger.error(f"Job worker error: {e}")
+                ran = False
+            if not ran:
+                await asyncio.sleep(self.poll_interval)
+
+    def claim(self, db: Session) -> Optional[Job]:
+        now = datetime.now(timezone.utc)
+        stale_before = now - timedelta(seconds=self.stale_seconds)
+        job = db.execute(
+            select(Job)
+            .where(
+                Job.kind.in_(list(self.handlers)),
+                or_(
+                    Job.status == QUEUED,
+                    and_(Job.status == RUNNING, Job.heartbeat_at < stale_before, Job.attempts < self.max_attempts),
+                ),
+            )
+            .order_by(Job.id)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+        ).scalar_one_or_none()
+        if job is None:
+            db.rollback()
+            return None
+
+        job.status = RUNNING
+        job.attempts += 1
+        job.started_at = job.started_at or now
+        job.heartbeat_at = now
+        db.commit()
+        return job
+
+    def run_next(self) -> bool:
+        """Claim and run one job, returns False when there was none."""
+        with SessionLocal(bind=self.bind) as db:
+            job = self.claim(db)
+            if job is None:
+                return False
+
+            # read before the handler runs, it commits and may leave the job expired
+            job_id, kind, attempt = job.id, job.kind, job.attempts
+            logger.info(f"Running job {job_id} ({kind}), attempt {attempt}")
+            start_time = time.perf_counter()
+            token = audit_context.set(job.context or {})
+            try:
+                with JobHeartbeat(self.bind, job_id, attempt, self.stale_seconds / 3):
+                    result = self.handlers[kind](JobContext(db, job))
+                status, values = SUCCEEDED, {"result": result, "error": None}
+            except Exception as e:
+                db.rollback()
+                logger.error(f"Job {job_id} ({kind}) failed: {e}")
+                status, values = FAILED, {"error": str(e)}
+            finally:
+                audit_context.reset(token)
+
+            # only the latest claim may finish the job: if this run went stale and was
+            # claimed again, its outcome (and the files the handler set) is discarded
+            finished = db.execute(
+                update(Job)
+                .where(Job.id == job_id, Job.attempts == attempt)
+                .values(status=status, finished_at=datetime.now(timezone.utc), **values)
+                .execution_options(synchronize_session=False)
+            ).rowcount
+            if not finished:
+                db.rollback()
+                logger.warning(f"Job {job_id} ({kind}) attempt {attempt} was claimed again meanwhile, result dropped")
+                return True
+            db.commit()
+            JOB_DURATION.labels(kind, status).observe(time.perf_counter() - start_time)
+            return True
+
+
+def prune_jobs(db: Session, retention_hours: int, stale_seconds: float, max_attempts: int) -> Dict[str, int]:
+    """Delete finished jobs (and their files) after the retention period.
+
+    Running jobs that went stale with no attempts left are marked failed,
+    since no worker will claim them again.
+    """
+    now = datetime.now(timezone.utc)
+    abandoned = db.execute(
+        update(Job)
+        .where(
+            Job.status == RUNNING,
+            Job.heartbeat_at < now - timedelta(seconds=stale_seconds),
+            Job.attempts >= max_attempts,
+        )
+        .values(status=FAILED, error="Worker stopped responding", finished_at=now)
+    ).rowcount
+    deleted = db.execute(
+        delete(Job).where(
+            Job.status.in_(FINISHED_STATUSES), Job.finished_at < now - timedelta(hours=retention_hours)
+        )
+    ).rowcount
+    db.commit()
+    return {"deleted": deleted, "abandoned": abandoned}
+
+
+job_queue = JobQueue(
+    engine,
+    workers=settings.job_workers,
+    poll_interval=settings.job_poll_seconds,
+    stale_seconds=settings.job_stale_seconds,
+    max_attempts=settings.job_max_attempts,
+)
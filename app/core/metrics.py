@@ -0,0 +1,185 @@
+"""Prometheus metrics.
+
+Request metrics are recorded by app.middleware.metrics, connection pool
+metrics by pool events and InstrumentedQueuePool, and the remaining
+in-process state (caches, queues, scheduler) is copied into metrics by
+app.services.metrics.refresh_runtime_metrics.
+
+With several workers, point PROMETHEUS_MULTIPROC_DIR at an empty directory
+shared by all of them and cleared on every deploy. Each worker then writes
+its values to memory-mapped files and /metrics aggregates them across
+workers, whichever worker serves the scrape.
+"""
+import os
+import time
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import QueuePool
+
+from app.core.profiler import current_profile
+
+MULTIPROCESS = bool(os.getenv("PROMETHEUS_MULTIPROC_DIR"))
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+POOL_WAIT_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Request duration by route template.",
+    ["method", "route", "status_class"],
+    buckets=LATENCY_BUCKETS,
+)
+HTTP_REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress", "Requests being processed.", ["method"], multiprocess_mode="livesum"
+)
+
+DB_POOL_CHECKOUTS = Counter("db_pool_checkouts_total", "Connections checked out of the pool.")
+DB_POOL_CONNECTIONS_CREATED = Counter("db_pool_connections_created_total", "New database connections opened.")
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out", "Connections currently checked out.", multiprocess_mode="livesum"
+)
+DB_POOL_OVERFLOW = Gauge(
+    "db_pool_overflow", "Connections open beyond pool_size.", multiprocess_mode="livesum"
+)
+DB_POOL_WAIT = Histogram(
+    "db_pool_wait_seconds", "Time to obtain a connection from the pool.", buckets=POOL_WAIT_BUCKETS
+)
+DB_CONNECTION_HOLD = Histogram(
+    "db_connection_hold_seconds",
+    "Time a request kept a pooled connection checked out, per checkout.",
+    ["method", "route"],
+    buckets=LATENCY_BUCKETS,
+)
+DB_READ_SESSIONS = Counter(
+    "db_read_sessions_total", "Sessions of read-only routes by the database they went to.", ["target"]
+)
+DB_REPLICAS_HEALTHY = Gauge(
+    "db_replicas_healthy", "Read replicas currently in rotation.", multiprocess_mode="livemin"
+)
+ADMISSION_QUEUE_WAIT = Histogram(
+    "admission_queue_wait_seconds", "Time a request waited for a slot of its route class.", ["route_class"],
+    buckets=POOL_WAIT_BUCKETS,
+)
+ADMISSION_ACTIVE = Gauge(
+    "admission_active_requests", "Requests holding a slot of their route class.", ["route_class"],
+    multiprocess_mode="livesum",
+)
+ADMISSION_REJECTED = Counter(
+    "admission_rejected_total", "Requests turned away with 429.", ["route_class", "reason"]
+)
+JOB_DURATION = Histogram(
+    "job_duration_seconds", "Run time of background jobs by outcome.", ["kind", "status"],
+    buckets=(0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0, 900.0, 3600.0),
+)
+
+REVOCATION_LOOKUPS = Counter("revocation_index_lookups_total", "Revoked session lookups.", ["result"])
+REVOCATION_INDEX_SIZE = Gauge(
+    "revocation_index_entries", "Revoked sessions held in memory.", multiprocess_mode="livemax"
+)
+ROLLUP_PENDING = Gauge(
+    "request_rollup_pending_keys", "Rollup rows waiting for the next flush.", multiprocess_mode="livesum"
+)
+ACCESS_LOG_DECISIONS = Counter("access_log_requests_total", "Requests seen by the access logger.", ["decision"])
+ACCESS_LOG_WRITES_PENDING = Gauge(
+    "access_log_writes_pending", "Access log rows being written by background tasks.", multiprocess_mode="livesum"
+)
+
+SCHEDULER_JOB_RUNS = Counter("scheduler_job_runs_total", "Maintenance job runs.", ["job"])
+SCHEDULER_JOB_FAILURES = Counter("scheduler_job_failures_total", "Failed maintenance job runs.", ["job"])
+SCHEDULER_JOB_SKIPPED = Counter(
+    "scheduler_job_skipped_total", "Runs skipped because another worker held the lock.", ["job"]
+)
+SCHEDULER_JOB_LAST_DURATION = Gauge(
+    "scheduler_job_last_duration_seconds", "Duration of the last run.", ["job"], multiprocess_mode="livemax"
+)
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waited for a connection.
+
+    The measured time includes opening a new connection when the pool has
+    to grow, which is part of the wait a request sees.
+    """
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            DB_POOL_WAIT.observe(time.perf_counter() - start)
+
+
+# hold times of the connections the current request checked out, set by MetricsMiddleware
+current_connection_holds: ContextVar[Optional[List[float]]] = ContextVar("current_connection_holds", default=None)
+
+
+def observe_pool(engine: Engine) -> None:
+    pool = engine.pool
+
+    def update_gauges():
+        if isinstance(pool, QueuePool):
+            DB_POOL_CHECKED_OUT.set(pool.checkedout())
+            DB_POOL_OVERFLOW.set(max(pool.overflow(), 0))
+
+    @event.listens_for(engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        DB_POOL_CONNECTIONS_CREATED.inc()
+
+    @event.listens_for(engine, "checkout")
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        DB_POOL_CHECKOUTS.inc()
+        connection_record.info["checked_out_at"] = time.perf_counter()
+        update_gauges()
+
+    @event.listens_for(engine, "checkin")
+    def on_checkin(dbapi_connection, connection_record):
+        update_gauges()
+        checked_out_at = connection_record.info.pop("checked_out_at", None)
+        if checked_out_at is None:
+            return
+        held = time.perf_counter() - checked_out_at
+        holds = current_connection_holds.get()
+        if holds is not None:
+            holds.append(held)
+        profile = current_profile.get()
+        if profile is not None:
+            profile.add_phase("conn", held * 1000)
+
+
+class CounterSync:
+    """Feeds counts that objects keep in plain attributes into Prometheus counters.
+
+    Only the increase since the previous sync is added, so the hot paths
+    keep incrementing ints and pay nothing for metrics.
+    """
+
+    def __init__(self):
+        self._last: Dict[Tuple[int, Tuple[str, ...]], float] = {}
+
+    def sync(self, counter: Counter, value: float, *labels: str) -> None:
+        key = (id(counter), labels)
+        delta = value - self._last.get(key, 0)
+        if delta > 0:
+            (counter.labels(*labels) if labels else counter).inc(delta)
+        self._last[key] = value
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    if MULTIPROCESS:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
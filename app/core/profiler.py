@@ -0,0 +1,124 @@
+"""Per-request query profiling.
+
+Cursor events on the engine add every statement executed while a request is
+being handled to that request's RequestProfile, found through a ContextVar
+(threadpool calls copy the context, so sync routes are covered too). Other
+phases (auth, template rendering) are timed with profile_phase().
+"""
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+STATEMENT_PREVIEW_CHARS = 200
+
+
+class StatementStats:
+    __slots__ = ("count", "total_ms", "max_ms")
+
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+
+class RequestProfile:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.query_count = 0
+        self.db_ms = 0.0
+        # keyed by SQL text, which is parameterized: an N+1 loop shows up as one statement with a high count
+        self.statements: Dict[str, StatementStats] = {}
+        self.phases: Dict[str, float] = {}
+
+    def record_query(self, statement: str, elapsed_ms: float) -> None:
+        self.query_count += 1
+        self.db_ms += elapsed_ms
+        stats = self.statements.get(statement)
+        if stats is None:
+            stats = self.statements[statement] = StatementStats()
+        stats.count += 1
+        stats.total_ms += elapsed_ms
+        stats.max_ms = max(stats.max_ms, elapsed_ms)
+
+    def add_phase(self, name: str, elapsed_ms: float) -> None:
+        self.phases[name] = self.phases.get(name, 0.0) + elapsed_ms
+
+    @property
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.started) * 1000
+
+    def repeated_statements(self, threshold: int) -> List[Tuple[str, StatementStats]]:
+        repeated = [(sql, stats) for sql, stats in self.statements.items() if stats.count >= threshold]
+        return sorted(repeated, key=lambda item: item[1].count, reverse=True)
+
+    def slowest_statements(self, limit: int = 5) -> List[Tuple[str, StatementStats]]:
+        return sorted(self.statements.items(), key=lambda item: item[1].total_ms, reverse=True)[:limit]
+
+    def server_timing(self, repeat_threshold: int) -> str:
+        repeated = len(self.repeated_statements(repeat_threshold))
+        description = f"{self.query_count} queries" + (f", {repeated} repeated" if repeated else "")
+        parts = [f'db;dur={self.db_ms:.1f};desc="{description}"']
+        parts.extend(f"{name};dur={elapsed_ms:.1f}" for name, elapsed_ms in self.phases.items())
+        parts.append(f"total;dur={self.elapsed_ms:.1f}")
+        return ", ".join(parts)
+
+    def summary(self, repeat_threshold: int) -> str:
+        lines = [f"{self.query_count} queries, {self.db_ms:.1f}ms db"]
+        for sql, stats in self.slowest_statements():
+            lines.append(f"  {stats.total_ms:.1f}ms x{stats.count}: {preview(sql)}")
+        for sql, stats in self.repeated_statements(repeat_threshold):
+            lines.append(f"  possible N+1, ran {stats.count} times: {preview(sql)}")
+        return "\n".join(lines)
+
+
+def preview(statement: str) -> str:
+    statement = " ".join(statement.split())
+    if len(statement) > STATEMENT_PREVIEW_CHARS:
+        return statement[:STATEMENT_PREVIEW_CHARS] + "..."
+    return statement
+
+
+current_profile: ContextVar[Optional[RequestProfile]] = ContextVar("current_profile", default=None)
+
+
+@contextmanager
+def profile_phase(name: str):
+    profile = current_profile.get()
+    if profile is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile.add_phase(name, (time.perf_counter() - start) * 1000)
+
+
+def observe_queries(engine: Engine) -> None:
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if current_profile.get() is not None:
+            conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        profile = current_profile.get()
+        starts = conn.info.get("query_start")
+        if profile is None or not starts:
+            return
+        profile.record_query(statement, (time.perf_counter() - starts.pop()) * 1000)
+
+    @event.listens_for(engine, "handle_error")
+    def handle_error(exception_context):
+        # failed statements never reach after_cursor_execute
+        connection = exception_context.connection
+        starts = connection.info.get("query_start") if connection is not None else None
+        if starts:
+            starts.pop()
@@ -0,0 +1,127 @@
+import itertools
+import logging
+import threading
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.metrics import DB_REPLICAS_HEALTHY
+
+logger = logging.getLogger(__name__)
+
+# set by PrimaryPinMiddleware after a write, reads of that client stay on the primary while it lasts
+PRIMARY_PIN_COOKIE = "db_primary_pin"
+
+# seconds the replica is behind; 0 when it has replayed everything it received,
+# since pg_last_xact_replay_timestamp() stands still while the primary is idle
+REPLICATION_LAG_SQL = text("""
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+""")
+
+
+class Replica:
+    def __init__(self, engine: Engine):
+        self.engine = engine
+        self.session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        self.name = engine.url.render_as_string(hide_password=True)
+        # assumed healthy until the first check says otherwise
+        self.healthy = True
+        self.lag_seconds: Optional[float] = None
+        self.last_error: Optional[str] = None
+
+    def to_dict(self) -> Dict:
+        return {
+            "name": self.name,
+            "healthy": self.healthy,
+            "lag_seconds": round(self.lag_seconds, 3) if self.lag_seconds is not None else None,
+            "last_error": self.last_error,
+        }
+
+
+class ReplicaRouter:
+    """Hands out sessions on read replicas, round-robin over the healthy ones.
+
+    A daemon thread checks every replica each check_interval seconds: it has
+    to answer and, on Postgres, be at most max_lag_seconds behind the
+    primary. Without a healthy replica reads go to the primary.
+    """
+
+    def __init__(self, engines: List[Engine], check_interval: float = 10.0, max_lag_seconds: float = 30.0):
+        self.replicas = [Replica(engine) for engine in engines]
+        self.check_interval = check_interval
+        self.max_lag_seconds = max_lag_seconds
+        self._next = itertools.count()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.replicas)
+
+    def session_factory(self) -> Optional[Callable[[], Session]]:
+        """Session factory of the next healthy replica, None if there is none."""
+        healthy = [replica for replica in self.replicas if replica.healthy]
+        if not healthy:
+            return None
+        return healthy[next(self._next) % len(healthy)].session_factory
+
+    def start(self) -> None:
+        if not self.replicas:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="replica-health", daemon=True)
+        self._thread.start()
+        logger.info(f"Routing reads to {len(self.replicas)} replica(s)")
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.check_interval + 1)
+            self._thread = None
+
+    def check(self) -> int:
+        """Check every replica once, returns how many are healthy."""
+        for replica in self.replicas:
+            healthy = self._check(replica)
+            if healthy != replica.healthy:
+                if healthy:
+                    logger.info(f"Replica {replica.name} is healthy again")
+                else:
+                    logger.warning(f"Replica {replica.name} taken out of rotation: {replica.last_error}")
+            replica.healthy = healthy
+        healthy_count = sum(replica.healthy for replica in self.replicas)
+        DB_REPLICAS_HEALTHY.set(healthy_count)
+        return healthy_count
+
+    def _check(self, replica: Replica) -> bool:
+        try:
+            with replica.engine.connect() as connection:
+                if connection.dialect.name == "postgresql":
+                    replica.lag_seconds = float(connection.execute(REPLICATION_LAG_SQL).scalar())
+                else:
+                    connection.execute(text("SELECT 1"))
+                    replica.lag_seconds = 0.0
+        except Exception as e:
+            replica.last_error = str(e).splitlines()[0] if str(e) else type(e).__name__
+            return False
+        if replica.lag_seconds > self.max_lag_seconds:
+            replica.last_error = f"{replica.lag_seconds:.1f}s behind the primary"
+            return False
+        replica.last_error = None
+        return True
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.check()
+            except Exception as e:
+                logger.error(f"Replica health check failed: {e}")
+            self._stop.wait(self.check_interval)
+
+    def get_stats(self) -> List[Dict]:
+        return [replica.to_dict() for replica in self.replicas]
@@ -0,0 +1,150 @@
+import logging
+import select as select_module
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+from sqlalchemy import delete, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.core.db import SessionLocal, engine
+from app.models.revoked_session import RevokedSession
+
+logger = logging.getLogger(__name__)
+
+REVOCATION_CHANNEL = "session_revoked"
+
+
+class RevocationIndex:
+    """In-memory set of revoked session ids (JWT ``jti``).
+
+    Lookups are a single dict probe, so checking it on every request costs
+    well under a microsecond. Entries are kept only until the token would have
+    expired anyway.
+    """
+
+    def __init__(self):
+        self._revoked: Dict[str, float] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._revoked)
+
+    def is_revoked(self, jti: Optional[str]) -> bool:
+        if jti is not None and jti in self._revoked:
+            self.hits += 1
+            return True
+        self.misses += 1
+        return False
+
+    def add(self, jti: str, expires_at: float) -> None:
+        self._revoked[jti] = expires_at
+
+    def prune(self) -> int:
+        now = time.time()
+        # add() runs concurrently (listener and request threads): iterate a copy, and pop
+        # instead of swapping in a filtered dict, which would lose entries added meanwhile
+        expired = [jti for jti, expires_at in list(self._revoked.items()) if expires_at < now]
+        for jti in expired:
+            self._revoked.pop(jti, None)
+        return len(expired)
+
+    def load(self, db: Session) -> int:
+        now = datetime.now(timezone.utc)
+        rows = db.execute(
+            select(RevokedSession.jti, RevokedSession.expires_at).where(RevokedSession.expires_at > now)
+        ).all()
+        # swap in one assignment so readers never see a half-built set
+        self._revoked = {jti: expires_at.timestamp() for jti, expires_at in rows}
+        return len(self._revoked)
+
+
+def encode_notification(jti: str, expires_at: float) -> str:
+    return f"{jti}:{int(expires_at)}"
+
+
+def decode_notification(payload: str):
+    jti, _, expires_at = payload.partition(":")
+    return jti, float(expires_at or 0)
+
+
+class RevocationListener:
+    """Keeps the index of this worker in sync via Postgres LISTEN/NOTIFY.
+
+    Runs in a daemon thread on a dedicated connection detached from the pool.
+    Every time LISTEN succeeds, the first time included, the index is reloaded
+    in full: revocations committed before that (while disconnected, or between
+    the startup load and the first LISTEN) sent no notification it received.
+    """
+
+    def __init__(self, index: RevocationIndex, bind: Engine, poll_timeout: float = 5.0):
+        self.index = index
+        self.bind = bind
+        self.poll_timeout = poll_timeout
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self.bind.dialect.name != "postgresql":
+            logger.info("Session revocation listener disabled: database is not PostgreSQL")
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="revocation-listener", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.poll_timeout + 1)
+            self._thread = None
+
+    def _run(self) -> None:
+        backoff = 1.0
+        while not self._stop.is_set():
+            connection = None
+            try:
+                connection = self.bind.raw_connection()
+                connection.detach()
+                dbapi_connection = connection.driver_connection
+                dbapi_connection.autocommit = True
+                with dbapi_connection.cursor() as cursor:
+                    cursor.execute(f"LISTEN {REVOCATION_CHANNEL}")
+
+                # after LISTEN, so a revocation is either loaded here or notified
+                with SessionLocal(bind=self.bind) as db:
+                    self.index.load(db)
+                backoff = 1.0
+
+                while not self._stop.is_set():
+                    ready, _, _ = select_module.select([dbapi_connection], [], [], self.poll_timeout)
+                    if not ready:
+                        continue
+                    dbapi_connection.poll()
+                    while dbapi_connection.notifies:
+                        notify = dbapi_connection.notifies.pop(0)
+                        jti, expires_at = decode_notification(notify.payload)
+                        if jti:
+                            self.index.add(jti, expires_at)
+            except Exception as e:
+                logger.error(f"Session revocation listener error, reconnecting in {backoff:.0f}s: {e}")
+                self._stop.wait(backoff)
+                backoff = min(backoff * 2, 60.0)
+            finally:
+                if connection is not None:
+                    try:
+                        connection.close()
+                    except Exception:
+                        pass
+
+
+def prune_revoked_sessions(db: Session) -> int:
+    result = db.execute(delete(RevokedSession).where(RevokedSession.expires_at < datetime.now(timezone.utc)))
+    db.commit()
+    return result.rowcount
+
+
+revocation_index = RevocationIndex()
+revocation_listener = RevocationListener(revocation_index, engine)
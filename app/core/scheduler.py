@@ -0,0 +1,141 @@
+import asyncio
+import logging
+import random
+import time
+import zlib
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import func, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.core.db import SessionLocal, engine
+
+logger = logging.getLogger(__name__)
+
+
+class ScheduledJob:
+    def __init__(self, name: str, func: Callable[[Session], Any], interval_seconds: float, exclusive: bool = True):
+        self.name = name
+        self.func = func
+        self.interval_seconds = interval_seconds
+        # exclusive jobs run on a single worker at a time (Postgres advisory lock)
+        self.exclusive = exclusive
+
+        self.runs = 0
+        self.failures = 0
+        self.skipped = 0
+        self.last_run_at: Optional[datetime] = None
+        self.last_duration_ms: Optional[float] = None
+        self.total_duration_ms = 0.0
+        self.last_result: Any = None
+        self.last_error: Optional[str] = None
+
+    @property
+    def lock_key(self) -> int:
+        # stable across processes, unlike hash()
+        return zlib.crc32(f"maintenance:{self.name}".encode("utf-8"))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "interval_seconds": self.interval_seconds,
+            "exclusive": self.exclusive,
+            "runs": self.runs,
+            "failures": self.failures,
+            "skipped": self.skipped,
+            "last_run_at": self.last_run_at.isoformat() if self.last_run_at else None,
+            "last_duration_ms": round(self.last_duration_ms, 2) if self.last_duration_ms is not None else None,
+            "avg_duration_ms": round(self.total_duration_ms / self.runs, 2) if self.runs else None,
+            "last_result": self.last_result,
+            "last_error": self.last_error,
+        }
+
+
+class MaintenanceScheduler:
+    """Runs periodic housekeeping jobs in the background of each worker.
+
+    Jobs are plain functions taking a Session. They run in the threadpool so
+    they never block the event loop.
+    """
+
+    def __init__(self, bind: Engine):
+        self.bind = bind
+        self.jobs: Dict[str, ScheduledJob] = {}
+        self._tasks: List[asyncio.Task] = []
+
+    def add_job(
+        self, name: str, func: Callable[[Session], Any], interval_seconds: float, exclusive: bool = True
+    ) -> ScheduledJob:
+        if name in self.jobs:
+            raise ValueError(f"Job '{name}' is already registered")
+        job = ScheduledJob(name, func, interval_seconds, exclusive)
+        self.jobs[name] = job
+        return job
+
+    async def start(self) -> None:
+        for job in self.jobs.values():
+            self._tasks.append(asyncio.create_task(self._run_forever(job), name=f"maintenance:{job.name}"))
+        logger.info(f"Maintenance scheduler started with {len(self.jobs)} job(s)")
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        logger.info("Maintenance scheduler stopped")
+
+    async def _run_forever(self, job: ScheduledJob) -> None:
+        # spread the first run so workers started together don't all race for the lock
+        await asyncio.sleep(random.uniform(0, min(job.interval_seconds, 30)))
+        while True:
+            await run_in_threadpool(self.run_job, job)
+            await asyncio.sleep(job.interval_seconds)
+
+    def run_job(self, job: ScheduledJob) -> Any:
+        if job.exclusive and self.bind.dialect.name == "postgresql":
+            return self._run_exclusive(job)
+        with SessionLocal(bind=self.bind) as session:
+            return self._execute(job, session)
+
+    def _run_exclusive(self, job: ScheduledJob) -> Any:
+        with self.bind.connect() as connection:
+            acquired = connection.execute(select(func.pg_try_advisory_lock(job.lock_key))).scalar()
+            connection.commit()
+            if not acquired:
+                job.skipped += 1
+                logger.debug(f"Skipping job {job.name}: another worker holds the lock")
+                return None
+            try:
+                with SessionLocal(bind=connection) as session:
+                    return self._execute(job, session)
+            finally:
+                connection.execute(select(func.pg_advisory_unlock(job.lock_key)))
+                connection.commit()
+
+    def _execute(self, job: ScheduledJob, session: Session) -> Any:
+        start_time = time.perf_counter()
+        job.last_run_at = datetime.now(timezone.utc)
+        try:
+            result = job.func(session)
+            job.last_result = result
+            job.last_error = None
+            return result
+        except Exception as e:
+            session.rollback()
+            job.failures += 1
+            job.last_error = str(e)
+            logger.error(f"Maintenance job {job.name} failed: {e}")
+            return None
+        finally:
+            job.runs += 1
+            job.last_duration_ms = (time.perf_counter() - start_time) * 1000
+            job.total_duration_ms += job.last_duration_ms
+
+    def get_job_stats(self) -> List[Dict[str, Any]]:
+        return [job.to_dict() for job in self.jobs.values()]
+
+
+scheduler = MaintenanceScheduler(engine)
@@ -0,0 +1,212 @@
+"""Slow query log.
+
+Statements slower than SLOW_QUERY_THRESHOLD_MS are queued from the cursor
+event together with the request that ran them. A background thread stores
+them in slow_queries, adding an EXPLAIN for SELECTs. A sampled fraction
+gets EXPLAIN ANALYZE, run in a rolled back transaction with a statement
+timeout. Bind parameters are stored with sensitive values redacted; values
+without a name (positional parameters) are always redacted, since nothing
+tells which column they belong to.
+"""
+import logging
+import queue
+import random
+import re
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+from sqlalchemy import delete, event, insert, select
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+
+from app.audit.context import audit_context
+from app.core.config import settings
+from app.core.db import engine
+from app.models.slow_query import SlowQuery
+
+logger = logging.getLogger(__name__)
+
+# set on the recorder's own connection so EXPLAIN and the inserts are not recorded again
+SKIP_OPTION = "slow_query_skip"
+START_KEY = "slow_query_start"
+
+SENSITIVE_PARAMETER_RE = re.compile(r"pass|secret|token|jti|hash|cookie|key", re.IGNORECASE)
+REDACTED = "[redacted]"
+MAX_PARAMETER_CHARS = 200
+
+# a statement that stays slow is explained at most this often
+EXPLAIN_INTERVAL_SECONDS = 300
+# statements remembered for that, the least recently explained are forgotten first
+MAX_EXPLAINED_STATEMENTS = 1000
+# ANALYZE re-runs the statement, so nothing that locks or has side effects
+NOT_ANALYZABLE_RE = re.compile(r"\bFOR\s+(UPDATE|SHARE)\b|pg_notify|advisory_lock|nextval|setval", re.IGNORECASE)
+
+
+def _truncate(value: Any) -> Any:
+    if value is None or isinstance(value, (bool, int, float)):
+        return value
+    text = str(value)
+    return text if len(text) <= MAX_PARAMETER_CHARS else text[:MAX_PARAMETER_CHARS] + "..."
+
+
+def redact_parameters(parameters: Any) -> Any:
+    if isinstance(parameters, dict):
+        return {
+            key: REDACTED if SENSITIVE_PARAMETER_RE.search(str(key)) else _truncate(value)
+            for key, value in parameters.items()
+        }
+    if isinstance(parameters, (list, tuple)):
+        return [None if value is None else REDACTED for value in parameters]
+    return None
+
+
+class SlowQueryRecorder:
+    def __init__(self, bind: Engine, queue_size: int = 100):
+        self.bind = bind
+        self._queue: "queue.Queue[Optional[Dict[str, Any]]]" = queue.Queue(maxsize=queue_size)
+        self._thread: Optional[threading.Thread] = None
+        self._last_explained: Dict[str, float] = {}
+        self.recorded = 0
+        self.dropped = 0
+
+    def start(self) -> None:
+        if settings.slow_query_threshold_ms <= 0 or self._thread is not None:
+            return
+        event.listen(self.bind, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(self.bind, "after_cursor_execute", self._after_cursor_execute)
+        event.listen(self.bind, "handle_error", self._handle_error)
+        self._thread = threading.Thread(target=self._run, name="slow-query-recorder", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        event.remove(self.bind, "before_cursor_execute", self._before_cursor_execute)
+        event.remove(self.bind, "after_cursor_execute", self._after_cursor_execute)
+        event.remove(self.bind, "handle_error", self._handle_error)
+        try:
+            self._queue.put(None, timeout=1)
+        except queue.Full:
+            pass
+        self._thread.join(timeout=5)
+        self._thread = None
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault(START_KEY, []).append(time.perf_counter())
+
+    def _handle_error(self, exception_context):
+        connection = exception_context.connection
+        starts = connection.info.get(START_KEY) if connection is not None else None
+        if starts:
+            starts.pop()
+
+    def _after_cursor_execute(self, conn: Connection, cursor, statement, parameters, context, executemany):
+        starts = conn.info.get(START_KEY)
+        if not starts:
+            return
+        duration_ms = (time.perf_counter() - starts.pop()) * 1000
+        if duration_ms < settings.slow_query_threshold_ms or conn.get_execution_options().get(SKIP_OPTION):
+            return
+
+        request = audit_context.get() or {}
+        entry = {
+            "timestamp": datetime.now(timezone.utc),
+            "duration_ms": duration_ms,
+            "statement": statement,
+            # kept unredacted in memory only, to run the EXPLAIN
+            "raw_parameters": None if executemany else parameters,
+            "parameters": redact_parameters(parameters[0] if executemany and parameters else parameters),
+            "method": request.get("method"),
+            "path": (request.get("path") or "")[:500] or None,
+            "username": request.get("username"),
+        }
+        try:
+            self._queue.put_nowait(entry)
+        except queue.Full:
+            self.dropped += 1
+
+    def _run(self) -> None:
+        while True:
+            entry = self._queue.get()
+            if entry is None:
+                return
+            try:
+                self._store(entry)
+                self.recorded += 1
+            except Exception as e:
+                logger.error(f"Failed to record slow query: {e}")
+
+    def _store(self, entry: Dict[str, Any]) -> None:
+        raw_parameters = entry.pop("raw_parameters")
+        with self.bind.connect() as connection:
+            connection = connection.execution_options(**{SKIP_OPTION: True})
+            plan, analyzed = None, False
+            if self._should_explain(entry["statement"], raw_parameters):
+                try:
+                    plan, analyzed = self._explain(connection, entry, raw_parameters)
+                except Exception as e:
+                    connection.rollback()
+                    plan = f"EXPLAIN failed: {e}"
+            connection.execute(insert(SlowQuery).values(**entry, plan=plan, plan_analyzed=analyzed))
+            connection.commit()
+        logger.warning(
+            f"Slow query ({entry['duration_ms']:.0f}ms) during {entry['method']} {entry['path']}: "
+            f"{' '.join(entry['statement'].split())[:200]}"
+        )
+
+    def _should_explain(self, statement: str, raw_parameters: Any) -> bool:
+        if raw_parameters is None and "%(" in statement:
+            return False
+        if not statement.lstrip().upper().startswith("SELECT"):
+            return False
+        now = time.monotonic()
+        if now - self._last_explained.get(statement, -EXPLAIN_INTERVAL_SECONDS) < EXPLAIN_INTERVAL_SECONDS:
+            return False
+        # re-inserted so the dict stays ordered from least to most recently explained
+        self._last_explained.pop(statement, None)
+        self._last_explained[statement] = now
+        while len(self._last_explained) > MAX_EXPLAINED_STATEMENTS:
+            del self._last_explained[next(iter(self._last_explained))]
+        return True
+
+    def _explain(self, connection: Connection, entry: Dict[str, Any], raw_parameters: Any):
+        statement = entry["statement"]
+        parameters = raw_parameters or ()
+        if self.bind.dialect.name == "sqlite":
+            rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).all()
+            connection.rollback()
+            return "\n".join(str(row[-1]) for row in rows), False
+
+        analyze = (
+            random.random() < settings.slow_query_explain_analyze_rate
+            and not NOT_ANALYZABLE_RE.search(statement)
+        )
+        try:
+            if analyze:
+                # never let the re-run take much longer than the original
+                timeout_ms = int(min(max(entry["duration_ms"] * 5, 1000), 30000))
+                connection.exec_driver_sql(f"SET LOCAL statement_timeout = {timeout_ms}")
+                prefix = "EXPLAIN (ANALYZE, BUFFERS) "
+            else:
+                prefix = "EXPLAIN "
+            rows = connection.exec_driver_sql(prefix + statement, parameters).scalars().all()
+        finally:
+            connection.rollback()
+        return "\n".join(rows), analyze
+
+
+def prune_slow_queries(db: Session, max_rows: int) -> int:
+    """Keep only the newest max_rows entries."""
+    boundary = db.execute(
+        select(SlowQuery.id).order_by(SlowQuery.id.desc()).offset(max_rows).limit(1)
+    ).scalar()
+    if boundary is None:
+        return 0
+    result = db.execute(delete(SlowQuery).where(SlowQuery.id <= boundary))
+    db.commit()
+    return result.rowcount
+
+
+slow_query_recorder = SlowQueryRecorder(engine)
@@ -1,3 +1,15 @@
 from fastapi.templating import Jinja2Templates
 
-templates = Jinja2Templates(directory="app/templates")
+from app.core.profiler import profile_phase
+
+
+class ProfiledTemplates(Jinja2Templates):
+    """Jinja2Templates that reports rendering time to the request profile."""
+
+    def TemplateResponse(self, *args, **kwargs):
+        # the response renders the template when it is constructed
+        with profile_phase("template"):
+            return super().TemplateResponse(*args, **kwargs)
+
+
+templates = ProfiledTemplates(directory="app/templates")
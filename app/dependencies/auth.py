@@ -2,6 +2,7 @@ import os
 from typing import Optional, Dict, Any
 from fastapi import HTTPException, Request, status
 from app.core.config import settings
+from app.core.profiler import profile_phase
 from app.services.auth import AuthService, UserRole
 import logging
 
@@ -15,7 +16,8 @@ def get_current_user(request: Request) -> Optional[Dict[str, Any]]:
             return None
 
         auth_service = AuthService()
-        payload = auth_service.verify_session_token(session_token)
+        with profile_phase("auth"):
+            payload = auth_service.verify_session_token(session_token)
 
         if not payload:
             return None
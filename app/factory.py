@@ -12,10 +12,25 @@ from app.routes.api import router as api_router
 from app.routes.pages import router as pages_router
 from app.routes.auth import router as auth_router
 from app.routes.audit_log import router as audit_log_router
+from app.routes.metrics import router as metrics_router
+from app.routes.jobs import router as jobs_router
+from app.middleware.admission import AdmissionMiddleware
 from app.middleware.audit_logging import AuditLoggingMiddleware
 from app.middleware.auth import AuthenticationMiddleware
+from app.middleware.metrics import MetricsMiddleware
+from app.middleware.profiler import ProfilerMiddleware
+from app.middleware.replicas import PrimaryPinMiddleware
+from app.core.config import settings
+from app.core.db import SessionLocal, replica_router
+from app.core.jobs import job_queue
+from app.core.revocation import revocation_index, revocation_listener
+from app.core.scheduler import scheduler
+from app.core.slow_queries import slow_query_recorder
 from app.core.templates import templates
 from app.audit.listeners import initialize_audit_listeners
+from app.audit.rollups import rollup_accumulator
+from app.services.jobs import register_job_handlers
+from app.services.maintenance import register_maintenance_jobs
 
 
 logger = logging.getLogger(__name__)
@@ -45,8 +60,32 @@ async def lifespan(app: FastAPI):
     logger.info("Initializing audit listeners...")
     initialize_audit_listeners()
     logger.info("Audit listeners initialized.")
+    try:
+        with SessionLocal() as db:
+            logger.info(f"Loaded {revocation_index.load(db)} revoked session(s).")
+    except Exception as e:
+        logger.error(f"Failed to load revoked sessions: {e}")
+    revocation_listener.start()
+    slow_query_recorder.start()
+    replica_router.start()
+    if settings.maintenance_enabled:
+        register_maintenance_jobs(scheduler)
+        await scheduler.start()
+    if settings.jobs_enabled:
+        register_job_handlers(job_queue)
+        await job_queue.start()
     yield
     logger.info("App shutting down...")
+    await scheduler.stop()
+    await job_queue.stop()
+    revocation_listener.stop()
+    slow_query_recorder.stop()
+    replica_router.stop()
+    try:
+        with SessionLocal() as db:
+            rollup_accumulator.flush(db)
+    except Exception as e:
+        logger.error(f"Failed to flush request rollups on shutdown: {e}")
 
 
 def create_app() -> FastAPI:
@@ -67,8 +106,18 @@ def create_app() -> FastAPI:
         )
 
     app.add_middleware(ProxyHeadersMiddleware, trusted_hosts="*")
+    if settings.admission_enabled:
+        # inside AuthenticationMiddleware, which identifies the user it counts per
+        app.add_middleware(AdmissionMiddleware)
     app.add_middleware(AuthenticationMiddleware)
     app.add_middleware(AuditLoggingMiddleware)
+    if replica_router.enabled:
+        app.add_middleware(PrimaryPinMiddleware)
+    if settings.profiler_enabled:
+        app.add_middleware(ProfilerMiddleware)
+    if settings.metrics_enabled:
+        # outermost, so the time spent in the other middlewares is included
+        app.add_middleware(MetricsMiddleware)
 
     app.mount("/static", StaticFiles(directory="app/static"), name="static")
 
@@ -76,6 +125,12 @@ def create_app() -> FastAPI:
     app.include_router(pages_router)
     app.include_router(hardware_router, prefix="/hardware")
     app.include_router(audit_log_router, prefix="")
+    app.include_router(jobs_router)
     app.include_router(api_router, prefix="/api", tags=["api"])
+    if settings.metrics_enabled:
+        if settings.metrics_token:
+            app.include_router(metrics_router)
+        else:
+            logger.warning("METRICS_TOKEN is not set, /metrics is not served")
 
     return app
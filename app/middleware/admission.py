@@ -0,0 +1,45 @@
+from starlette.responses import JSONResponse
+
+from app.core.admission import AdmissionController, AdmissionRejected, admission_controller
+
+
+class AdmissionMiddleware:
+    """Applies the route class limits of app.core.admission.
+
+    Sits inside AuthenticationMiddleware so requests are counted per user,
+    falling back to the client address. The slot is held until the response
+    has been sent, including streamed bodies.
+    """
+
+    def __init__(self, app, controller: AdmissionController = None):
+        self.app = app
+        self.controller = controller or admission_controller
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        route_class = self.controller.route_class(scope["method"], scope["path"])
+        if route_class is None:
+            await self.app(scope, receive, send)
+            return
+
+        user = (scope.get("state") or {}).get("user") or {}
+        client = scope.get("client")
+        user_key = user.get("username") or (client[0] if client else "unknown")
+
+        try:
+            await route_class.acquire(user_key)
+        except AdmissionRejected as e:
+            response = JSONResponse(
+                {"detail": f"Too many concurrent {e.route_class} requests, try again later"},
+                status_code=429,
+                headers={"Retry-After": str(e.retry_after)},
+            )
+            await response(scope, receive, send)
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            route_class.release(user_key)
@@ -6,14 +6,19 @@ from fastapi import Request, Response, BackgroundTasks
 from starlette.middleware.base import BaseHTTPMiddleware
 from sqlalchemy.orm import Session
 from app.core.db import SessionLocal
-from app.models.audit_log import AuditLog
+from app.models.access_log import AccessLog
 from app.dependencies.auth import get_current_user
 from app.audit.context import audit_context
+from app.audit.rollups import UNMATCHED_ROUTE, rollup_accumulator
+from app.audit.sampling import access_log_sampler
+from app.core.metrics import ACCESS_LOG_WRITES_PENDING
 
 logger = logging.getLogger(__name__)
 
 
 def log_to_database(log_data: dict):
+    # counted here, not when queued: Starlette drops background tasks when sending the response fails
+    ACCESS_LOG_WRITES_PENDING.inc()
     db: Session = SessionLocal()
     try:
         current_user = log_data.pop("current_user", None)
@@ -24,20 +29,23 @@ def log_to_database(log_data: dict):
             username = current_user.get("username")
             user_id = current_user.get("user_id")
 
-        audit_log = AuditLog(**log_data, user_id=user_id, username=username, timestamp=datetime.now(timezone.utc))
-        db.add(audit_log)
+        access_log = AccessLog(**log_data, user_id=user_id, username=username, timestamp=datetime.now(timezone.utc))
+        db.add(access_log)
         db.commit()
     except Exception as e:
         logger.error(f"Failed to save audit log: {e}")
         db.rollback()
     finally:
         db.close()
+        ACCESS_LOG_WRITES_PENDING.dec()
 
 
 class AuditLoggingMiddleware(BaseHTTPMiddleware):
     def __init__(self, app, skip_paths: list = None):
         super().__init__(app)
-        self.skip_paths = skip_paths or ["/static/", "/docs", "/redoc", "/openapi.json", "/health", "/favicon.ico"]
+        self.skip_paths = skip_paths or [
+            "/static/", "/docs", "/redoc", "/openapi.json", "/health", "/favicon.ico", "/metrics",
+        ]
 
     async def dispatch(self, request: Request, call_next: Callable) -> Response:
         if any(request.url.path.startswith(skip) for skip in self.skip_paths):
@@ -62,8 +70,17 @@ class AuditLoggingMiddleware(BaseHTTPMiddleware):
         request_body_bytes = await request.body()
         request_body_size = len(request_body_bytes) if request_body_bytes else 0
 
+        original_receive = request.receive
+        body_replayed = False
+
+        # the body was read above: hand it out once, then pass on what the
+        # server sends next (http.disconnect), which streaming responses wait for
         async def receive():
-            return {"type": "http.request", "body": request_body_bytes}
+            nonlocal body_replayed
+            if body_replayed:
+                return await original_receive()
+            body_replayed = True
+            return {"type": "http.request", "body": request_body_bytes, "more_body": False}
 
         request._receive = receive
 
@@ -88,6 +105,19 @@ class AuditLoggingMiddleware(BaseHTTPMiddleware):
         finally:
             response_time_ms = (time.time() - start_time) * 1000
 
+            # rollups see every request, access_logs only what the rules keep
+            logged = access_log_sampler.should_log(request.method, request.url.path, status_code)
+
+            route = request.scope.get("route")
+            rollup_accumulator.record(
+                datetime.now(timezone.utc),
+                getattr(route, "path", None) or UNMATCHED_ROUTE,
+                request.method,
+                status_code,
+                response_time_ms,
+                logged=logged,
+            )
+
             log_data_for_access_log = {
                 "method": request.method,
                 "path": request.url.path,
@@ -102,9 +132,10 @@ class AuditLoggingMiddleware(BaseHTTPMiddleware):
                 "current_user": current_user,
             }
 
-            if getattr(response, "background", None) is None:
-                response.background = BackgroundTasks()
-            response.background.add_task(log_to_database, log_data=log_data_for_access_log)
+            if logged:
+                if getattr(response, "background", None) is None:
+                    response.background = BackgroundTasks()
+                response.background.add_task(log_to_database, log_data=log_data_for_access_log)
 
             audit_context.reset(token)
 
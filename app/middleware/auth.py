@@ -3,6 +3,7 @@ from fastapi import Request, Response
 from fastapi.responses import RedirectResponse
 from starlette.middleware.base import BaseHTTPMiddleware
 from app.core.config import settings
+from app.core.profiler import profile_phase
 from app.services.auth import AuthService
 import logging
 
@@ -17,6 +18,8 @@ class AuthenticationMiddleware(BaseHTTPMiddleware):
         "/health",
         "/favicon.ico",
         "/access-denied",
+        # checks its own bearer token, and is only mounted when METRICS_TOKEN is set
+        "/metrics",
     ]
 
     def __init__(self, app, public_paths: Optional[List[str]] = None):
@@ -49,7 +52,8 @@ class AuthenticationMiddleware(BaseHTTPMiddleware):
         if session_token:
             auth_service = AuthService()
 
-            payload = auth_service.verify_session_token(session_token)
+            with profile_phase("auth"):
+                payload = auth_service.verify_session_token(session_token)
             if payload:
                 self._set_user_state(request, payload)
                 return await call_next(request)
@@ -0,0 +1,58 @@
+import time
+
+from app.audit.rollups import UNMATCHED_ROUTE
+from app.core.metrics import (
+    DB_CONNECTION_HOLD,
+    HTTP_REQUEST_DURATION,
+    HTTP_REQUESTS_IN_PROGRESS,
+    current_connection_holds,
+)
+
+
+class MetricsMiddleware:
+    """Request latency and concurrency metrics.
+
+    A plain ASGI middleware: it adds no task or body buffering per request,
+    and measures streamed responses until their last chunk. Latency is
+    labelled with the matched route template (e.g. /hardware/{hardware_id})
+    to keep the number of series bounded. The time each pooled connection
+    stayed checked out during the request is recorded under the same route.
+    """
+
+    def __init__(self, app, skip_paths: list = None):
+        self.app = app
+        self.skip_paths = skip_paths or ["/static/", "/metrics", "/health", "/favicon.ico"]
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or any(scope["path"].startswith(skip) for skip in self.skip_paths):
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        in_progress = HTTP_REQUESTS_IN_PROGRESS.labels(method)
+        in_progress.inc()
+        connection_holds = []
+        token = current_connection_holds.set(connection_holds)
+        start_time = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            in_progress.dec()
+            current_connection_holds.reset(token)
+            # the router stores the matched route in the shared scope
+            route = getattr(scope.get("route"), "path", None) or UNMATCHED_ROUTE
+            HTTP_REQUEST_DURATION.labels(method, route, f"{status_code // 100}xx").observe(
+                time.perf_counter() - start_time
+            )
+            if connection_holds:
+                hold_histogram = DB_CONNECTION_HOLD.labels(method, route)
+                for held in connection_holds:
+                    hold_histogram.observe(held)
@@ -0,0 +1,47 @@
+import logging
+
+from app.core.config import settings
+from app.core.profiler import RequestProfile, current_profile
+
+logger = logging.getLogger(__name__)
+
+
+class ProfilerMiddleware:
+    """Profiles each request and reports it in a Server-Timing header.
+
+    The header splits the time into db (with the query count), conn (how
+    long pooled connections stayed checked out), auth, template and total.
+    With PROFILER_LOG_QUERIES a summary of the slowest and repeated
+    statements is logged after every request; repeated statements are
+    logged as a warning regardless.
+    """
+
+    def __init__(self, app, skip_paths: list = None):
+        self.app = app
+        self.skip_paths = skip_paths or ["/static/", "/metrics", "/health", "/favicon.ico"]
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or any(scope["path"].startswith(skip) for skip in self.skip_paths):
+            await self.app(scope, receive, send)
+            return
+
+        profile = RequestProfile()
+        token = current_profile.set(profile)
+        threshold = settings.profiler_repeat_threshold
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", profile.server_timing(threshold).encode("latin-1")))
+                message["headers"] = headers
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            current_profile.reset(token)
+            request_line = f"{scope['method']} {scope['path']}"
+            if settings.profiler_log_queries:
+                logger.info(f"{request_line}: {profile.summary(threshold)}")
+            elif profile.repeated_statements(threshold):
+                logger.warning(f"{request_line} repeats statements: {profile.summary(threshold)}")
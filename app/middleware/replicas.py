@@ -0,0 +1,33 @@
+from app.core.config import settings
+from app.core.replicas import PRIMARY_PIN_COOKIE
+
+WRITE_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+
+
+class PrimaryPinMiddleware:
+    """Pins a client to the primary for a while after it changed something.
+
+    Successful writes set a short-lived cookie; while the client sends it,
+    get_read_session uses the primary instead of a replica that may not have
+    replayed the change yet.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.cookie = (
+            f"{PRIMARY_PIN_COOKIE}=1; Max-Age={settings.primary_pin_seconds}; Path=/; HttpOnly; Secure; SameSite=Lax"
+        ).encode("latin-1")
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in WRITE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                headers = list(message.get("headers", []))
+                headers.append((b"set-cookie", self.cookie))
+                message["headers"] = headers
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
@@ -1,5 +1,24 @@
 from .hardware import Hardware, StatusEnum, ModelEnum
-from .audit_log import AuditLog
+from .access_log import AccessLog
+from .entity_change import EntityChange
 from .user import User
+from .revoked_session import RevokedSession
+from .request_rollup import RequestRollup
+from .hardware_snapshot import HardwareSnapshot, HardwareSnapshotItem
+from .slow_query import SlowQuery
+from .job import Job
 
-__all__ = ["Hardware", "StatusEnum", "ModelEnum", "AuditLog", "User"]
+__all__ = [
+    "Hardware",
+    "StatusEnum",
+    "ModelEnum",
+    "AccessLog",
+    "EntityChange",
+    "User",
+    "RevokedSession",
+    "RequestRollup",
+    "HardwareSnapshot",
+    "HardwareSnapshotItem",
+    "SlowQuery",
+    "Job",
+]
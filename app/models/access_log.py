@@ -1,35 +1,43 @@
 from datetime import datetime, timezone
-from typing import Any, Dict, Optional
-from sqlmodel import Field, SQLModel, text, Column, DateTime, Text, JSON
+from typing import Optional
+from sqlmodel import Field, SQLModel, text, Column, DateTime, Text, BigInteger, Integer, Index
 
 
-class AuditLog(SQLModel, table=True):
-    __tablename__ = "audit_logs"
+class AccessLog(SQLModel, table=True):
+    """One row per HTTP request. Append-only and high volume.
 
-    id: Optional[int] = Field(default=None, primary_key=True, index=True)
+    On PostgreSQL the table is range-partitioned by month on "timestamp" (see
+    app/audit/partitions.py), with a BRIN index on the timestamp.
+    """
+
+    __tablename__ = "access_logs"
+    # every explorer filter pages on ("timestamp", id)
+    __table_args__ = (
+        Index("ix_access_logs_timestamp_id", "timestamp", "id"),
+        Index("ix_access_logs_username_timestamp", "username", "timestamp", "id"),
+        Index("ix_access_logs_status_code_timestamp", "status_code", "timestamp", "id"),
+        Index("ix_access_logs_path_timestamp", "path", "timestamp", postgresql_ops={"path": "varchar_pattern_ops"}),
+    )
+
+    id: Optional[int] = Field(
+        default=None, sa_column=Column("id", BigInteger().with_variant(Integer, "sqlite"), primary_key=True)
+    )
+    timestamp: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc),
+        sa_column=Column("timestamp", DateTime(timezone=True), server_default=text("CURRENT_TIMESTAMP"), nullable=False),
+    )
 
     method: str = Field(max_length=10)
     path: str = Field(max_length=500)
     query_params: Optional[str] = Field(default=None, sa_column=Column("query_params", Text))
-    user_agent: Optional[str] = Field(default=None, max_length=500)
-    remote_addr: Optional[str] = Field(default=None, max_length=45)
-
     status_code: int
     response_time_ms: Optional[float] = Field(default=None)
 
     user_id: Optional[str] = Field(default=None, max_length=255)
     username: Optional[str] = Field(default=None, max_length=255)
-
-    timestamp: datetime = Field(
-        default_factory=lambda: datetime.now(timezone.utc),
-        sa_column=Column("timestamp", DateTime(timezone=True), server_default=text("CURRENT_TIMESTAMP"), index=True),
-    )
+    remote_addr: Optional[str] = Field(default=None, max_length=45)
+    user_agent: Optional[str] = Field(default=None, max_length=500)
 
     error_message: Optional[str] = Field(default=None, sa_column=Column("error_message", Text))
     request_body_size: Optional[int] = Field(default=None)
     response_body_size: Optional[int] = Field(default=None)
-
-    action: Optional[str] = Field(default=None, max_length=50, index=True)
-    entity_name: Optional[str] = Field(default=None, max_length=255, index=True)
-    entity_id: Optional[str] = Field(default=None, max_length=255, index=True)
-    changes: Optional[Dict[str, Any]] = Field(default=None, sa_column=Column(JSON))
@@ -0,0 +1,36 @@
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlmodel import Field, SQLModel, text, Column, DateTime, JSON, Index
+
+
+class EntityChange(SQLModel, table=True):
+    """CREATE/UPDATE/DELETE history of audited entities, with the request that caused it."""
+
+    __tablename__ = "entity_changes"
+    __table_args__ = (
+        Index("ix_entity_changes_entity_timestamp", "entity_name", "entity_id", "timestamp"),
+        Index("ix_entity_changes_timestamp_id", "timestamp", "id"),
+        Index("ix_entity_changes_username_timestamp", "username", "timestamp", "id"),
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    timestamp: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc),
+        sa_column=Column("timestamp", DateTime(timezone=True), server_default=text("CURRENT_TIMESTAMP"), nullable=False),
+    )
+
+    action: str = Field(max_length=50)
+    entity_name: str = Field(max_length=255)
+    entity_id: Optional[str] = Field(default=None, max_length=255)
+    # encoded by app.audit.codec, read it through decode_changes()
+    changes: Optional[Dict[str, Any]] = Field(
+        default=None, sa_column=Column(JSON().with_variant(JSONB(), "postgresql"))
+    )
+
+    user_id: Optional[str] = Field(default=None, max_length=255)
+    username: Optional[str] = Field(default=None, max_length=255)
+    method: Optional[str] = Field(default=None, max_length=10)
+    path: Optional[str] = Field(default=None, max_length=500)
+    remote_addr: Optional[str] = Field(default=None, max_length=45)
+    user_agent: Optional[str] = Field(default=None, max_length=500)
@@ -0,0 +1,29 @@
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+from sqlmodel import Field, SQLModel, text, Column, DateTime, JSON, ForeignKey, Integer
+
+
+class HardwareSnapshot(SQLModel, table=True):
+    """Full copy of the hardware table, the starting point for as-of replays."""
+
+    __tablename__ = "hardware_snapshots"
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    taken_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc),
+        sa_column=Column("taken_at", DateTime(timezone=True), server_default=text("CURRENT_TIMESTAMP"), nullable=False, index=True),
+    )
+    # every entity_changes row up to this id is reflected in the copied state,
+    # later ones are replayed (see app.audit.state)
+    last_change_id: int = Field(default=0)
+    item_count: int = Field(default=0)
+
+
+class HardwareSnapshotItem(SQLModel, table=True):
+    __tablename__ = "hardware_snapshot_items"
+
+    snapshot_id: int = Field(
+        sa_column=Column("snapshot_id", Integer, ForeignKey("hardware_snapshots.id", ondelete="CASCADE"), primary_key=True)
+    )
+    hardware_id: int = Field(primary_key=True)
+    state: Dict[str, Any] = Field(sa_column=Column(JSON, nullable=False))
@@ -0,0 +1,56 @@
+from datetime import datetime, timezone
+from typing import Any, Optional
+from sqlmodel import Field, SQLModel, text, Column, DateTime, Index, JSON, LargeBinary, String, Text
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+FINISHED_STATUSES = (SUCCEEDED, FAILED)
+
+
+class Job(SQLModel, table=True):
+    """A long-running import or export, processed by the workers of app.core.jobs."""
+
+    __tablename__ = "jobs"
+    __table_args__ = (Index("ix_jobs_status_id", "status", "id"),)
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    kind: str = Field(max_length=50)
+    status: str = Field(default=QUEUED, sa_column=Column("status", String(20), nullable=False))
+    username: Optional[str] = Field(default=None, max_length=255)
+    params: Optional[Any] = Field(default=None, sa_column=Column(JSON))
+    # audit context of the request that queued the job, applied to the changes it makes
+    context: Optional[Any] = Field(default=None, sa_column=Column(JSON))
+
+    progress_done: int = Field(default=0)
+    progress_total: Optional[int] = Field(default=None)
+    attempts: int = Field(default=0)
+
+    result: Optional[Any] = Field(default=None, sa_column=Column(JSON))
+    error: Optional[str] = Field(default=None, sa_column=Column("error", Text))
+    # generated file of export jobs, downloaded from /jobs/{id}/download
+    result_file: Optional[bytes] = Field(default=None, sa_column=Column("result_file", LargeBinary))
+    result_filename: Optional[str] = Field(default=None, max_length=255)
+    result_media_type: Optional[str] = Field(default=None, max_length=100)
+
+    created_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc),
+        sa_column=Column("created_at", DateTime(timezone=True), server_default=text("CURRENT_TIMESTAMP"), nullable=False),
+    )
+    started_at: Optional[datetime] = Field(default=None, sa_column=Column("started_at", DateTime(timezone=True)))
+    # refreshed at every checkpoint; a running job that stops reporting is picked up again
+    heartbeat_at: Optional[datetime] = Field(default=None, sa_column=Column("heartbeat_at", DateTime(timezone=True)))
+    finished_at: Optional[datetime] = Field(default=None, sa_column=Column("finished_at", DateTime(timezone=True)))
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED_STATUSES
+
+    @property
+    def percent(self) -> int:
+        if self.status == SUCCEEDED:
+            return 100
+        if not self.progress_total:
+            return 0
+        return min(100, int(self.progress_done * 100 / self.progress_total))
@@ -0,0 +1,21 @@
+from datetime import datetime
+from typing import List, Optional
+from sqlmodel import Field, SQLModel, Column, DateTime, JSON
+
+
+class RequestRollup(SQLModel, table=True):
+    """Hourly request counters, maintained incrementally by the access logger."""
+
+    __tablename__ = "request_rollups"
+
+    bucket: datetime = Field(sa_column=Column("bucket", DateTime(timezone=True), primary_key=True))
+    path: str = Field(primary_key=True, max_length=500)
+    method: str = Field(primary_key=True, max_length=10)
+    status_code: int = Field(primary_key=True)
+
+    count: int = Field(default=0)
+    # requests also written to access_logs; count / logged_count re-weights sampled logs
+    logged_count: int = Field(default=0)
+    latency_sum_ms: float = Field(default=0.0)
+    latency_max_ms: Optional[float] = Field(default=None)
+    histogram: Optional[List[int]] = Field(default=None, sa_column=Column(JSON))
@@ -0,0 +1,16 @@
+from datetime import datetime, timezone
+from typing import Optional
+from sqlmodel import Field, SQLModel, text, Column, DateTime
+
+
+class RevokedSession(SQLModel, table=True):
+    __tablename__ = "revoked_sessions"
+
+    jti: str = Field(primary_key=True, max_length=64)
+    username: Optional[str] = Field(default=None, max_length=255)
+
+    expires_at: datetime = Field(sa_column=Column("expires_at", DateTime(timezone=True), nullable=False, index=True))
+    revoked_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc),
+        sa_column=Column("revoked_at", DateTime(timezone=True), server_default=text("CURRENT_TIMESTAMP")),
+    )
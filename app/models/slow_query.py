@@ -0,0 +1,26 @@
+from datetime import datetime, timezone
+from typing import Any, Optional
+from sqlmodel import Field, SQLModel, text, Column, DateTime, Text, JSON
+
+
+class SlowQuery(SQLModel, table=True):
+    """A statement that ran longer than the slow query threshold, with its plan."""
+
+    __tablename__ = "slow_queries"
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    timestamp: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc),
+        sa_column=Column("timestamp", DateTime(timezone=True), server_default=text("CURRENT_TIMESTAMP"), nullable=False),
+    )
+    duration_ms: float
+    statement: str = Field(sa_column=Column("statement", Text, nullable=False))
+    # bind parameters with sensitive values redacted
+    parameters: Optional[Any] = Field(default=None, sa_column=Column(JSON))
+
+    method: Optional[str] = Field(default=None, max_length=10)
+    path: Optional[str] = Field(default=None, max_length=500)
+    username: Optional[str] = Field(default=None, max_length=255)
+
+    plan: Optional[str] = Field(default=None, sa_column=Column("plan", Text))
+    plan_analyzed: bool = Field(default=False)
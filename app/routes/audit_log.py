@@ -1,10 +1,14 @@
 import logging
-from fastapi import APIRouter, Depends, Request
+from datetime import datetime, timezone
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy.orm import Session
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, StreamingResponse
 
+from app.audit.export import iter_export
+from app.core.config import settings
 from app.core.templates import templates
-from app.core.db import get_session
+from app.core.db import get_read_session
 from app.services.audit import AuditService
 from app.dependencies.auth import require_admin
 
@@ -12,9 +16,23 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/audit")
 
+EXPLORER_PAGE_SIZE = 50
+
+
+def _optional_int(value: Optional[str]) -> Optional[int]:
+    # filter forms submit empty inputs as ""
+    return int(value) if value and value.strip() else None
+
+
+def _optional_datetime(value: Optional[str]) -> Optional[datetime]:
+    if not value or not value.strip():
+        return None
+    parsed = datetime.fromisoformat(value)
+    return parsed.replace(tzinfo=timezone.utc) if parsed.tzinfo is None else parsed
+
 
 @router.get("/logs", response_class=HTMLResponse)
-async def audit_logs_view(request: Request, db: Session = Depends(get_session), current_user=Depends(require_admin)):
+async def audit_logs_view(request: Request, db: Session = Depends(get_read_session), current_user=Depends(require_admin)):
     try:
         audit_service = AuditService(db)
 
@@ -23,6 +41,7 @@ async def audit_logs_view(request: Request, db: Session = Depends(get_session),
             stats = {
                 "period_days": 30,
                 "total_requests": 0,
+                "logged_requests": 0,
                 "error_count": 0,
                 "error_rate": 0,
                 "avg_response_time_ms": 0,
@@ -34,8 +53,13 @@ async def audit_logs_view(request: Request, db: Session = Depends(get_session),
         if recent_errors is None:
             recent_errors = []
 
+        latency = audit_service.get_latency_percentiles(30, limit=15)
+        if latency is None:
+            latency = []
+
         return templates.TemplateResponse(
-            "admin_audit_logs.html", {"request": request, "stats": stats, "recent_errors": recent_errors}
+            "admin_audit_logs.html",
+            {"request": request, "stats": stats, "recent_errors": recent_errors, "latency": latency},
         )
 
     except Exception as e:
@@ -47,6 +71,7 @@ async def audit_logs_view(request: Request, db: Session = Depends(get_session),
                 "stats": {
                     "period_days": 30,
                     "total_requests": 0,
+                    "logged_requests": 0,
                     "error_count": 0,
                     "error_rate": 0,
                     "avg_response_time_ms": 0,
@@ -54,6 +79,167 @@ async def audit_logs_view(request: Request, db: Session = Depends(get_session),
                     "top_endpoints": [],
                 },
                 "recent_errors": [],
+                "latency": [],
                 "error_message": f"Error loading audit logs: {str(e)}",
             },
         )
+
+
+@router.get("/explorer", response_class=HTMLResponse)
+async def audit_explorer_view(
+    request: Request,
+    db: Session = Depends(get_read_session),
+    current_user=Depends(require_admin),
+    source: str = Query("access", pattern="^(access|changes)$"),
+    username: Optional[str] = Query(None),
+    path_prefix: Optional[str] = Query(None),
+    status_min: Optional[str] = Query(None),
+    status_max: Optional[str] = Query(None),
+    entity_name: Optional[str] = Query(None),
+    entity_id: Optional[str] = Query(None),
+    action: Optional[str] = Query(None),
+    start: Optional[str] = Query(None),
+    end: Optional[str] = Query(None),
+    cursor: Optional[str] = Query(None),
+):
+    filters = {
+        "source": source,
+        "username": username or "",
+        "path_prefix": path_prefix or "",
+        "status_min": status_min or "",
+        "status_max": status_max or "",
+        "entity_name": entity_name or "",
+        "entity_id": entity_id or "",
+        "action": action or "",
+        "start": start or "",
+        "end": end or "",
+    }
+    try:
+        audit_service = AuditService(db)
+        if source == "changes":
+            page = audit_service.search_entity_changes(
+                username=username,
+                path_prefix=path_prefix,
+                entity_name=entity_name,
+                entity_id=entity_id,
+                action=action,
+                start=_optional_datetime(start),
+                end=_optional_datetime(end),
+                cursor=cursor,
+                limit=EXPLORER_PAGE_SIZE,
+            )
+        else:
+            page = audit_service.search_access_logs(
+                username=username,
+                path_prefix=path_prefix,
+                status_min=_optional_int(status_min),
+                status_max=_optional_int(status_max),
+                start=_optional_datetime(start),
+                end=_optional_datetime(end),
+                cursor=cursor,
+                limit=EXPLORER_PAGE_SIZE,
+            )
+        error_message = None
+    except ValueError as e:
+        page = {"items": [], "next_cursor": None}
+        error_message = f"Invalid filter: {e}"
+    except Exception as e:
+        logger.error(f"Error searching audit logs: {e}")
+        page = {"items": [], "next_cursor": None}
+        error_message = "An error occurred while searching the audit logs."
+
+    template_data = {
+        "request": request,
+        "filters": filters,
+        "items": page["items"],
+        "next_cursor": page["next_cursor"],
+        "error_message": error_message,
+    }
+
+    if request.headers.get("HX-Request") == "true":
+        # "load more" appends rows, a filter change replaces the whole table
+        template = "partials/audit_explorer_rows.html" if cursor else "partials/audit_explorer_results.html"
+        return templates.TemplateResponse(template, template_data)
+
+    return templates.TemplateResponse("audit_explorer.html", template_data)
+
+
+@router.get("/slow-queries", response_class=HTMLResponse)
+async def slow_queries_view(
+    request: Request,
+    db: Session = Depends(get_read_session),
+    current_user=Depends(require_admin),
+    path: Optional[str] = Query(None),
+):
+    slow_queries = AuditService(db).get_slow_queries(100, path=path or None)
+    template_data = {
+        "request": request,
+        "slow_queries": slow_queries or [],
+        "path": path or "",
+        "threshold_ms": settings.slow_query_threshold_ms,
+    }
+    if slow_queries is None:
+        template_data["error_message"] = "Error loading slow queries"
+
+    return templates.TemplateResponse("admin_slow_queries.html", template_data)
+
+
+@router.get("/latency.json")
+async def audit_latency_json(
+    db: Session = Depends(get_read_session),
+    current_user=Depends(require_admin),
+    days: int = Query(30, ge=1, le=365),
+):
+    audit_service = AuditService(db)
+    latency = audit_service.get_latency_percentiles(days)
+    if latency is None:
+        raise HTTPException(status_code=500, detail="Failed to load latency percentiles")
+
+    return {"period_days": days, "endpoints": latency}
+
+
+@router.get("/export")
+async def audit_export(
+    current_user=Depends(require_admin),
+    kind: str = Query("changes", pattern="^(changes|access)$"),
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    gzip: bool = Query(False),
+    since_id: Optional[int] = Query(None, ge=0),
+    start: Optional[datetime] = Query(None),
+    end: Optional[datetime] = Query(None),
+    username: Optional[str] = Query(None),
+    action: Optional[str] = Query(None),
+    entity_name: Optional[str] = Query(None),
+    entity_id: Optional[str] = Query(None),
+):
+    """Stream access logs or entity changes in id order.
+
+    For incremental pulls pass the largest id received so far as since_id.
+    Rows from the last AUDIT_EXPORT_SETTLE_SECONDS are left for the next
+    pull, see app.audit.export.
+    """
+    content = iter_export(
+        kind,
+        format,
+        compress=gzip,
+        since_id=since_id,
+        start=start,
+        end=end,
+        username=username,
+        action=action,
+        entity_name=entity_name,
+        entity_id=entity_id,
+    )
+
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    filename = f"audit_{kind}_{timestamp}.{format}"
+    media_type = "application/x-ndjson" if format == "ndjson" else "text/csv"
+    if gzip:
+        filename += ".gz"
+        media_type = "application/gzip"
+
+    return StreamingResponse(
+        content,
+        media_type=media_type,
+        headers={"Content-Disposition": f"attachment; filename={filename}"},
+    )
@@ -121,7 +121,12 @@ async def logout(request: Request, db: Session = Depends(get_session), current_u
         user_service = UserService(db)
         db_user = user_service.get_user_by_username(current_user["username"])
         if db_user:
-            user_service.invalidate_session(db_user)
+            payload = AuthService().verify_session_token(request.cookies.get(settings.session_cookie_name, ""))
+            user_service.invalidate_session(
+                db_user,
+                jti=payload.get("jti") if payload else None,
+                expires_at=payload.get("exp") if payload else None,
+            )
     except Exception as e:
         logger.error(f"Error during logout: {e}")
     
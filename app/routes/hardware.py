@@ -19,12 +19,15 @@ from fastapi.responses import HTMLResponse, RedirectResponse, Response
 from sqlalchemy.orm import Session
 
 from app.core import db
-from app.core.db import get_session
+from app.core.config import settings
+from app.core.db import get_read_session, get_session, release_session
+from app.core.jobs import job_queue
 from app.core.templates import templates
 from app.dependencies.auth import require_admin, require_visitor, get_current_user
 from app.models.hardware import StatusEnum, ModelEnum
-from app.services.hardware import HardwareService
+from app.services.hardware import HardwareService, build_hardware_excel, build_qr_code
 from app.services.audit import AuditService
+from app.services.jobs import HARDWARE_EXPORT, HARDWARE_IMPORT
 
 
 logger = logging.getLogger(__name__)
@@ -137,13 +140,14 @@ def _render_hardware_table(
         "current_user": current_user,
     }
 
+    release_session(hardware_service.db)
     return templates.TemplateResponse("partials/hardware_table.html", template_data)
 
 
 @router.get("", response_class=HTMLResponse)
 async def hardware_list(
     request: Request,
-    db: Session = Depends(get_session),
+    db: Session = Depends(get_read_session),
     current_user=Depends(require_visitor),
     search: Optional[str] = Query(None),
     status: Optional[list[str]] = Query(None),
@@ -184,6 +188,7 @@ async def hardware_list(
             "sort_order": sort_order,
             "current_user": current_user,
         }
+        release_session(db)
 
         is_htmx = request.headers.get("HX-Request") == "true"
         if is_htmx:
@@ -334,6 +339,20 @@ async def bulk_import_confirm(
             status_code=400,
         )
 
+    if settings.jobs_enabled:
+        # runs in the background in chunks, the results page polls its progress
+        job_id = job_queue.enqueue(
+            HARDWARE_IMPORT,
+            {
+                "items": [item.get("data", {}) for item in valid_items],
+                "total_rows": data.get("total_rows", 0),
+                "errors": data.get("errors", []),
+            },
+            username=current_user["username"],
+            total=len(valid_items),
+        )
+        return RedirectResponse(url=f"/jobs/{job_id}", status_code=303)
+
     hardware_service = HardwareService(db)
 
     apply_summary = hardware_service.apply_import_data(
@@ -467,14 +486,15 @@ async def delete_hardware(
 async def hardware_detail(
     request: Request,
     hardware_id: int,
-    db: Session = Depends(get_session),
+    db: Session = Depends(get_read_session),
     current_user=Depends(get_current_user),
 ):
     try:
         hardware_service = HardwareService(db)
-        hardware = hardware_service.get_hardware_by_id(hardware_id)
+        hardware = hardware_service.get_hardware_view(hardware_id)
         if not hardware:
             raise HTTPException(status_code=404, detail="Hardware not found")
+        release_session(db)
 
         return templates.TemplateResponse(
             "hardware_detail.html",
@@ -487,7 +507,7 @@ async def hardware_detail(
 
 @router.get("/export/excel")
 async def export_hardware_excel(
-    db: Session = Depends(get_session),
+    db: Session = Depends(get_read_session),
     current_user=Depends(get_current_user),
     search: Optional[str] = Query(None),
     status: Optional[list[str]] = Query(None),
@@ -498,10 +518,19 @@ async def export_hardware_excel(
     try:
         hardware_service = HardwareService(db)
 
+        filters = {"search": search, "status": status, "model": model, "center": center}
+        if settings.jobs_enabled:
+            query, _ = hardware_service.get_filtered_hardware_query(**filters)
+            if query.count() > settings.job_export_sync_max_rows:
+                username = current_user["username"] if current_user else None
+                job_id = job_queue.enqueue(HARDWARE_EXPORT, filters, username=username)
+                return RedirectResponse(url=f"/jobs/{job_id}", status_code=303)
+
+        rows = hardware_service.get_export_rows(**filters)
+        release_session(db)
+
         # Export data to Excel
-        output = hardware_service.export_hardware_to_excel(
-            search=search, status=status, model=model, center=center
-        )
+        output = build_hardware_excel(rows)
 
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         filename = f"hardware_inventory_{timestamp}.xlsx"
@@ -520,13 +549,18 @@ async def export_hardware_excel(
 @router.get("/{hardware_id}/qr")
 async def generate_qr_code(
     hardware_id: int,
-    db: Session = Depends(get_session),
+    db: Session = Depends(get_read_session),
     current_user=Depends(require_visitor),
 ):
     """Generate QR code for hardware detail page"""
     try:
         hardware_service = HardwareService(db)
-        img_buffer, filename = hardware_service.generate_qr_code(hardware_id)
+        hardware = hardware_service.get_hardware_view(hardware_id)
+        if not hardware:
+            raise ValueError("Hardware not found")
+        release_session(db)
+
+        img_buffer, filename = build_qr_code(hardware)
 
         return Response(
             content=img_buffer.getvalue(),
@@ -545,7 +579,7 @@ async def generate_qr_code(
 @router.get("/{hardware_id}/label")
 async def generate_label_csv(
     hardware_id: int,
-    db: Session = Depends(get_session),
+    db: Session = Depends(get_read_session),
     current_user=Depends(require_visitor),
 ):
     try:
@@ -634,7 +668,7 @@ async def cycle_status(
 async def hardware_history_view(
     hardware_id: int,
     request: Request,
-    db: Session = Depends(get_session),
+    db: Session = Depends(get_read_session),
     current_user=Depends(require_admin),
     page: int = Query(1, ge=1),
 ):
@@ -642,7 +676,7 @@ async def hardware_history_view(
         audit_service = AuditService(db)
         hardware_service = HardwareService(db)
 
-        hardware_item = hardware_service.get_hardware_by_id(hardware_id)
+        hardware_item = hardware_service.get_hardware_view(hardware_id)
         if not hardware_item:
             return templates.TemplateResponse(
                 "404.html", {"request": request}, status_code=404
@@ -660,6 +694,7 @@ async def hardware_history_view(
             history_data = {"logs": [], "total": 0}
 
         total_pages = math.ceil(history_data["total"] / PAGE_SIZE)
+        release_session(db)
 
         return templates.TemplateResponse(
             "hardware_history.html",
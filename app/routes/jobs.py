@@ -0,0 +1,70 @@
+import logging
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import HTMLResponse, Response
+from sqlalchemy.orm import Session
+
+from app.core.db import get_session
+from app.core.templates import templates
+from app.dependencies.auth import require_visitor
+from app.models.job import SUCCEEDED
+from app.services.jobs import HARDWARE_IMPORT, JobService
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/jobs")
+
+
+def _get_job_or_404(db: Session, job_id: int, current_user, with_file: bool = False):
+    job = JobService(db).get_job(job_id, current_user, with_file=with_file)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@router.get("/{job_id}", response_class=HTMLResponse)
+async def job_view(
+    request: Request,
+    job_id: int,
+    db: Session = Depends(get_session),
+    current_user=Depends(require_visitor),
+):
+    # get_session, not get_read_session: a replica may lag behind the job worker
+    job = _get_job_or_404(db, job_id, current_user)
+
+    if job.kind == HARDWARE_IMPORT:
+        return templates.TemplateResponse(
+            "bulk_import_results.html", {"request": request, "job": job, "results": job.result if job.status == SUCCEEDED else None}
+        )
+    return templates.TemplateResponse("job_status.html", {"request": request, "job": job})
+
+
+@router.get("/{job_id}/progress", response_class=HTMLResponse)
+async def job_progress(
+    request: Request,
+    job_id: int,
+    db: Session = Depends(get_session),
+    current_user=Depends(require_visitor),
+):
+    """Polled by partials/job_progress.html; once the job is done the page reloads to show the outcome."""
+    job = _get_job_or_404(db, job_id, current_user)
+    if job.finished:
+        return Response(status_code=200, headers={"HX-Refresh": "true"})
+    return templates.TemplateResponse("partials/job_progress.html", {"request": request, "job": job})
+
+
+@router.get("/{job_id}/download")
+async def job_download(
+    job_id: int,
+    db: Session = Depends(get_session),
+    current_user=Depends(require_visitor),
+):
+    job = _get_job_or_404(db, job_id, current_user, with_file=True)
+    if job.result_file is None:
+        raise HTTPException(status_code=404, detail="The job has no file to download")
+
+    return Response(
+        content=job.result_file,
+        media_type=job.result_media_type or "application/octet-stream",
+        headers={"Content-Disposition": f"attachment; filename={job.result_filename}"},
+    )
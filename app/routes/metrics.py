@@ -0,0 +1,22 @@
+import hmac
+
+from fastapi import APIRouter, HTTPException, Request, Response
+
+from app.core.config import settings
+from app.core.metrics import render_metrics
+from app.services.metrics import refresh_runtime_metrics
+
+router = APIRouter()
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics_view(request: Request):
+    # scrapers have no session cookie, access is by bearer token instead;
+    # create_app only mounts this route when METRICS_TOKEN is set
+    supplied = request.headers.get("authorization", "").removeprefix("Bearer ").strip()
+    if not settings.metrics_token or not hmac.compare_digest(supplied, settings.metrics_token):
+        raise HTTPException(status_code=401, detail="Invalid metrics token")
+
+    refresh_runtime_metrics()
+    content, content_type = render_metrics()
+    return Response(content=content, media_type=content_type)
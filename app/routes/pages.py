@@ -5,17 +5,18 @@ from fastapi import APIRouter, Request, Depends
 from fastapi.responses import HTMLResponse
 from sqlalchemy.orm import Session
 
-from app.core.db import get_session
+from app.core.db import get_read_session, release_session
 from app.core.templates import templates
 from app.models.hardware import Hardware, StatusEnum
 from app.services.stock import StockService
+from app.services.views import HardwareListItem
 from app.dependencies.auth import require_visitor
 
 router = APIRouter()
 
 
 @router.get("/", response_class=HTMLResponse)
-async def dashboard(request: Request, db: Session = Depends(get_session), current_user = Depends(require_visitor)):
+async def dashboard(request: Request, db: Session = Depends(get_read_session), current_user = Depends(require_visitor)):
     status_counts: Dict[str, int] = {}
     for status in StatusEnum:
         count = db.query(Hardware).filter(Hardware.status == status).count()
@@ -23,19 +24,26 @@ async def dashboard(request: Request, db: Session = Depends(get_session), curren
 
     total_count = db.query(Hardware).count()
 
-    recent_hardware = db.query(Hardware).order_by(Hardware.updated_at.desc()).limit(10).all()
+    recent_hardware = [
+        HardwareListItem.from_row(row)
+        for row in db.query(*HardwareListItem.columns()).order_by(Hardware.updated_at.desc()).limit(10).all()
+    ]
 
     current_page = 1
     per_page = 20
     offset = (current_page - 1) * per_page
 
     default_statuses = [s for s in StatusEnum if s != StatusEnum.COMPLETED]
-    hardware_list = db.query(Hardware).filter(Hardware.status.in_(default_statuses)).order_by(Hardware.updated_at.desc()).offset(offset).limit(per_page).all()
+    hardware_list = [
+        HardwareListItem.from_row(row)
+        for row in db.query(*HardwareListItem.columns()).filter(Hardware.status.in_(default_statuses)).order_by(Hardware.updated_at.desc()).offset(offset).limit(per_page).all()
+    ]
     filtered_count = db.query(Hardware).filter(Hardware.status.in_(default_statuses)).count()
     total_pages = (filtered_count + per_page - 1) // per_page
 
     stock_service = StockService(db)
     stock_summary = stock_service.get_stock_summary()
+    release_session(db)
 
     return templates.TemplateResponse(
         "index.html",
@@ -1,12 +1,33 @@
 from datetime import datetime, timezone, timedelta
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from app.models.audit_log import AuditLog
+from sqlalchemy import func, tuple_
+from app.models.access_log import AccessLog
+from app.models.entity_change import EntityChange
+from app.models.request_rollup import RequestRollup
+from app.models.slow_query import SlowQuery
+from app.audit import histogram
+from app.audit.codec import decode_changes
+from app.audit.rollups import hour_bucket
+from app.audit.state import stock_counts_as_of
 import logging
 
 logger = logging.getLogger(__name__)
 
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def encode_cursor(timestamp: datetime, row_id: int) -> str:
+    """Opaque keyset position "<microseconds since epoch>-<id>", safe in a URL."""
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=timezone.utc)
+    return f"{(timestamp - EPOCH) // timedelta(microseconds=1)}-{row_id}"
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    micros, row_id = cursor.split("-", 1)
+    return EPOCH + timedelta(microseconds=int(micros)), int(row_id)
+
 
 class AuditService:
     def __init__(self, db: Session):
@@ -14,23 +35,22 @@ class AuditService:
 
     def get_entity_history(self, entity_name: str, entity_id: str, page: int = 1, limit: int = 100) -> List[Dict]:
         try:
-            base_query = self.db.query(AuditLog).filter(
-                AuditLog.entity_name == entity_name,
-                AuditLog.entity_id == str(entity_id),
-                AuditLog.action.in_(["CREATE", "UPDATE", "DELETE"]),
+            base_query = self.db.query(EntityChange).filter(
+                EntityChange.entity_name == entity_name,
+                EntityChange.entity_id == str(entity_id),
             )
 
             total_count = base_query.count()
 
             offset = (page - 1) * limit
-            history_logs = base_query.order_by(AuditLog.timestamp.desc()).offset(offset).limit(limit).all()
+            history_logs = base_query.order_by(EntityChange.timestamp.desc()).offset(offset).limit(limit).all()
 
             results = [
                 {
                     "timestamp": log.timestamp.isoformat(),
                     "username": log.username,
                     "action": log.action,
-                    "changes": log.changes,
+                    "changes": decode_changes(log.action, log.changes),
                     "path": log.path,
                 }
                 for log in history_logs
@@ -42,59 +62,126 @@ class AuditService:
             return None
 
     def get_log_statistics(self, days: int = 30) -> Dict:
+        # Reads only the hourly rollups: one grouped scan over
+        # buckets x endpoints x status codes instead of the raw access logs.
         try:
             cutoff_date = datetime.now(timezone.utc) - timedelta(days=days)
 
-            base_query = self.db.query(AuditLog).filter(AuditLog.timestamp >= cutoff_date, AuditLog.action.is_(None))
-
-            total_requests = base_query.count()
-
-            status_stats = (
-                self.db.query(AuditLog.status_code, func.count(AuditLog.id).label("count"))
-                .filter(AuditLog.timestamp >= cutoff_date, AuditLog.action.is_(None))
-                .group_by(AuditLog.status_code)
+            rows = (
+                self.db.query(
+                    RequestRollup.path,
+                    RequestRollup.status_code,
+                    func.sum(RequestRollup.count).label("count"),
+                    func.sum(RequestRollup.logged_count).label("logged_count"),
+                    func.sum(RequestRollup.latency_sum_ms).label("latency_sum_ms"),
+                )
+                .filter(RequestRollup.bucket >= hour_bucket(cutoff_date))
+                .group_by(RequestRollup.path, RequestRollup.status_code)
                 .all()
             )
 
-            endpoint_stats = (
-                self.db.query(AuditLog.path, func.count(AuditLog.id).label("count"))
-                .filter(AuditLog.timestamp >= cutoff_date, AuditLog.action.is_(None))
-                .group_by(AuditLog.path)
-                .order_by(func.count(AuditLog.id).desc())
-                .limit(10)
-                .all()
-            )
+            total_requests = 0
+            logged_requests = 0
+            error_count = 0
+            latency_sum_ms = 0.0
+            status_codes: Dict[str, int] = {}
+            endpoint_counts: Dict[str, int] = {}
 
-            error_count = base_query.filter(AuditLog.status_code >= 400).count()
+            for path, status_code, count, logged_count, path_latency_sum_ms in rows:
+                total_requests += count
+                logged_requests += logged_count or 0
+                latency_sum_ms += path_latency_sum_ms or 0.0
+                if status_code >= 400:
+                    error_count += count
+                status_codes[str(status_code)] = status_codes.get(str(status_code), 0) + count
+                endpoint_counts[path] = endpoint_counts.get(path, 0) + count
 
-            avg_response_time = (
-                self.db.query(func.avg(AuditLog.response_time_ms))
-                .filter(
-                    AuditLog.timestamp >= cutoff_date, AuditLog.response_time_ms.isnot(None), AuditLog.action.is_(None)
-                )
-                .scalar()
-            )
+            top_endpoints = sorted(endpoint_counts.items(), key=lambda item: item[1], reverse=True)[:10]
 
             return {
                 "period_days": days,
                 "total_requests": total_requests,
+                # access_logs holds only a sample of reads, multiply raw counts by total / logged
+                "logged_requests": logged_requests,
                 "error_count": error_count,
                 "error_rate": (error_count / total_requests * 100) if total_requests > 0 else 0,
-                "avg_response_time_ms": round(avg_response_time, 2) if avg_response_time else 0,
-                "status_codes": {str(status): count for status, count in status_stats},
-                "top_endpoints": [{"path": path, "count": count} for path, count in endpoint_stats],
+                "avg_response_time_ms": round(latency_sum_ms / total_requests, 2) if total_requests > 0 else 0,
+                "status_codes": dict(sorted(status_codes.items())),
+                "top_endpoints": [{"path": path, "count": count} for path, count in top_endpoints],
             }
 
         except Exception as e:
             logger.error(f"Error getting log statistics: {e}")
             return None
 
-    def get_recent_errors(self, limit: int = 50) -> List[Dict]:
+    def get_latency_percentiles(self, days: int = 30, limit: Optional[int] = None) -> List[Dict]:
+        """p50/p95/p99 per endpoint and status class, merged from the rollup histograms."""
+        try:
+            cutoff_date = datetime.now(timezone.utc) - timedelta(days=days)
+
+            rows = (
+                self.db.query(
+                    RequestRollup.path,
+                    RequestRollup.method,
+                    RequestRollup.status_code,
+                    RequestRollup.count,
+                    RequestRollup.latency_sum_ms,
+                    RequestRollup.latency_max_ms,
+                    RequestRollup.histogram,
+                )
+                .filter(RequestRollup.bucket >= hour_bucket(cutoff_date))
+                .all()
+            )
+
+            merged: Dict[tuple, Dict] = {}
+            for path, method, status_code, count, latency_sum_ms, latency_max_ms, row_histogram in rows:
+                key = (method, path, f"{status_code // 100}xx")
+                entry = merged.get(key)
+                if entry is None:
+                    entry = merged[key] = {
+                        "count": 0,
+                        "latency_sum_ms": 0.0,
+                        "latency_max_ms": 0.0,
+                        "histogram": histogram.empty_histogram(),
+                    }
+                entry["count"] += count
+                entry["latency_sum_ms"] += latency_sum_ms or 0.0
+                entry["latency_max_ms"] = max(entry["latency_max_ms"], latency_max_ms or 0.0)
+                histogram.merge(entry["histogram"], row_histogram)
+
+            def rounded(value: Optional[float], max_ms: float) -> Optional[float]:
+                # interpolation can overshoot the largest value actually seen
+                return round(min(value, max_ms), 2) if value is not None else None
+
+            results = []
+            for (method, path, status_class), entry in merged.items():
+                results.append({
+                    "method": method,
+                    "path": path,
+                    "status_class": status_class,
+                    "count": entry["count"],
+                    "avg_ms": round(entry["latency_sum_ms"] / entry["count"], 2) if entry["count"] else None,
+                    "p50_ms": rounded(histogram.percentile(entry["histogram"], 0.50), entry["latency_max_ms"]),
+                    "p95_ms": rounded(histogram.percentile(entry["histogram"], 0.95), entry["latency_max_ms"]),
+                    "p99_ms": rounded(histogram.percentile(entry["histogram"], 0.99), entry["latency_max_ms"]),
+                    "max_ms": round(entry["latency_max_ms"], 2),
+                })
+
+            results.sort(key=lambda item: item["count"], reverse=True)
+            return results[:limit] if limit else results
+
+        except Exception as e:
+            logger.error(f"Error getting latency percentiles: {e}")
+            return None
+
+    def get_recent_errors(self, limit: int = 50, days: int = 30) -> List[Dict]:
         try:
+            # bounded window so only recent partitions are scanned
+            cutoff_date = datetime.now(timezone.utc) - timedelta(days=days)
             recent_errors = (
-                self.db.query(AuditLog)
-                .filter(AuditLog.status_code >= 400, AuditLog.action.is_(None))
-                .order_by(AuditLog.timestamp.desc())
+                self.db.query(AccessLog)
+                .filter(AccessLog.timestamp >= cutoff_date, AccessLog.status_code >= 400)
+                .order_by(AccessLog.timestamp.desc())
                 .limit(limit)
                 .all()
             )
@@ -120,12 +207,12 @@ class AuditService:
     def get_user_activity(self, username: Optional[str] = None, days: int = 7) -> List[Dict]:
         try:
             cutoff_date = datetime.now(timezone.utc) - timedelta(days=days)
-            query = self.db.query(AuditLog).filter(AuditLog.timestamp >= cutoff_date, AuditLog.action.is_(None))
+            query = self.db.query(AccessLog).filter(AccessLog.timestamp >= cutoff_date)
 
             if username:
-                query = query.filter(AuditLog.username == username)
+                query = query.filter(AccessLog.username == username)
 
-            activity_logs = query.order_by(AuditLog.timestamp.desc()).limit(100).all()
+            activity_logs = query.order_by(AccessLog.timestamp.desc()).limit(100).all()
 
             return [
                 {
@@ -142,3 +229,133 @@ class AuditService:
         except Exception as e:
             logger.error(f"Error getting user activity: {e}")
             return None
+
+    def get_slow_queries(self, limit: int = 100, path: Optional[str] = None) -> List[Dict]:
+        try:
+            query = self.db.query(SlowQuery)
+            if path:
+                query = query.filter(SlowQuery.path == path)
+            slow_queries = query.order_by(SlowQuery.id.desc()).limit(limit).all()
+
+            return [
+                {
+                    "id": entry.id,
+                    "timestamp": entry.timestamp.isoformat(),
+                    "duration_ms": entry.duration_ms,
+                    "statement": entry.statement,
+                    "parameters": entry.parameters,
+                    "method": entry.method,
+                    "path": entry.path,
+                    "username": entry.username,
+                    "plan": entry.plan,
+                    "plan_analyzed": entry.plan_analyzed,
+                }
+                for entry in slow_queries
+            ]
+        except Exception as e:
+            logger.error(f"Error getting slow queries: {e}")
+            return None
+
+    def get_stock_counts_as_of(self, as_of: datetime) -> Optional[Dict]:
+        try:
+            return stock_counts_as_of(self.db, as_of)
+        except Exception as e:
+            logger.error(f"Error reconstructing stock counts as of {as_of}: {e}")
+            return None
+
+    def search_access_logs(
+        self,
+        username: Optional[str] = None,
+        path_prefix: Optional[str] = None,
+        status_min: Optional[int] = None,
+        status_max: Optional[int] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        cursor: Optional[str] = None,
+        limit: int = 50,
+    ) -> Dict:
+        """Newest first, paged by keyset on (timestamp, id) so deep pages cost the same as the first."""
+        query = self.db.query(AccessLog)
+        if username:
+            query = query.filter(AccessLog.username == username)
+        if path_prefix:
+            query = query.filter(AccessLog.path.startswith(path_prefix, autoescape=True))
+        if status_min is not None:
+            query = query.filter(AccessLog.status_code >= status_min)
+        if status_max is not None:
+            query = query.filter(AccessLog.status_code <= status_max)
+
+        rows, next_cursor = self._keyset_page(query, AccessLog, start, end, cursor, limit)
+        items = [
+            {
+                "id": log.id,
+                "timestamp": log.timestamp.isoformat(),
+                "username": log.username,
+                "method": log.method,
+                "path": log.path,
+                "query_params": log.query_params,
+                "status_code": log.status_code,
+                "remote_addr": log.remote_addr,
+                "response_time_ms": log.response_time_ms,
+                "error_message": log.error_message,
+            }
+            for log in rows
+        ]
+        return {"items": items, "next_cursor": next_cursor}
+
+    def search_entity_changes(
+        self,
+        username: Optional[str] = None,
+        path_prefix: Optional[str] = None,
+        entity_name: Optional[str] = None,
+        entity_id: Optional[str] = None,
+        action: Optional[str] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        cursor: Optional[str] = None,
+        limit: int = 50,
+    ) -> Dict:
+        query = self.db.query(EntityChange)
+        if username:
+            query = query.filter(EntityChange.username == username)
+        if path_prefix:
+            query = query.filter(EntityChange.path.startswith(path_prefix, autoescape=True))
+        if entity_name:
+            query = query.filter(EntityChange.entity_name == entity_name)
+        if entity_id:
+            query = query.filter(EntityChange.entity_id == entity_id)
+        if action:
+            query = query.filter(EntityChange.action == action.upper())
+
+        rows, next_cursor = self._keyset_page(query, EntityChange, start, end, cursor, limit)
+        items = [
+            {
+                "id": change.id,
+                "timestamp": change.timestamp.isoformat(),
+                "username": change.username,
+                "action": change.action,
+                "entity_name": change.entity_name,
+                "entity_id": change.entity_id,
+                "changes": decode_changes(change.action, change.changes),
+                "method": change.method,
+                "path": change.path,
+            }
+            for change in rows
+        ]
+        return {"items": items, "next_cursor": next_cursor}
+
+    def _keyset_page(self, query, model, start, end, cursor, limit):
+        if start is not None:
+            query = query.filter(model.timestamp >= start)
+        if end is not None:
+            query = query.filter(model.timestamp < end)
+        if cursor:
+            query = query.filter(tuple_(model.timestamp, model.id) < decode_cursor(cursor))
+
+        # one extra row tells whether there is a next page
+        rows = query.order_by(model.timestamp.desc(), model.id.desc()).limit(limit + 1).all()
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1].timestamp, rows[-1].id)
+        return rows, next_cursor
@@ -4,6 +4,7 @@ from jose import JWTError, jwt
 import ldap
 import uuid
 from app.core.config import settings
+from app.core.revocation import revocation_index
 import logging
 
 logger = logging.getLogger(__name__)
@@ -119,6 +120,7 @@ class AuthService:
             "username": user_data.get("username"),
             "role": user_data.get("role"),
             "user_id": user_data.get("user_id"),
+            "jti": uuid.uuid4().hex,
             "exp": (datetime.now(timezone.utc) + timedelta(hours=settings.session_expire_hours)).timestamp()
         }
 
@@ -131,6 +133,9 @@ class AuthService:
 
             if datetime.now(timezone.utc).timestamp() > payload.get('exp', 0):
                 return None
+
+            if revocation_index.is_revoked(payload.get('jti')):
+                return None
             
             return payload
             
@@ -3,17 +3,24 @@ import io
 import logging
 from datetime import datetime, timezone
 from typing import Optional, List, Dict, Any, Tuple
-import pandas as pd
-import qrcode
-from openpyxl.utils import get_column_letter
-from openpyxl.worksheet.table import Table, TableStyleInfo
 from sqlalchemy.orm import Session
 
 from app.models.hardware import Hardware, StatusEnum, ModelEnum
+from app.audit.state import hardware_state_as_of
 from app.core.config import settings
+from app.services.views import HardwareListItem, HardwareView
 
 logger = logging.getLogger(__name__)
 
+# pandas, openpyxl and qrcode are imported in the functions that use them: loading
+# them at startup costs every worker import time and resident memory, while only
+# imports, exports and QR codes need them.
+
+
+def _is_missing(value: Any) -> bool:
+    # empty Excel cells come back from pandas as NaN or NaT, which are not equal to themselves
+    return value is None or value != value
+
 
 class HardwareService:
     def __init__(self, db: Session):
@@ -21,7 +28,15 @@ class HardwareService:
     
     def get_hardware_by_id(self, hardware_id: int) -> Optional[Hardware]:
         return self.db.query(Hardware).filter(Hardware.id == hardware_id).first()
+
+    def get_hardware_view(self, hardware_id: int) -> Optional[HardwareView]:
+        row = self.db.query(*HardwareView.columns()).filter(Hardware.id == hardware_id).first()
+        return HardwareView.from_row(row) if row else None
     
+    def get_hardware_as_of(self, hardware_id: int, as_of: datetime) -> Optional[Dict[str, Any]]:
+        """Field values of a device at a past point in time, None if it did not exist then."""
+        return hardware_state_as_of(self.db, hardware_id, as_of)
+
     def get_hardware_by_serial(self, serial_number: str) -> Optional[Hardware]:
         if not serial_number:
             return None
@@ -103,7 +118,7 @@ class HardwareService:
             query = query.order_by(sort_column.desc())
         
         offset = (page - 1) * per_page
-        hardware_list = query.offset(offset).limit(per_page).all()
+        rows = query.with_entities(*HardwareListItem.columns()).offset(offset).limit(per_page).all()
         
         total_pages = (total_count + per_page - 1) // per_page
         
@@ -113,7 +128,7 @@ class HardwareService:
             status_counts[s.value] = count
         
         return {
-            "hardware_list": hardware_list,
+            "hardware_list": [HardwareListItem.from_row(row) for row in rows],
             "total_count": total_count,
             "current_page": page,
             "per_page": per_page,
@@ -122,7 +137,7 @@ class HardwareService:
             "status_filter": [s.value for s in status_filter_list]
         }
     
-    def create_hardware(self, hardware_data: Dict[str, Any], current_user: Dict[str, Any]) -> Hardware:
+    def create_hardware(self, hardware_data: Dict[str, Any], current_user: Dict[str, Any], commit: bool = True) -> Hardware:
         now = datetime.now(timezone.utc)
         
         hardware = Hardware(
@@ -146,12 +161,17 @@ class HardwareService:
         )
         
         self.db.add(hardware)
+        if not commit:
+            self.db.flush()
+            return hardware
         self.db.commit()
         self.db.refresh(hardware)
         
         return hardware
     
-    def update_hardware(self, hardware_id: int, hardware_data: Dict[str, Any], current_user: Dict[str, Any]) -> Hardware:
+    def update_hardware(
+        self, hardware_id: int, hardware_data: Dict[str, Any], current_user: Dict[str, Any], commit: bool = True
+    ) -> Hardware:
         hardware = self.get_hardware_by_id(hardware_id)
         if not hardware:
             raise ValueError("Hardware not found")
@@ -177,7 +197,10 @@ class HardwareService:
         if hardware_data.get('status') == StatusEnum.SHIPPED and old_status != StatusEnum.SHIPPED:
             hardware.shipped_at = datetime.now(timezone.utc)
         
-        self.db.commit()
+        if commit:
+            self.db.commit()
+        else:
+            self.db.flush()
         return hardware
     
     def delete_hardware(self, hardware_id: int) -> bool:
@@ -189,14 +212,15 @@ class HardwareService:
         self.db.commit()
         return True
     
-    def export_hardware_to_excel(self,
-                                 search: Optional[str] = None,
-                                 status: Optional[List[str]] = None,
-                                 model: Optional[str] = None,
-                                 center: Optional[str] = None) -> io.BytesIO:
+    def get_export_rows(self,
+                        search: Optional[str] = None,
+                        status: Optional[List[str]] = None,
+                        model: Optional[str] = None,
+                        center: Optional[str] = None) -> List[Dict[str, Any]]:
 
         query, _ = self.get_filtered_hardware_query(search, status, model, center)
-        hardware_list = query.order_by(Hardware.updated_at.desc()).all()
+        # plain rows of the selected columns, not tracked Hardware instances
+        hardware_list = query.with_entities(*HardwareView.columns()).order_by(Hardware.updated_at.desc()).all()
 
         data = []
         for hw in hardware_list:
@@ -221,53 +245,15 @@ class HardwareService:
                 'Shipped At': hw.shipped_at.strftime('%Y-%m-%d %H:%M:%S') if hw.shipped_at else '',
             })
 
-        if not data:
-            return io.BytesIO()
-
-        df = pd.DataFrame(data)
-        
-        output = io.BytesIO()
-        with pd.ExcelWriter(output, engine='openpyxl') as writer:
-            df.to_excel(writer, sheet_name='Hardware Inventory', index=False)
-
-            worksheet = writer.sheets['Hardware Inventory']
-
-            num_rows, num_cols = df.shape
-
-            last_col_letter = get_column_letter(num_cols)
-            table_ref = f"A1:{last_col_letter}{num_rows + 1}"
+        return data
 
-            display_name = f"HardwareTabelle_{datetime.now().strftime('%Y%m%d%H%M%S')}"
-            
-            table = Table(displayName=display_name, ref=table_ref)
-
-            style = TableStyleInfo(
-                name="TableStyleMedium9",
-                showFirstColumn=False,
-                showLastColumn=False,
-                showRowStripes=True,
-                showColumnStripes=False,
-            )
-            table.tableStyleInfo = style
+    def export_hardware_to_excel(self,
+                                 search: Optional[str] = None,
+                                 status: Optional[List[str]] = None,
+                                 model: Optional[str] = None,
+                                 center: Optional[str] = None) -> io.BytesIO:
+        return build_hardware_excel(self.get_export_rows(search, status, model, center))
 
-            worksheet.add_table(table)
-            
-            for column_cells in worksheet.columns:
-                max_length = 0
-                column_letter = column_cells[0].column_letter
-                for cell in column_cells:
-                    try:
-                        if len(str(cell.value)) > max_length:
-                            max_length = len(str(cell.value))
-                    except:
-                        pass
-                
-                adjusted_width = min(max_length + 2, 50)
-                worksheet.column_dimensions[column_letter].width = adjusted_width
-        
-        output.seek(0)
-        return output
-    
     def import_hardware_from_file(self, file_content: bytes, filename: str, current_user: Dict[str, Any]) -> Dict[str, Any]:
         parsed = self.parse_import_file(file_content, filename)
 
@@ -299,6 +285,8 @@ class HardwareService:
             csv_reader = csv.DictReader(io.StringIO(csv_string))
             rows = list(csv_reader)
         elif filename.endswith(('.xlsx', '.xls')):
+            import pandas as pd
+
             df = pd.read_excel(io.BytesIO(file_content))
             rows = df.to_dict('records')
         else:
@@ -313,7 +301,7 @@ class HardwareService:
             try:
                 def safe_get(key, default=''):
                     value = row.get(key, default)
-                    if pd.isna(value):
+                    if _is_missing(value):
                         return default
                     return str(value).strip()
 
@@ -376,7 +364,14 @@ class HardwareService:
             'update_count': update_count,
         }
 
-    def apply_import_data(self, items: List[Dict[str, Any]], current_user: Dict[str, Any]) -> Dict[str, Any]:
+    def apply_import_data(
+        self, items: List[Dict[str, Any]], current_user: Dict[str, Any], commit: bool = True
+    ) -> Dict[str, Any]:
+        """Create or update devices by serial number.
+
+        With commit=False each row runs in a savepoint, so a failing row is
+        undone on its own, and committing the batch is left to the caller.
+        """
         created = 0
         updated = 0
         errors: List[str] = []
@@ -387,7 +382,11 @@ class HardwareService:
                 hardware_data['model'] = ModelEnum(hardware_data['model'])
                 hardware_data['status'] = StatusEnum(hardware_data['status'])
 
-                action, _ = self.upsert_hardware_by_serial(hardware_data, current_user)
+                if commit:
+                    action, _ = self.upsert_hardware_by_serial(hardware_data, current_user)
+                else:
+                    with self.db.begin_nested():
+                        action, _ = self.upsert_hardware_by_serial(hardware_data, current_user, commit=False)
                 if action == 'created':
                     created += 1
                 else:
@@ -399,7 +398,7 @@ class HardwareService:
         return {'created': created, 'updated': updated, 'errors': errors}
 
     def upsert_hardware_by_serial(
-        self, hardware_data: Dict[str, Any], current_user: Dict[str, Any]
+        self, hardware_data: Dict[str, Any], current_user: Dict[str, Any], commit: bool = True
     ) -> Tuple[str, Hardware]:
         serial_number = hardware_data.get('serial_number')
         if not serial_number:
@@ -407,10 +406,10 @@ class HardwareService:
 
         existing = self.get_hardware_by_serial(serial_number)
         if existing:
-            updated = self.update_hardware(existing.id, hardware_data, current_user)
+            updated = self.update_hardware(existing.id, hardware_data, current_user, commit=commit)
             return 'updated', updated
 
-        created = self.create_hardware(hardware_data, current_user)
+        created = self.create_hardware(hardware_data, current_user, commit=commit)
         return 'created', created
     
     def _extract_hardware_from_row(self, row: Dict[str, Any], safe_get) -> Dict[str, Any]:
@@ -487,28 +486,8 @@ class HardwareService:
         hardware = self.get_hardware_by_id(hardware_id)
         if not hardware:
             raise ValueError("Hardware not found")
-        
-        api_url = f"{settings.base_url}/hardware/{hardware_id}"
-        
-        qr = qrcode.QRCode(
-            version=1,
-            error_correction=qrcode.constants.ERROR_CORRECT_L,
-            box_size=10,
-            border=4,
-        )
-        qr.add_data(api_url)
-        qr.make(fit=True)
-        
-        img = qr.make_image(fill_color="black", back_color="white")
-        
-        img_buffer = io.BytesIO()
-        img.save(img_buffer, format='PNG')
-        img_buffer.seek(0)
-        
-        serial = hardware.serial_number.replace('/', '-').replace('\\', '-')
-        filename = f"QR_{serial}_{hardware.hostname}.png"
-        
-        return img_buffer, filename
+
+        return build_qr_code(hardware)
 
     def generate_label_csv(self, hardware_id: int) -> Tuple[str, str]:
         hardware = self.get_hardware_by_id(hardware_id)
@@ -530,3 +509,84 @@ class HardwareService:
         filename = f"label_{serial}_{hardware.hostname}.csv"
         
         return csv_string, filename
+
+
+def build_hardware_excel(data: List[Dict[str, Any]]) -> io.BytesIO:
+    """Excel workbook of export rows, built without touching the database."""
+    if not data:
+        return io.BytesIO()
+
+    import pandas as pd
+    from openpyxl.utils import get_column_letter
+    from openpyxl.worksheet.table import Table, TableStyleInfo
+
+    df = pd.DataFrame(data)
+    
+    output = io.BytesIO()
+    with pd.ExcelWriter(output, engine='openpyxl') as writer:
+        df.to_excel(writer, sheet_name='Hardware Inventory', index=False)
+
+        worksheet = writer.sheets['Hardware Inventory']
+
+        num_rows, num_cols = df.shape
+
+        last_col_letter = get_column_letter(num_cols)
+        table_ref = f"A1:{last_col_letter}{num_rows + 1}"
+
+        display_name = f"HardwareTabelle_{datetime.now().strftime('%Y%m%d%H%M%S')}"
+        
+        table = Table(displayName=display_name, ref=table_ref)
+
+        style = TableStyleInfo(
+            name="TableStyleMedium9",
+            showFirstColumn=False,
+            showLastColumn=False,
+            showRowStripes=True,
+            showColumnStripes=False,
+        )
+        table.tableStyleInfo = style
+
+        worksheet.add_table(table)
+        
+        for column_cells in worksheet.columns:
+            max_length = 0
+            column_letter = column_cells[0].column_letter
+            for cell in column_cells:
+                try:
+                    if len(str(cell.value)) > max_length:
+                        max_length = len(str(cell.value))
+                except:
+                    pass
+            
+            adjusted_width = min(max_length + 2, 50)
+            worksheet.column_dimensions[column_letter].width = adjusted_width
+    
+    output.seek(0)
+    return output
+
+
+def build_qr_code(hardware) -> Tuple[io.BytesIO, str]:
+    """QR code PNG linking to the hardware page; takes a model or a HardwareView."""
+    api_url = f"{settings.base_url}/hardware/{hardware.id}"
+
+    import qrcode
+
+    qr = qrcode.QRCode(
+        version=1,
+        error_correction=qrcode.constants.ERROR_CORRECT_L,
+        box_size=10,
+        border=4,
+    )
+    qr.add_data(api_url)
+    qr.make(fit=True)
+    
+    img = qr.make_image(fill_color="black", back_color="white")
+    
+    img_buffer = io.BytesIO()
+    img.save(img_buffer, format='PNG')
+    img_buffer.seek(0)
+    
+    serial = hardware.serial_number.replace('/', '-').replace('\\', '-')
+    filename = f"QR_{serial}_{hardware.hostname}.png"
+    
+    return img_buffer, filename
@@ -0,0 +1,87 @@
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from sqlalchemy.orm import Session, defer
+
+from app.core.config import settings
+from app.core.jobs import JobContext, JobQueue
+from app.models.job import Job
+from app.services.auth import UserRole
+from app.services.hardware import HardwareService, build_hardware_excel
+
+HARDWARE_IMPORT = "hardware_import"
+HARDWARE_EXPORT = "hardware_export"
+
+XLSX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+
+def run_hardware_import(ctx: JobContext) -> Dict[str, Any]:
+    """Apply confirmed import rows in chunks, one commit per chunk.
+
+    The running totals are stored with every checkpoint, so an attempt
+    after a crash continues with the first uncommitted chunk.
+    """
+    items = ctx.params["items"]
+    current_user = {"username": ctx.job.username}
+    service = HardwareService(ctx.db)
+
+    totals = ctx.job.result or {"created": 0, "updated": 0, "errors": []}
+    done = ctx.job.progress_done
+    while done < len(items):
+        chunk = items[done:done + settings.job_import_chunk_size]
+        summary = service.apply_import_data(chunk, current_user, commit=False)
+        totals = {
+            "created": totals["created"] + summary["created"],
+            "updated": totals["updated"] + summary["updated"],
+            "errors": totals["errors"] + summary["errors"],
+        }
+        done += len(chunk)
+        ctx.job.result = totals
+        ctx.checkpoint(done, len(items))
+        # committed rows are not needed again, keep the identity map small;
+        # the job stays attached, run_next still has to finish it
+        for obj in list(ctx.db):
+            if obj is not ctx.job:
+                ctx.db.expunge(obj)
+
+    return {
+        "total_rows": ctx.params.get("total_rows", len(items)),
+        "created": totals["created"],
+        "updated": totals["updated"],
+        "errors": ctx.params.get("errors", []) + totals["errors"],
+    }
+
+
+def run_hardware_export(ctx: JobContext) -> Dict[str, Any]:
+    rows = HardwareService(ctx.db).get_export_rows(**ctx.params)
+    # ends the read transaction before the long workbook build
+    ctx.checkpoint(0, len(rows))
+
+    output = build_hardware_excel(rows)
+    ctx.job.result_file = output.getvalue()
+    ctx.job.result_filename = f"hardware_inventory_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
+    ctx.job.result_media_type = XLSX_MEDIA_TYPE
+    ctx.job.progress_done = len(rows)
+    return {"rows": len(rows)}
+
+
+def register_job_handlers(queue: JobQueue) -> None:
+    queue.register(HARDWARE_IMPORT, run_hardware_import)
+    queue.register(HARDWARE_EXPORT, run_hardware_export)
+
+
+class JobService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_job(self, job_id: int, current_user: Dict[str, Any], with_file: bool = False) -> Optional[Job]:
+        """The job if the user queued it (administrators see all), else None."""
+        query = self.db.query(Job).filter(Job.id == job_id)
+        if not with_file:
+            query = query.options(defer(Job.result_file))
+        job = query.first()
+        if job is None:
+            return None
+        if job.username != current_user.get("username") and current_user.get("role") != UserRole.ADMINISTRATOR:
+            return None
+        return job
@@ -0,0 +1,115 @@
+from datetime import timedelta
+
+from sqlalchemy.orm import Session
+
+from app.audit.partitions import maintain_audit_partitions
+from app.audit.rollups import rollup_accumulator
+from app.audit.state import prune_hardware_snapshots, take_hardware_snapshot
+from app.core.config import settings
+from app.core.jobs import prune_jobs
+from app.core.revocation import prune_revoked_sessions, revocation_index
+from app.core.scheduler import MaintenanceScheduler
+from app.core.slow_queries import prune_slow_queries
+from app.services.metrics import refresh_runtime_metrics
+from app.services.user import UserService
+
+
+def cleanup_expired_sessions_job(db: Session) -> int:
+    return UserService(db).cleanup_expired_sessions(batch_size=settings.session_cleanup_batch_size)
+
+
+def prune_revoked_sessions_job(db: Session) -> int:
+    return prune_revoked_sessions(db)
+
+
+def prune_revocation_index_job(db: Session) -> int:
+    return revocation_index.prune()
+
+
+def maintain_audit_partitions_job(db: Session) -> dict:
+    return maintain_audit_partitions(
+        db,
+        months_ahead=settings.audit_partition_months_ahead,
+        retention_months=settings.audit_access_log_retention_months,
+    )
+
+
+def flush_request_rollups_job(db: Session) -> int:
+    return rollup_accumulator.flush(db)
+
+
+def hardware_snapshot_job(db: Session) -> dict:
+    return {
+        # the job also runs shortly after every start, which must not add a snapshot each time
+        "snapshot_id": take_hardware_snapshot(
+            db, min_interval=timedelta(hours=settings.hardware_snapshot_interval_hours)
+        ),
+        "pruned": prune_hardware_snapshots(db, settings.hardware_snapshot_retention_days),
+    }
+
+
+def prune_slow_queries_job(db: Session) -> int:
+    return prune_slow_queries(db, settings.slow_query_max_rows)
+
+
+def prune_jobs_job(db: Session) -> dict:
+    return prune_jobs(db, settings.job_retention_hours, settings.job_stale_seconds, settings.job_max_attempts)
+
+
+def refresh_runtime_metrics_job(db: Session) -> None:
+    refresh_runtime_metrics()
+
+
+def register_maintenance_jobs(scheduler: MaintenanceScheduler) -> None:
+    scheduler.add_job(
+        "cleanup_expired_sessions",
+        cleanup_expired_sessions_job,
+        interval_seconds=settings.session_cleanup_interval_seconds,
+    )
+    scheduler.add_job(
+        "prune_revoked_sessions",
+        prune_revoked_sessions_job,
+        interval_seconds=settings.session_cleanup_interval_seconds,
+    )
+    # every worker holds its own in-memory index
+    scheduler.add_job(
+        "prune_revocation_index",
+        prune_revocation_index_job,
+        interval_seconds=settings.session_cleanup_interval_seconds,
+        exclusive=False,
+    )
+    scheduler.add_job(
+        "maintain_audit_partitions",
+        maintain_audit_partitions_job,
+        interval_seconds=6 * 3600,
+    )
+    # counters are per worker and merged additively, no lock needed
+    scheduler.add_job(
+        "flush_request_rollups",
+        flush_request_rollups_job,
+        interval_seconds=settings.audit_rollup_flush_seconds,
+        exclusive=False,
+    )
+    scheduler.add_job(
+        "hardware_snapshot",
+        hardware_snapshot_job,
+        interval_seconds=settings.hardware_snapshot_interval_hours * 3600,
+    )
+    scheduler.add_job(
+        "prune_slow_queries",
+        prune_slow_queries_job,
+        interval_seconds=3600,
+    )
+    scheduler.add_job(
+        "prune_jobs",
+        prune_jobs_job,
+        interval_seconds=3600,
+    )
+    if settings.metrics_enabled:
+        # per worker, so idle workers' values stay current in multi-process mode
+        scheduler.add_job(
+            "refresh_runtime_metrics",
+            refresh_runtime_metrics_job,
+            interval_seconds=15,
+            exclusive=False,
+        )
@@ -0,0 +1,30 @@
+from app.audit.rollups import rollup_accumulator
+from app.audit.sampling import access_log_sampler
+from app.core import metrics
+from app.core.revocation import revocation_index
+from app.core.scheduler import scheduler
+
+_counters = metrics.CounterSync()
+
+
+def refresh_runtime_metrics() -> None:
+    """Copy this worker's in-memory state into its metrics.
+
+    Runs before each scrape served by this worker and periodically on every
+    worker, so multi-process aggregation sees recent values from all of them.
+    """
+    _counters.sync(metrics.REVOCATION_LOOKUPS, revocation_index.hits, "hit")
+    _counters.sync(metrics.REVOCATION_LOOKUPS, revocation_index.misses, "miss")
+    metrics.REVOCATION_INDEX_SIZE.set(len(revocation_index))
+
+    metrics.ROLLUP_PENDING.set(len(rollup_accumulator))
+
+    _counters.sync(metrics.ACCESS_LOG_DECISIONS, access_log_sampler.logged, "logged")
+    _counters.sync(metrics.ACCESS_LOG_DECISIONS, sum(access_log_sampler.dropped.values()), "dropped")
+
+    for job in scheduler.jobs.values():
+        _counters.sync(metrics.SCHEDULER_JOB_RUNS, job.runs, job.name)
+        _counters.sync(metrics.SCHEDULER_JOB_FAILURES, job.failures, job.name)
+        _counters.sync(metrics.SCHEDULER_JOB_SKIPPED, job.skipped, job.name)
+        if job.last_duration_ms is not None:
+            metrics.SCHEDULER_JOB_LAST_DURATION.labels(job.name).set(job.last_duration_ms / 1000)
@@ -1,9 +1,11 @@
 from datetime import datetime, timezone, timedelta
 from typing import Optional, List
 from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from sqlalchemy import and_, func, select, update
 from app.models.user import User
+from app.models.revoked_session import RevokedSession
 from app.core.config import settings
+from app.core.revocation import REVOCATION_CHANNEL, encode_notification, revocation_index
 import logging
 
 logger = logging.getLogger(__name__)
@@ -80,31 +82,61 @@ class UserService:
         logger.info(f"Updated AD info for user: {user.username}")
         return user
 
-    def invalidate_session(self, user: User) -> None:
+    def invalidate_session(self,
+                           user: User,
+                           jti: Optional[str] = None,
+                           expires_at: Optional[float] = None) -> None:
         user.current_session_token = None
         user.session_expires = None
         user.updated_at = datetime.now(timezone.utc)
-        
+
+        if jti and expires_at:
+            self.db.add(RevokedSession(
+                jti=jti,
+                username=user.username,
+                expires_at=datetime.fromtimestamp(expires_at, tz=timezone.utc)
+            ))
+            if self.db.get_bind().dialect.name == "postgresql":
+                # delivered to every worker's listener once the transaction commits
+                self.db.execute(select(func.pg_notify(REVOCATION_CHANNEL, encode_notification(jti, expires_at))))
+
         self.db.commit()
+
+        if jti and expires_at:
+            revocation_index.add(jti, expires_at)
+
         logger.info(f"Invalidated session for user: {user.username}")
 
-    def cleanup_expired_sessions(self) -> int:
+    def cleanup_expired_sessions(self, batch_size: int = 1000) -> int:
+        # Set-based UPDATE in bounded batches: no ORM objects are loaded, so this
+        # doesn't go through the flush (and doesn't write an audit row per user).
         try:
             now = datetime.now(timezone.utc)
-            expired_users = self.db.query(User).filter(
-                and_(
-                    User.session_expires < now,
-                    User.current_session_token.isnot(None)
-                )
-            ).all()
-
             count = 0
-            for user in expired_users:
-                user.current_session_token = None
-                user.session_expires = None
-                count += 1
 
-            self.db.commit()
+            while True:
+                expired_ids = (
+                    select(User.id)
+                    .where(
+                        and_(
+                            User.session_expires < now,
+                            User.current_session_token.isnot(None)
+                        )
+                    )
+                    .limit(batch_size)
+                    .with_for_update(skip_locked=True)
+                )
+                result = self.db.execute(
+                    update(User)
+                    .where(User.id.in_(expired_ids))
+                    .values(current_session_token=None, session_expires=None)
+                    .execution_options(synchronize_session=False)
+                )
+                self.db.commit()
+
+                count += result.rowcount
+                if result.rowcount < batch_size:
+                    break
 
             if count > 0:
                 logger.info(f"Cleaned up {count} expired user sessions")
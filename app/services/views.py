@@ -0,0 +1,58 @@
+"""Read-only copies of model rows for rendering.
+
+Routes read what a template or file needs into these, release the session
+(app.core.db.release_session) and only then render, so pooled connections
+are not held while Jinja or openpyxl run.
+
+The list paths select just the columns of their view (see columns()), so
+the rows come back as plain tuples: no identity map, no change tracking and
+no model validation per row.
+"""
+from typing import Any, List, Sequence
+
+from app.models.hardware import Hardware
+
+HARDWARE_FIELDS = tuple(column.key for column in Hardware.__table__.columns)
+
+# what hardware_table.html and hardware_card_mobile.html show per row
+HARDWARE_LIST_FIELDS = (
+    "id", "hostname", "serial_number", "model", "status", "ip", "mac", "uuid",
+    "center", "enduser", "ticket", "po_ticket", "comment", "missing",
+)
+
+
+class _RowView:
+    """Attribute access to a fixed set of Hardware columns, in __slots__."""
+
+    __slots__ = ()
+
+    def __init__(self, *values: Any, **named: Any):
+        for field, value in zip(self.__slots__, values):
+            setattr(self, field, value)
+        for field, value in named.items():
+            setattr(self, field, value)
+
+    @classmethod
+    def columns(cls) -> List[Any]:
+        """Columns to select, in the order the constructor takes them."""
+        return [Hardware.__table__.c[field] for field in cls.__slots__]
+
+    @classmethod
+    def from_row(cls, row: Sequence[Any]):
+        return cls(*row)
+
+    @classmethod
+    def from_model(cls, hardware: Hardware):
+        return cls(*(getattr(hardware, field) for field in cls.__slots__))
+
+
+class HardwareView(_RowView):
+    """Column values of a Hardware row, with the same attribute names."""
+
+    __slots__ = HARDWARE_FIELDS
+
+
+class HardwareListItem(_RowView):
+    """The columns of a Hardware row that the list templates render."""
+
+    __slots__ = HARDWARE_LIST_FIELDS
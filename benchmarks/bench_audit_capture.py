@@ -0,0 +1,110 @@
+"""Microbenchmark for the audit change capture in app/audit/listeners.py.
+
+Flushes N new Hardware rows, then updates and deletes them, with and without
+the audit listeners installed, and reports rows/s and the listener overhead.
+
+    python -m benchmarks.bench_audit_capture --rows 5000
+    python -m benchmarks.bench_audit_capture --database-url postgresql://...
+"""
+import argparse
+import time
+from datetime import datetime, timezone
+
+from benchmarks.common import setup_environment
+
+setup_environment()
+
+from sqlalchemy import create_engine, event, func, select  # noqa: E402
+from sqlalchemy.orm import Session, sessionmaker  # noqa: E402
+from sqlmodel import SQLModel  # noqa: E402
+
+from app.audit import listeners  # noqa: E402
+from app.models.entity_change import EntityChange  # noqa: E402
+from app.models.hardware import Hardware, ModelEnum, StatusEnum  # noqa: E402
+
+
+def make_hardware(index: int) -> Hardware:
+    now = datetime.now(timezone.utc)
+    return Hardware(
+        hostname=f"nb-{index:07d}",
+        serial_number=f"BENCH-{index:09d}",
+        model=ModelEnum.Notebook,
+        status=StatusEnum.IN_STOCK,
+        admin="bench",
+        center="HQ",
+        created_at=now,
+        updated_at=now,
+    )
+
+
+def run_once(session_factory, rows: int) -> dict:
+    timings = {}
+    with session_factory() as db:
+        items = [make_hardware(index) for index in range(rows)]
+        start = time.perf_counter()
+        db.add_all(items)
+        db.flush()
+        timings["create"] = time.perf_counter() - start
+
+        for item in items:
+            item.status = StatusEnum.RESERVED
+            item.comment = "benchmark"
+        start = time.perf_counter()
+        db.flush()
+        timings["update"] = time.perf_counter() - start
+
+        for item in items:
+            db.delete(item)
+        start = time.perf_counter()
+        db.flush()
+        timings["delete"] = time.perf_counter() - start
+
+        timings["changes_written"] = db.execute(select(func.count()).select_from(EntityChange)).scalar()
+        db.rollback()
+    return timings
+
+
+def set_listeners(enabled: bool) -> None:
+    for name, fn in (("before_flush", listeners.before_flush_listener), ("after_flush", listeners.after_flush_listener)):
+        installed = event.contains(Session, name, fn)
+        if enabled and not installed:
+            event.listen(Session, name, fn)
+        elif not enabled and installed:
+            event.remove(Session, name, fn)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark audit change capture")
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--database-url", default="sqlite://")
+    args = parser.parse_args()
+
+    engine = create_engine(args.database_url)
+    SQLModel.metadata.create_all(engine, tables=[Hardware.__table__, EntityChange.__table__])
+    session_factory = sessionmaker(bind=engine, autoflush=False)
+
+    results = {}
+    for enabled in (False, True):
+        set_listeners(enabled)
+        runs = [run_once(session_factory, args.rows) for _ in range(args.repeat)]
+        results[enabled] = {
+            phase: min(run[phase] for run in runs) for phase in ("create", "update", "delete")
+        }
+        results[enabled]["changes_written"] = runs[-1]["changes_written"]
+    set_listeners(False)
+
+    print(f"{args.rows} rows, best of {args.repeat}, {engine.dialect.name}")
+    print(f"{'phase':<8} {'no audit':>14} {'with audit':>14} {'overhead':>10}")
+    for phase in ("create", "update", "delete"):
+        base = results[False][phase]
+        audited = results[True][phase]
+        print(
+            f"{phase:<8} {args.rows / base:>10.0f} r/s {args.rows / audited:>10.0f} r/s "
+            f"{(audited - base) / args.rows * 1e6:>7.1f} us"
+        )
+    print(f"entity changes written per run: {results[True]['changes_written']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""HardwareService benchmarks: list filters, import and Excel export."""
+import csv
+import io
+import os
+
+import pytest
+
+from app.services.hardware import HardwareService
+from benchmarks.conftest import remove_benchmark_rows
+
+IMPORT_SIZES = [int(size) for size in os.getenv("BENCH_IMPORT_SIZES", "1000,10000").split(",")]
+IMPORT_SERIAL_PREFIX = "IMPBENCH"
+IMPORT_USER = {"username": "bench", "role": "administrator"}
+# a full export of 1M rows takes minutes and most of its memory is openpyxl's
+FULL_EXPORT_MAX_ROWS = 100000
+
+LIST_CASES = {
+    "default": {},
+    "search_hostname": {"search": "nb-00012"},
+    "search_no_match": {"search": "zzzz"},
+    "status_in_stock": {"status": ["IN_STOCK"]},
+    "status_model": {"status": ["SHIPPED", "COMPLETED"], "model": "Monitor"},
+    "center": {"center": "Warehouse"},
+    "sort_hostname_asc": {"sort_by": "hostname", "sort_order": "asc"},
+    "deep_page": {"page": 200},
+    "per_page_100": {"per_page": 100},
+}
+
+
+@pytest.mark.benchmark(group="get_hardware_list")
+@pytest.mark.parametrize("case", list(LIST_CASES))
+def test_get_hardware_list(measure, case):
+    filters = LIST_CASES[case]
+    measure(lambda db: HardwareService(db).get_hardware_list(**filters))
+
+
+def import_csv(rows: int) -> bytes:
+    output = io.StringIO()
+    writer = csv.writer(output)
+    writer.writerow(["Hostname", "Serial Number", "Model", "Status", "Center", "End User", "Ticket", "Missing"])
+    for index in range(rows):
+        writer.writerow([
+            f"imp-{index:06d}", f"{IMPORT_SERIAL_PREFIX}{index:08d}", "Notebook", "IN_STOCK",
+            "HQ", "", f"TKT-{index:06d}", "no",
+        ])
+    return output.getvalue().encode()
+
+
+@pytest.mark.benchmark(group="parse_import_file")
+@pytest.mark.parametrize("rows", IMPORT_SIZES)
+def test_parse_import_file(measure, rows):
+    content = import_csv(rows)
+    measure(lambda db: HardwareService(db).parse_import_file(content, "import.csv"), rounds=3)
+
+
+@pytest.mark.benchmark(group="apply_import_data")
+@pytest.mark.parametrize("rows", IMPORT_SIZES)
+def test_apply_import_data(measure, bench_db, rows):
+    """New devices only; every round starts from the seeded data."""
+    with bench_db.session_factory() as db:
+        items = [item["data"] for item in HardwareService(db).parse_import_file(import_csv(rows), "import.csv")["valid_items"]]
+
+    measure(
+        lambda db: HardwareService(db).apply_import_data(items, IMPORT_USER),
+        rounds=3 if rows <= 1000 else 1,
+        setup=lambda: remove_benchmark_rows(bench_db, IMPORT_SERIAL_PREFIX),
+    )
+    remove_benchmark_rows(bench_db, IMPORT_SERIAL_PREFIX)
+
+
+@pytest.mark.benchmark(group="export_hardware_to_excel")
+def test_export_filtered(measure):
+    measure(lambda db: HardwareService(db).export_hardware_to_excel(status=["IN_STOCK"], center="HQ"), rounds=3)
+
+
+@pytest.mark.benchmark(group="export_hardware_to_excel")
+def test_export_all_open(measure, bench_db):
+    if bench_db.size > FULL_EXPORT_MAX_ROWS:
+        pytest.skip(f"full export only up to {FULL_EXPORT_MAX_ROWS} rows")
+    measure(lambda db: HardwareService(db).export_hardware_to_excel(), rounds=1)
@@ -0,0 +1,44 @@
+"""Fetching list rows: full Hardware instances vs. the projected columns of a view.
+
+"orm" is what the list and export paths did before: load tracked Hardware
+instances and copy them into views. "projected" selects only the view's
+columns, as they do now. Each benchmark records rows_per_second in its
+extra_info.
+"""
+import pytest
+
+from app.models.hardware import Hardware
+from app.services.views import HardwareListItem, HardwareView
+
+# one page of the table, the largest page, and an export-sized batch
+ROW_COUNTS = [20, 100, 5000]
+
+FETCHERS = {
+    "orm": lambda db, view, limit: [
+        view.from_model(hw) for hw in db.query(Hardware).order_by(Hardware.updated_at.desc()).limit(limit).all()
+    ],
+    "projected": lambda db, view, limit: [
+        view.from_row(row) for row in db.query(*view.columns()).order_by(Hardware.updated_at.desc()).limit(limit).all()
+    ],
+}
+
+
+def record_rows_per_second(benchmark, rows: int) -> None:
+    # no stats with --benchmark-disable, the functions then run once as plain tests
+    if benchmark.stats:
+        benchmark.extra_info["rows_per_second"] = round(rows / benchmark.stats.stats.median)
+
+
+@pytest.mark.benchmark(group="list_rows")
+@pytest.mark.parametrize("fetch", list(FETCHERS))
+@pytest.mark.parametrize("limit", ROW_COUNTS)
+def test_list_rows(benchmark, measure, fetch, limit):
+    rows = measure(lambda db: FETCHERS[fetch](db, HardwareListItem, limit))
+    record_rows_per_second(benchmark, len(rows))
+
+
+@pytest.mark.benchmark(group="export_rows")
+@pytest.mark.parametrize("fetch", list(FETCHERS))
+def test_export_rows(benchmark, measure, fetch):
+    rows = measure(lambda db: FETCHERS[fetch](db, HardwareView, ROW_COUNTS[-1]), rounds=5)
+    record_rows_per_second(benchmark, len(rows))
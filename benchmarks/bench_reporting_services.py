@@ -0,0 +1,29 @@
+"""AuditService and StockService benchmarks: history, log statistics, stock summary."""
+import pytest
+
+from app.services.audit import AuditService
+from app.services.stock import StockService
+from benchmarks.conftest import HISTORY_ENTITY_ID, HISTORY_LENGTH
+
+
+@pytest.mark.benchmark(group="get_entity_history")
+@pytest.mark.parametrize("page", [1, HISTORY_LENGTH // 100])
+def test_get_entity_history(measure, page):
+    measure(lambda db: AuditService(db).get_entity_history("Hardware", str(HISTORY_ENTITY_ID), page=page))
+
+
+@pytest.mark.benchmark(group="get_entity_history")
+def test_get_entity_history_short(measure, bench_db):
+    # a device with the few background changes most devices have
+    measure(lambda db: AuditService(db).get_entity_history("Hardware", str(bench_db.size // 2)))
+
+
+@pytest.mark.benchmark(group="get_log_statistics")
+@pytest.mark.parametrize("days", [1, 30])
+def test_get_log_statistics(measure, days):
+    measure(lambda db: AuditService(db).get_log_statistics(days))
+
+
+@pytest.mark.benchmark(group="get_stock_summary")
+def test_get_stock_summary(measure):
+    measure(lambda db: StockService(db).get_stock_summary())
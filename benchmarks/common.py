@@ -0,0 +1,39 @@
+"""Shared setup for the benchmark scripts.
+
+The app reads its configuration from the environment at import time, so
+placeholders are set before anything from app is imported. The project's
+.env is loaded first and wins over them, so scripts that talk to a running
+server sign their session cookie with its SECRET_KEY.
+"""
+import os
+import sys
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+
+BENCH_ENV_DEFAULTS = {
+    "DATABASE_URL": "sqlite://",
+    "BASE_URL": "http://localhost:8000",
+    "SECRET_KEY": "benchmark-secret-key",
+    "APP_HOST": "127.0.0.1",
+    "APP_PORT": "8000",
+    "DEBUG": "false",
+    "LDAP_URL": "ldap://localhost",
+    "LDAP_BASE_DN": "DC=example,DC=org",
+    "LDAP_BIND_DN": "CN=bench,DC=example,DC=org",
+    "LDAP_BIND_PASSWORD": "bench",
+    "LDAP_DOMAIN": "example.org",
+    "ADMIN_GROUP": "CN=GG-Inventory-Admin,DC=example,DC=org",
+    "VISITOR_GROUP": "CN=GG-Inventory-Visitor,DC=example,DC=org",
+    "MAINTENANCE_ENABLED": "false",
+}
+
+
+def setup_environment() -> None:
+    load_dotenv(PROJECT_ROOT / ".env")
+    for key, value in BENCH_ENV_DEFAULTS.items():
+        os.environ.setdefault(key, value)
+    if str(PROJECT_ROOT) not in sys.path:
+        sys.path.insert(0, str(PROJECT_ROOT))
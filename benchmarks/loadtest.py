@@ -0,0 +1,343 @@
+"""HTTP load test for the routes users hit the most.
+
+Replays a weighted mix of dashboard, hardware list (full page and HTMX table
+swaps with search, status filters, sorting and paging), detail, Excel export
+and import preview requests against a running server, then reports RPS and
+latency percentiles per route. Results are saved as JSON so runs on
+different commits can be compared.
+
+    python scripts/seed_dummy_data.py
+    python -m benchmarks.loadtest --base-url http://localhost:8000 --duration 60 --concurrency 20
+    python -m benchmarks.loadtest --output results/main.json
+    python -m benchmarks.loadtest --compare results/main.json
+
+The session cookie is signed locally, so SECRET_KEY (from the environment
+or .env) must match the server's; the run stops if the server does not
+accept it. Responses other than 2xx count as errors, except redirects that
+are part of the flow (a large export redirecting to its job page); a
+redirect to /login or /access-denied is an error too.
+Hardware IDs, hostnames and centers are sampled from DATABASE_URL, which
+should point at the server's database. --include-writes adds cycle-status
+requests, which change that data.
+"""
+import argparse
+import asyncio
+import csv
+import io
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, NamedTuple, Optional
+from urllib.parse import urlencode
+
+from benchmarks.common import PROJECT_ROOT, setup_environment
+
+setup_environment()
+
+import httpx  # noqa: E402
+from sqlalchemy import create_engine, func, select  # noqa: E402
+
+from app.core.config import settings  # noqa: E402
+from app.models.hardware import Hardware, ModelEnum, StatusEnum  # noqa: E402
+from app.services.auth import AuthService, UserRole  # noqa: E402
+
+PERCENTILES = (50, 90, 95, 99)
+# where the app sends requests it did not authenticate or authorize
+AUTH_REDIRECTS = ("/login", "/access-denied")
+SORT_COLUMNS = ("updated_at", "hostname", "serial_number", "status", "center", "created_at")
+
+
+class Fixture(NamedTuple):
+    ids: List[int]
+    hostnames: List[str]
+    centers: List[str]
+
+
+class Request(NamedTuple):
+    route: str
+    method: str
+    url: str
+    headers: Dict[str, str]
+    files: Optional[dict]
+
+
+def load_fixture(database_url: str, sample: int) -> Fixture:
+    engine = create_engine(database_url)
+    with engine.connect() as connection:
+        ids = connection.execute(
+            select(Hardware.id).order_by(func.random()).limit(sample)
+        ).scalars().all()
+        hostnames = connection.execute(
+            select(Hardware.hostname).order_by(func.random()).limit(sample)
+        ).scalars().all()
+        centers = connection.execute(
+            select(Hardware.center).where(Hardware.center.is_not(None)).distinct()
+        ).scalars().all()
+    engine.dispose()
+    if not ids:
+        sys.exit(f"No hardware in {database_url}, seed it first (scripts/seed_dummy_data.py)")
+    return Fixture(list(ids), list(hostnames), list(centers))
+
+
+def session_cookie() -> Dict[str, str]:
+    token = AuthService().create_session_token(
+        {"username": "loadtest", "role": UserRole.ADMINISTRATOR, "user_id": None}
+    )
+    return {settings.session_cookie_name: token}
+
+
+def random_filters(fixture: Fixture) -> Dict:
+    params = {}
+    roll = random.random()
+    if roll < 0.35:
+        # users type a prefix of a hostname or serial, not the whole value
+        hostname = random.choice(fixture.hostnames)
+        params["search"] = hostname[: random.randint(3, max(3, len(hostname)))]
+    elif roll < 0.45:
+        params["search"] = random.choice(fixture.centers or ["HQ"])
+    if random.random() < 0.4:
+        params["status"] = random.sample([s.value for s in StatusEnum], random.randint(1, 2))
+    if random.random() < 0.2:
+        params["model"] = random.choice(list(ModelEnum)).value
+    if random.random() < 0.2 and fixture.centers:
+        params["center"] = random.choice(fixture.centers)
+    if random.random() < 0.3:
+        params["sort_by"] = random.choice(SORT_COLUMNS)
+        params["sort_order"] = random.choice(("asc", "desc"))
+    # most users stay on the first pages
+    params["page"] = min(int(random.expovariate(0.7)) + 1, 50)
+    return params
+
+
+def hardware_page(fixture: Fixture, base_url: str) -> Request:
+    return Request("GET /hardware", "GET", "/hardware?" + urlencode(random_filters(fixture), doseq=True), {}, None)
+
+
+def hardware_table(fixture: Fixture, base_url: str) -> Request:
+    url = "/hardware?" + urlencode(random_filters(fixture), doseq=True)
+    # the table reads its filters from HX-Current-URL when htmx sends it
+    headers = {"HX-Request": "true", "HX-Current-URL": base_url + url}
+    return Request("GET /hardware (htmx)", "GET", url, headers, None)
+
+
+def dashboard(fixture: Fixture, base_url: str) -> Request:
+    return Request("GET /", "GET", "/", {}, None)
+
+
+def hardware_detail(fixture: Fixture, base_url: str) -> Request:
+    return Request("GET /hardware/{id}", "GET", f"/hardware/{random.choice(fixture.ids)}", {}, None)
+
+
+def export_excel(fixture: Fixture, base_url: str) -> Request:
+    params = {key: value for key, value in random_filters(fixture).items() if key in ("search", "status", "model", "center")}
+    return Request("GET /hardware/export/excel", "GET", "/hardware/export/excel?" + urlencode(params, doseq=True), {}, None)
+
+
+def import_preview(fixture: Fixture, base_url: str) -> Request:
+    output = io.StringIO()
+    writer = csv.writer(output)
+    writer.writerow(["Hostname", "Serial Number", "Model", "Status", "Center"])
+    suffix = random.getrandbits(32)
+    for index in range(50):
+        writer.writerow([f"lt-{suffix:08x}-{index}", f"LT{suffix:08x}{index:04d}", "Notebook", "IN_STOCK", "HQ"])
+    files = {"file": ("loadtest.csv", output.getvalue().encode(), "text/csv")}
+    return Request("POST /hardware/import", "POST", "/hardware/import", {}, files)
+
+
+def cycle_status(fixture: Fixture, base_url: str) -> Request:
+    url = f"/hardware/{random.choice(fixture.ids)}/cycle-status"
+    return Request("POST /hardware/{id}/cycle-status", "POST", url, {"HX-Request": "true"}, None)
+
+
+# relative weights, roughly the traffic seen in the access log
+READ_MIX: Dict[Callable, int] = {
+    hardware_table: 45,
+    hardware_page: 10,
+    dashboard: 15,
+    hardware_detail: 20,
+    export_excel: 2,
+    import_preview: 1,
+}
+WRITE_MIX: Dict[Callable, int] = {cycle_status: 7}
+
+
+def is_error(response: httpx.Response) -> bool:
+    if response.is_success:
+        return False
+    if response.is_redirect:
+        return response.headers.get("location", "").startswith(AUTH_REDIRECTS)
+    return True
+
+
+class RouteStats:
+    def __init__(self):
+        self.latencies: List[float] = []
+        self.status_codes: Dict[int, int] = {}
+        self.errors = 0
+
+    def summary(self, duration: float) -> Dict:
+        latencies = sorted(self.latencies)
+        result = {
+            "requests": len(latencies),
+            "rps": round(len(latencies) / duration, 2),
+            "errors": self.errors,
+            "status_codes": {str(code): count for code, count in sorted(self.status_codes.items())},
+        }
+        if latencies:
+            for p in PERCENTILES:
+                index = min(len(latencies) - 1, int(len(latencies) * p / 100))
+                result[f"p{p}_ms"] = round(latencies[index] * 1000, 2)
+            result["mean_ms"] = round(sum(latencies) / len(latencies) * 1000, 2)
+            result["max_ms"] = round(latencies[-1] * 1000, 2)
+        return result
+
+
+async def worker(client: httpx.AsyncClient, fixture: Fixture, mix: Dict[Callable, int], stats: Dict[str, RouteStats],
+                 base_url: str, measure_from: float, deadline: float) -> None:
+    generators = list(mix)
+    weights = list(mix.values())
+    while time.perf_counter() < deadline:
+        request = random.choices(generators, weights)[0](fixture, base_url)
+        start = time.perf_counter()
+        status_code = None
+        failed = True
+        try:
+            response = await client.request(request.method, request.url, headers=request.headers, files=request.files)
+            await response.aread()
+            status_code = response.status_code
+            failed = is_error(response)
+        except httpx.HTTPError:
+            pass
+        elapsed = time.perf_counter() - start
+        if start < measure_from:
+            continue
+        route = stats.setdefault(request.route, RouteStats())
+        route.latencies.append(elapsed)
+        if status_code is not None:
+            route.status_codes[status_code] = route.status_codes.get(status_code, 0) + 1
+        if failed:
+            route.errors += 1
+
+
+async def run(args, fixture: Fixture) -> Dict:
+    mix = dict(READ_MIX, **WRITE_MIX) if args.include_writes else READ_MIX
+    stats: Dict[str, RouteStats] = {}
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(
+        base_url=args.base_url, cookies=session_cookie(), limits=limits, timeout=args.timeout
+    ) as client:
+        await check_session(client)
+        now = time.perf_counter()
+        measure_from = now + args.warmup
+        deadline = measure_from + args.duration
+        await asyncio.gather(*(
+            worker(client, fixture, mix, stats, args.base_url, measure_from, deadline)
+            for _ in range(args.concurrency)
+        ))
+
+    total = RouteStats()
+    for route in stats.values():
+        total.latencies.extend(route.latencies)
+        total.errors += route.errors
+        for code, count in route.status_codes.items():
+            total.status_codes[code] = total.status_codes.get(code, 0) + count
+
+    return {
+        "started_at": datetime.now(timezone.utc).isoformat(),
+        "commit": git_commit(),
+        "base_url": args.base_url,
+        "duration_s": args.duration,
+        "concurrency": args.concurrency,
+        "include_writes": args.include_writes,
+        "hardware_sampled": len(fixture.ids),
+        "total": total.summary(args.duration),
+        "routes": {route: stats[route].summary(args.duration) for route in sorted(stats)},
+    }
+
+
+async def check_session(client: httpx.AsyncClient) -> None:
+    """Stop before measuring if the server does not accept the session cookie."""
+    try:
+        response = await client.get("/")
+    except httpx.HTTPError as e:
+        sys.exit(f"Cannot reach {client.base_url}: {e}")
+    if is_error(response):
+        location = response.headers.get("location")
+        sys.exit(
+            f"Authenticated probe of {client.base_url}/ failed with {response.status_code}"
+            + (f" (redirect to {location})" if location else "")
+            + ", check that SECRET_KEY matches the server's"
+        )
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_report(result: Dict, baseline: Optional[Dict]) -> None:
+    header = f"{'route':<36} {'req':>7} {'rps':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'err':>5}"
+    if baseline:
+        header += f" {'rps vs base':>12} {'p95 vs base':>12}"
+    print(f"commit {result['commit']}, {result['concurrency']} concurrent, {result['duration_s']}s")
+    print(header)
+    rows = list(result["routes"].items()) + [("total", result["total"])]
+    for route, summary in rows:
+        line = (
+            f"{route:<36} {summary['requests']:>7} {summary['rps']:>8.1f} {summary.get('p50_ms', 0):>8.1f} "
+            f"{summary.get('p95_ms', 0):>8.1f} {summary.get('p99_ms', 0):>8.1f} {summary['errors']:>5}"
+        )
+        previous = baseline["total"] if baseline and route == "total" else (baseline or {}).get("routes", {}).get(route)
+        if previous:
+            line += f" {change(summary['rps'], previous['rps']):>12} {change(summary.get('p95_ms'), previous.get('p95_ms')):>12}"
+        print(line)
+
+
+def change(current: Optional[float], previous: Optional[float]) -> str:
+    if not current or not previous:
+        return "-"
+    return f"{(current - previous) / previous * 100:+.1f}%"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load test the hardware routes")
+    parser.add_argument("--base-url", default=settings.base_url)
+    parser.add_argument("--database-url", default=os.environ["DATABASE_URL"])
+    parser.add_argument("--duration", type=float, default=30, help="measured seconds")
+    parser.add_argument("--warmup", type=float, default=5, help="seconds run before measuring")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--timeout", type=float, default=30)
+    parser.add_argument("--sample", type=int, default=2000, help="hardware rows sampled for IDs and searches")
+    parser.add_argument("--include-writes", action="store_true", help="also cycle statuses (modifies data)")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--output", help="write the results as JSON")
+    parser.add_argument("--compare", help="JSON results of an earlier run to compare against")
+    args = parser.parse_args()
+
+    if args.seed is not None:
+        random.seed(args.seed)
+    fixture = load_fixture(args.database_url, args.sample)
+    result = asyncio.run(run(args, fixture))
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    print_report(result, baseline)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2)
+        print(f"results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""Worker startup benchmark: import time and resident memory of app.main.
+
+Every measurement runs in a fresh interpreter, like a newly started worker.
+Import time comes from python -X importtime, peak RSS from getrusage. The
+script exits with status 1 when a limit is exceeded, so it can gate CI:
+
+    python -m benchmarks.startup
+    python -m benchmarks.startup --output startup-main.json
+    python -m benchmarks.startup --baseline startup-main.json --tolerance 0.15
+    python -m benchmarks.startup --max-import-ms 1500 --max-rss-mib 120
+
+Independent of the limits, it fails if a module that should only load on
+demand (see LAZY_MODULES) is imported at startup.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+from benchmarks.common import BENCH_ENV_DEFAULTS, PROJECT_ROOT
+
+# loaded on first use by the import/export/QR code paths in app/services/hardware.py
+LAZY_MODULES = ("pandas", "numpy", "openpyxl", "qrcode", "PIL")
+
+PROBE = """
+import resource, sys
+import app.main
+print("RSS_KIB", resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+print("MODULES", ",".join(sorted({name.split(".")[0] for name in sys.modules})))
+"""
+
+
+def run_probe() -> Tuple[List[Tuple[int, str]], int, List[str]]:
+    env = dict(os.environ)
+    for key, value in BENCH_ENV_DEFAULTS.items():
+        env.setdefault(key, value)
+    # metrics in multi-process mode would touch the filesystem on import
+    env.pop("PROMETHEUS_MULTIPROC_DIR", None)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", PROBE],
+        cwd=PROJECT_ROOT, env=env, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        sys.exit(f"importing app.main failed:\n{result.stderr[-3000:]}")
+
+    # "import time: self [us] | cumulative | imported package", nesting shown by indentation
+    top_level = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        # one space after the separator, two more per nesting level
+        if not name.startswith("   "):
+            top_level.append((int(cumulative), name.strip()))
+
+    rss_kib, modules = 0, []
+    for line in result.stdout.splitlines():
+        if line.startswith("RSS_KIB"):
+            rss_kib = int(line.split()[1])
+        elif line.startswith("MODULES"):
+            modules = line.split(" ", 1)[1].split(",")
+    return top_level, rss_kib, modules
+
+
+def measure(runs: int) -> Dict:
+    import_ms, rss_mib = [], []
+    slowest: Dict[str, List[float]] = {}
+    modules: List[str] = []
+    for _ in range(runs):
+        top_level, rss_kib, modules = run_probe()
+        import_ms.append(sum(cumulative for cumulative, _ in top_level) / 1000)
+        rss_mib.append(rss_kib / 1024)
+        for cumulative, name in top_level:
+            slowest.setdefault(name, []).append(cumulative / 1000)
+
+    ranked = sorted(slowest.items(), key=lambda item: statistics.median(item[1]), reverse=True)[:15]
+    return {
+        "python": sys.version.split()[0],
+        "runs": runs,
+        "import_ms": round(statistics.median(import_ms), 1),
+        "rss_mib": round(statistics.median(rss_mib), 1),
+        "slowest_imports_ms": {name: round(statistics.median(values), 1) for name, values in ranked},
+        "eager_lazy_modules": sorted(set(modules) & set(LAZY_MODULES)),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure worker startup time and memory")
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters to take the median of")
+    parser.add_argument("--max-import-ms", type=float, default=None)
+    parser.add_argument("--max-rss-mib", type=float, default=None)
+    parser.add_argument("--baseline", help="JSON written by --output of an earlier run")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="allowed regression against --baseline")
+    parser.add_argument("--output", help="write the results as JSON")
+    args = parser.parse_args()
+
+    result = measure(args.runs)
+    print(f"import app.main: {result['import_ms']:.1f} ms, peak RSS {result['rss_mib']:.1f} MiB (median of {args.runs})")
+    for name, elapsed_ms in result["slowest_imports_ms"].items():
+        print(f"  {elapsed_ms:>8.1f} ms  {name}")
+
+    failures = []
+    if result["eager_lazy_modules"]:
+        failures.append(f"imported at startup but should load on demand: {', '.join(result['eager_lazy_modules'])}")
+    limits = {"import_ms": args.max_import_ms, "rss_mib": args.max_rss_mib}
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        for key in limits:
+            allowed = baseline[key] * (1 + args.tolerance)
+            limits[key] = min(limits[key], allowed) if limits[key] is not None else allowed
+    for key, limit in limits.items():
+        if limit is not None and result[key] > limit:
+            failures.append(f"{key} {result[key]} exceeds {limit:.1f}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2)
+
+    if failures:
+        for failure in failures:
+            print(f"FAIL: {failure}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
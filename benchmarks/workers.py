@@ -0,0 +1,105 @@
+"""Throughput of the production server at different worker counts.
+
+Starts gunicorn with gunicorn.conf.py for each worker count, waits for
+/health, runs the load test mix from benchmarks/loadtest.py against it and
+stops it again. DATABASE_URL and SECRET_KEY are passed on to the server, so
+point them at a seeded database (scripts/seed_dummy_data.py).
+
+    python -m benchmarks.workers --workers 1,2,4,8 --duration 30 --concurrency 64
+    python -m benchmarks.workers --output workers.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import signal
+import subprocess
+import sys
+import time
+
+from benchmarks.common import PROJECT_ROOT, setup_environment
+
+setup_environment()
+
+import httpx  # noqa: E402
+
+from benchmarks import loadtest  # noqa: E402
+
+
+def start_server(workers: int, port: int) -> subprocess.Popen:
+    env = dict(os.environ, WEB_CONCURRENCY=str(workers), MAINTENANCE_ENABLED="false")
+    env.pop("PROMETHEUS_MULTIPROC_DIR", None)
+    return subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "--bind", f"127.0.0.1:{port}", "app.main:app"],
+        cwd=PROJECT_ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+
+
+def wait_until_healthy(base_url: str, server: subprocess.Popen, timeout: float = 60) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            sys.exit(f"gunicorn exited with status {server.returncode}")
+        try:
+            if httpx.get(f"{base_url}/health", timeout=1).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.25)
+    server.kill()
+    sys.exit(f"server did not become healthy within {timeout}s")
+
+
+def stop_server(server: subprocess.Popen) -> None:
+    server.send_signal(signal.SIGTERM)
+    try:
+        server.wait(timeout=40)
+    except subprocess.TimeoutExpired:
+        server.kill()
+        server.wait()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare throughput at several worker counts")
+    parser.add_argument("--workers", default="1,2,4,8")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--duration", type=float, default=30)
+    parser.add_argument("--warmup", type=float, default=5)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--sample", type=int, default=2000)
+    parser.add_argument("--output", help="write the results as JSON")
+    args = parser.parse_args()
+
+    base_url = f"http://127.0.0.1:{args.port}"
+    fixture = loadtest.load_fixture(os.environ["DATABASE_URL"], args.sample)
+    run_args = argparse.Namespace(
+        base_url=base_url, duration=args.duration, warmup=args.warmup, concurrency=args.concurrency,
+        timeout=30, include_writes=False,
+    )
+
+    results = {}
+    for workers in [int(count) for count in args.workers.split(",")]:
+        server = start_server(workers, args.port)
+        try:
+            wait_until_healthy(base_url, server)
+            results[workers] = asyncio.run(loadtest.run(run_args, fixture))
+        finally:
+            stop_server(server)
+
+    single = results.get(1, {}).get("total", {}).get("rps")
+    print(f"{'workers':>7} {'rps':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7} {'speedup':>8}")
+    for workers, result in results.items():
+        total = result["total"]
+        speedup = f"{total['rps'] / single:.2f}x" if single else "-"
+        print(
+            f"{workers:>7} {total['rps']:>9.1f} {total.get('p50_ms', 0):>8.1f} {total.get('p95_ms', 0):>8.1f} "
+            f"{total.get('p99_ms', 0):>8.1f} {total['errors']:>7} {speedup:>8}"
+        )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({str(workers): result for workers, result in results.items()}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,16 @@
+#!/bin/sh
+# Clones the primary on first start (pg_basebackup -R writes standby.signal and
+# the connection settings), then runs a hot standby that streams from it.
+set -e
+
+if [ ! -s "$PGDATA/PG_VERSION" ]; then
+    until PGPASSWORD="${REPLICATION_PASSWORD:-replicator}" pg_basebackup \
+        --host=db --username=replicator --pgdata="$PGDATA" \
+        --write-recovery-conf --wal-method=stream --checkpoint=fast; do
+        echo "Waiting for the primary..."
+        sleep 2
+    done
+    chmod 0700 "$PGDATA"
+fi
+
+exec postgres -c hot_standby=on
@@ -0,0 +1,128 @@
+"""Production server: gunicorn managing uvicorn workers.
+
+    gunicorn -c gunicorn.conf.py app.main:app
+
+The app is imported once in the master (preload_app) and the workers are
+forked from it, sharing its memory copy-on-write. The garbage collector is
+kept off while preloading and everything loaded so far is moved to the
+permanent generation with gc.freeze() before the first fork, so collections
+in the workers do not write to (and thereby copy) the shared pages.
+
+Workers restart after WORKER_MAX_REQUESTS requests (with jitter, so they do
+not all restart together) or once their RSS exceeds WORKER_MAX_RSS_MIB.
+WEB_CONCURRENCY overrides the worker count, which defaults to the CPU
+quota of the container.
+"""
+import gc
+import glob
+import logging
+import math
+import os
+import signal
+import threading
+import time
+
+logger = logging.getLogger("gunicorn.error")
+
+
+def cpu_quota() -> float:
+    """CPUs this process may use: the cgroup quota if there is one, else the affinity mask."""
+    available = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else (os.cpu_count() or 1)
+    try:
+        # cgroup v2: "<quota> <period>" or "max <period>"
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            quota, period = f.read().split()
+        if quota != "max":
+            return min(int(quota) / int(period), available)
+    except (OSError, ValueError):
+        pass
+    try:
+        with open("/sys/fs/cgroup/cpu/cpu.cfs_quota_us") as f:
+            quota = int(f.read())
+        with open("/sys/fs/cgroup/cpu/cpu.cfs_period_us") as f:
+            period = int(f.read())
+        if quota > 0:
+            return min(quota / period, available)
+    except (OSError, ValueError):
+        pass
+    return available
+
+
+# the port the images expose; override with GUNICORN_CMD_ARGS="--bind ..."
+bind = "0.0.0.0:8000"
+worker_class = "uvicorn.workers.UvicornWorker"
+# async workers keep a core busy each, more would only compete for it
+workers = int(os.getenv("WEB_CONCURRENCY", "0")) or max(1, math.ceil(cpu_quota()))
+preload_app = True
+
+max_requests = int(os.getenv("WORKER_MAX_REQUESTS", "10000"))
+max_requests_jitter = max_requests // 10
+worker_max_rss_mib = int(os.getenv("WORKER_MAX_RSS_MIB", "0"))
+
+timeout = int(os.getenv("WORKER_TIMEOUT", "60"))
+graceful_timeout = 30
+keepalive = 5
+accesslog = None  # requests are logged by AuditLoggingMiddleware
+
+multiproc_dir = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+
+if preload_app:
+    # no collections while the app is imported, see when_ready
+    gc.disable()
+
+
+def on_starting(server):
+    # values left behind by the workers of the previous run would be added to the new ones
+    if multiproc_dir:
+        os.makedirs(multiproc_dir, exist_ok=True)
+        for path in glob.glob(os.path.join(multiproc_dir, "*.db")):
+            os.remove(path)
+
+
+def on_reload(server):
+    # reloading re-reads this file, which disabled the collector again
+    gc.enable()
+
+
+def when_ready(server):
+    # runs in the master after preloading, before the first worker is forked
+    gc.freeze()
+    gc.enable()
+    server.log.info(f"Preloaded app, {gc.get_freeze_count()} objects frozen, starting {server.cfg.workers} workers")
+
+
+def post_fork(server, worker):
+    # connections opened in the master must not be shared with the children
+    from app.core.db import engine
+
+    engine.dispose(close=False)
+    if worker_max_rss_mib:
+        threading.Thread(target=watch_memory, args=(worker,), name="rss-watchdog", daemon=True).start()
+
+
+def child_exit(server, worker):
+    if multiproc_dir:
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
+
+
+def current_rss_mib() -> float:
+    with open("/proc/self/statm") as f:
+        resident_pages = int(f.read().split()[1])
+    return resident_pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+
+
+def watch_memory(worker, interval: float = 10.0) -> None:
+    """Ask the worker to shut down gracefully once it grows past worker_max_rss_mib."""
+    while True:
+        time.sleep(interval)
+        try:
+            rss_mib = current_rss_mib()
+        except OSError:
+            return
+        if rss_mib > worker_max_rss_mib:
+            logger.warning(f"Worker {worker.pid} uses {rss_mib:.0f} MiB (limit {worker_max_rss_mib}), restarting it")
+            # SIGTERM lets uvicorn finish in-flight requests, then the master forks a replacement
+            os.kill(os.getpid(), signal.SIGTERM)
+            return
@@ -1,14 +1,42 @@
-import random
-from datetime import datetime, timedelta, timezone
-import sys
+"""Seed dummy hardware, audit history and access logs.
+
+Rows are generated in batches from NumPy random arrays, in parallel worker
+processes, and loaded with COPY on PostgreSQL (batched executemany on other
+databases). Centers, end users, admins, request paths and the devices
+requests touch follow Zipf distributions, so a few values dominate like they
+do in production.
+
+    python scripts/seed_dummy_data.py --count 1000000 --workers 8
+    python scripts/seed_dummy_data.py --count 100000 --history 0.3 --access-logs 5000000 --log-days 90
+
+Every batch has its own seed derived from --seed, so the same arguments give
+the same data whatever the number of workers.
+"""
+import argparse
+import csv
+import io
+import json
+import multiprocessing
 import os
+import sys
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
-from sqlmodel import Session
+import numpy as np
+from sqlalchemy import func, insert, select, text
+from sqlalchemy.orm import Session
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
-from app.core.db import engine, create_db_and_tables
-from app.models.hardware import Hardware, StatusEnum, ModelEnum
+from app.audit import codec  # noqa: E402
+from app.audit.partitions import ensure_month_partitions, is_partitioned  # noqa: E402
+from app.audit.rollups import RollupAccumulator, RollupKey, merge_rollups  # noqa: E402
+from app.core.db import engine, create_db_and_tables  # noqa: E402
+from app.models.access_log import AccessLog  # noqa: E402
+from app.models.entity_change import EntityChange  # noqa: E402
+from app.models.hardware import Hardware, StatusEnum, ModelEnum  # noqa: E402
 
 
 CENTERS = [
@@ -69,152 +97,392 @@ ENDUSERS = [
     "Henry Lee",
 ]
 
+COMMENTS = [
+    "New device",
+    "Reimaged and updated",
+    "Ready for deployment",
+    "Needs repair",
+    "Assigned for testing",
+    "Returned from user",
+    "Spare unit",
+    "Under observation",
+    "Replacement scheduled",
+    "Awaiting parts",
+    "To be decommissioned",
+    "Pending QA",
+]
+
 MODELS = list(ModelEnum)
 STATUSES = list(StatusEnum)
+MODEL_PREFIXES = {
+    ModelEnum.Notebook: "nb",
+    ModelEnum.MFF: "mff",
+    ModelEnum.AllInOne: "aio",
+    ModelEnum.Backpack: "bp",
+    ModelEnum.DockingStation: "dock",
+    ModelEnum.Monitor: "mon",
+}
+# notebooks and monitors make up most of the stock
+MODEL_WEIGHTS = np.array([40, 10, 10, 10, 15, 15], dtype=float)
+# completed devices accumulate over the years
+STATUS_WEIGHTS = np.array([15, 5, 5, 15, 60], dtype=float)
+
+# (method, route, weight); "{hardware_id}" is replaced by a Zipf-distributed device id in
+# the logged path, the rollups count the route template like the middleware does
+REQUEST_MIX = [
+    ("GET", "/hardware", 40),
+    ("GET", "/hardware/{hardware_id}", 20),
+    ("GET", "/", 15),
+    ("POST", "/hardware/{hardware_id}/cycle-status", 6),
+    ("GET", "/hardware/{hardware_id}/history", 4),
+    ("GET", "/hardware/{hardware_id}/edit", 3),
+    ("POST", "/hardware/{hardware_id}/edit", 2),
+    ("GET", "/audit/logs", 2),
+    ("GET", "/hardware/export/excel", 1),
+    ("POST", "/hardware/import", 1),
+    ("GET", "/login", 3),
+    ("POST", "/login", 2),
+    ("GET", "/health", 1),
+]
+VISITORS = [f"visitor{index:03d}" for index in range(200)]
+# share of requests per hour of the day (UTC), office hours dominate
+HOUR_WEIGHTS = np.array([1, 1, 1, 1, 1, 2, 4, 8, 12, 14, 13, 12, 10, 12, 13, 12, 10, 7, 4, 3, 2, 2, 1, 1], dtype=float)
+USER_AGENTS = [
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/128.0 Safari/537.36",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:130.0) Gecko/20100101 Firefox/130.0",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 14_6) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.6 Safari/605.1.15",
+]
 
-VENDORS = ["Dell", "HP", "Lenovo", "Apple", "Acer", "ASUS", "MSI", "Samsung"]
-SERIES = ["ProBook", "ThinkPad", "Latitude", "EliteBook", "MacBook", "Veriton", "ProDesk", "OptiPlex"]
-
-
-def random_mac() -> str:
-    return ":".join(f"{random.randint(0, 255):02x}" for _ in range(6))
-
-
-def random_ip() -> str:
-    return f"{random.randint(10, 223)}.{random.randint(0, 255)}.{random.randint(0, 255)}.{random.randint(1, 254)}"
-
-
-def random_uuid() -> str:
-    import uuid
-
-    return str(uuid.uuid4())
-
-
-def random_serial() -> str:
-    prefix = random.choice(["SN", "SRL", "S/N"]).replace("/", "")
-    return f"{prefix}-{random.randint(100000, 999999)}-{random.randint(1000, 9999)}"
-
-
-def random_hostname(model: ModelEnum) -> str:
-    model_prefix = {
-        ModelEnum.Notebook: "nb",
-        ModelEnum.MFF: "mff",
-        ModelEnum.AllInOne: "aio",
-        ModelEnum.Backpack: "bp",
-        ModelEnum.DockingStation: "dock",
-        ModelEnum.Monitor: "mon",
-    }[model]
-    return f"{model_prefix}-{random.randint(1000, 9999)}"
+HARDWARE_COLUMNS = [
+    "id", "hostname", "mac", "ip", "ticket", "po_ticket", "uuid", "center", "serial_number", "model",
+    "status", "enduser", "admin", "comment", "missing", "created_at", "updated_at", "shipped_at",
+]
+CHANGE_COLUMNS = ["timestamp", "action", "entity_name", "entity_id", "changes", "username", "method", "path"]
+ACCESS_LOG_COLUMNS = [
+    "timestamp", "method", "path", "status_code", "response_time_ms", "username",
+    "remote_addr", "user_agent", "request_body_size", "response_body_size",
+]
 
 
-def random_comment() -> str:
-    comments = [
-        "New device",
-        "Reimaged and updated",
-        "Ready for deployment",
-        "Needs repair",
-        "Assigned for testing",
-        "Returned from user",
-        "Spare unit",
-        "Under observation",
-        "Replacement scheduled",
-        "Awaiting parts",
-        "To be decommissioned",
-        "Pending QA",
+def zipf_weights(count: int, exponent: float) -> np.ndarray:
+    weights = 1.0 / np.arange(1, count + 1) ** exponent
+    return weights / weights.sum()
+
+
+def zipf_pick(rng: np.random.Generator, values: List[Any], size: int, exponent: float) -> List[Any]:
+    # the rank order is shuffled per value list, not per batch, so every batch favours the same values
+    order = np.random.default_rng(len(values)).permutation(len(values))
+    picks = rng.choice(len(values), size=size, p=zipf_weights(len(values), exponent))
+    return [values[order[index]] for index in picks]
+
+
+def optional(values: List[Any], present: np.ndarray) -> List[Any]:
+    return [value if keep else None for value, keep in zip(values, present)]
+
+
+def seconds(values: np.ndarray) -> np.ndarray:
+    return values.astype("timedelta64[s]")
+
+
+def hardware_batch(first_id: int, size: int, seed: int, now: np.datetime64, run_tag: str, zipf: float) -> Dict[str, Any]:
+    rng = np.random.default_rng(seed)
+    ids = np.arange(first_id, first_id + size)
+    model_index = rng.choice(len(MODELS), size=size, p=MODEL_WEIGHTS / MODEL_WEIGHTS.sum())
+    status_index = rng.choice(len(STATUSES), size=size, p=STATUS_WEIGHTS / STATUS_WEIGHTS.sum())
+    models = [MODELS[index] for index in model_index]
+    statuses = [STATUSES[index] for index in status_index]
+
+    created_at = now - seconds(rng.integers(0, 365 * 86400, size))
+    updated_at = np.minimum(created_at + seconds(rng.integers(0, 60 * 86400, size)), now)
+    has_shipped = status_index >= STATUSES.index(StatusEnum.SHIPPED)
+    shipped_at = np.minimum(created_at + seconds(rng.integers(0, 30 * 86400, size)), now)
+    updated_at = np.where(has_shipped, np.maximum(updated_at, shipped_at), updated_at)
+    shipped_at = np.where(has_shipped, shipped_at, np.datetime64("NaT"))
+
+    macs = rng.integers(0, 256, size=(size, 6))
+    ips = rng.integers(1, 255, size=(size, 4))
+    uuids = rng.integers(0, 256, size=(size, 16), dtype=np.uint8)
+    tickets = rng.integers(100000, 999999, size=(size, 2))
+    has_enduser = (status_index >= STATUSES.index(StatusEnum.RESERVED)) & (rng.random(size) < 0.8)
+
+    return {
+        "id": ids.tolist(),
+        "hostname": [f"{MODEL_PREFIXES[model]}-{device_id:07d}" for model, device_id in zip(models, ids.tolist())],
+        "mac": optional([":".join(f"{b:02x}" for b in row) for row in macs.tolist()], rng.random(size) < 0.85),
+        "ip": optional([f"10.{a}.{b}.{c}" for a, b, c, _ in ips.tolist()], rng.random(size) < 0.85),
+        "ticket": optional([f"TKT-{t}" for t, _ in tickets.tolist()], rng.random(size) < 0.6),
+        "po_ticket": optional([f"PO-{t}" for _, t in tickets.tolist()], rng.random(size) < 0.4),
+        "uuid": optional([str(uuid.UUID(bytes=row.tobytes())) for row in uuids], rng.random(size) < 0.9),
+        "center": optional(zipf_pick(rng, CENTERS, size, zipf), rng.random(size) < 0.85),
+        # run_tag keeps serials unique when seeding into a database that already has data
+        "serial_number": [f"SN-{run_tag}-{device_id:09d}" for device_id in ids.tolist()],
+        "model": [model.value for model in models],
+        "status": [status.value for status in statuses],
+        "enduser": optional(zipf_pick(rng, ENDUSERS, size, zipf), has_enduser),
+        "admin": zipf_pick(rng, ADMINS, size, zipf),
+        "comment": optional(rng.choice(COMMENTS, size=size).tolist(), rng.random(size) < 0.5),
+        "missing": (rng.random(size) < 0.1).tolist(),
+        "created_at": created_at,
+        "updated_at": updated_at,
+        "shipped_at": shipped_at,
+        "_status_index": status_index,
+    }
+
+
+def history_batch(hardware: Dict[str, Any], seed: int, ratio: float, zipf: float) -> Dict[str, Any]:
+    """CREATE plus one UPDATE per status step, and some comment edits, for a share of the devices."""
+    rng = np.random.default_rng(seed)
+    picked = np.flatnonzero(rng.random(len(hardware["id"])) < ratio)
+    columns: Dict[str, list] = {name: [] for name in CHANGE_COLUMNS}
+
+    def add(timestamp, action, device_id, payload, username, method, path):
+        columns["timestamp"].append(timestamp)
+        columns["action"].append(action)
+        columns["entity_name"].append("Hardware")
+        columns["entity_id"].append(str(device_id))
+        columns["changes"].append(payload)
+        columns["username"].append(username)
+        columns["method"].append(method)
+        columns["path"].append(path)
+
+    for index in picked.tolist():
+        device_id = hardware["id"][index]
+        created_at = hardware["created_at"][index]
+        updated_at = hardware["updated_at"][index]
+        steps = int(hardware["_status_index"][index])
+        edits = int(rng.geometric(0.5)) - 1
+        span = max(int((updated_at - created_at) / np.timedelta64(1, "s")), 1)
+        offsets = np.sort(rng.integers(0, span, steps + edits))
+        kinds = rng.permutation(["status"] * steps + ["comment"] * edits)
+        users = zipf_pick(rng, ADMINS, steps + edits + 1, zipf)
+
+        add(created_at, "CREATE", device_id, codec.encode_create({
+            "hostname": hardware["hostname"][index],
+            "serial_number": hardware["serial_number"][index],
+            "model": hardware["model"][index],
+            "status": StatusEnum.IN_STOCK.value,
+            "center": hardware["center"][index],
+        }), users[0], "POST", "/hardware/add")
+        status = 0
+        for offset, kind, username in zip(offsets.tolist(), kinds.tolist(), users[1:]):
+            timestamp = created_at + np.timedelta64(offset, "s")
+            if kind == "status":
+                payload = codec.encode_update({"status": (STATUSES[status].value, STATUSES[status + 1].value)})
+                status += 1
+                add(timestamp, "UPDATE", device_id, payload, username, "POST", f"/hardware/{device_id}/cycle-status")
+            else:
+                payload = codec.encode_update({"comment": (None, COMMENTS[offset % len(COMMENTS)])})
+                add(timestamp, "UPDATE", device_id, payload, username, "POST", f"/hardware/{device_id}/edit")
+
+    columns["timestamp"] = np.array(columns["timestamp"], dtype="datetime64[s]")
+    return columns
+
+
+def access_log_batch(size: int, seed: int, now: np.datetime64, days: int, max_device_id: int, zipf: float) -> Dict[str, Any]:
+    rng = np.random.default_rng(seed)
+    weights = np.array([weight for _, _, weight in REQUEST_MIX], dtype=float)
+    request_index = rng.choice(len(REQUEST_MIX), size=size, p=weights / weights.sum())
+    # popular devices get most of the traffic
+    device_ids = (rng.zipf(1.0 + zipf, size) - 1) % max(max_device_id, 1) + 1
+
+    day_offsets = rng.integers(0, days, size) * 86400
+    hour_offsets = rng.choice(24, size=size, p=HOUR_WEIGHTS / HOUR_WEIGHTS.sum()) * 3600
+    today = now.astype("datetime64[D]").astype("datetime64[s]")
+    timestamps = today - seconds(day_offsets) + seconds(hour_offsets + rng.integers(0, 3600, size))
+    timestamps = np.minimum(timestamps, now)
+
+    status_roll = rng.random(size)
+    status_codes = np.select([status_roll < 0.002, status_roll < 0.012, status_roll < 0.04], [500, 404, 302], 200)
+    response_times = rng.lognormal(mean=np.log(25), sigma=0.8, size=size)
+    # exports and imports are an order of magnitude slower
+    slow = np.isin(request_index, [index for index, (_, path, _) in enumerate(REQUEST_MIX) if "export" in path or "import" in path])
+    response_times = np.where(slow, response_times * 20, response_times)
+    logged_in = rng.random(size) < 0.95
+
+    return {
+        "timestamp": timestamps,
+        "method": [REQUEST_MIX[index][0] for index in request_index],
+        "path": [REQUEST_MIX[index][1].replace("{hardware_id}", str(device_id)) for index, device_id in zip(request_index.tolist(), device_ids.tolist())],
+        "route": [REQUEST_MIX[index][1] for index in request_index.tolist()],
+        "status_code": status_codes.tolist(),
+        "response_time_ms": np.round(response_times, 2).tolist(),
+        "username": optional(zipf_pick(rng, ADMINS + VISITORS, size, zipf), logged_in),
+        "remote_addr": [f"10.20.{a}.{b}" for a, b in rng.integers(0, 255, size=(size, 2)).tolist()],
+        "user_agent": rng.choice(USER_AGENTS, size=size).tolist(),
+        "request_body_size": np.where(rng.random(size) < 0.2, rng.integers(50, 5000, size), 0).tolist(),
+        "response_body_size": rng.integers(500, 200000, size).tolist(),
+    }
+
+
+def timestamp_column(values: np.ndarray, for_copy: bool) -> List[Any]:
+    if for_copy:
+        strings = np.datetime_as_string(values, unit="s")
+        return [None if value == "NaT" else f"{value}+00" for value in strings.tolist()]
+    return [None if value is None else value.replace(tzinfo=timezone.utc) for value in values.astype("datetime64[us]").tolist()]
+
+
+def render(columns: Dict[str, Any], names: List[str], for_copy: bool):
+    """CSV text for COPY, or a list of row dicts for executemany."""
+    values = []
+    for name in names:
+        column = columns[name]
+        if isinstance(column, np.ndarray) and np.issubdtype(column.dtype, np.datetime64):
+            column = timestamp_column(column, for_copy)
+        elif name == "changes":
+            column = [json.dumps(payload) for payload in column] if for_copy else column
+        values.append(column)
+    rows = zip(*values)
+    if not for_copy:
+        return [dict(zip(names, row)) for row in rows]
+    output = io.StringIO()
+    # None is written unquoted and empty, which COPY ... (FORMAT csv) reads as NULL
+    csv.writer(output, lineterminator="\n").writerows(rows)
+    return output.getvalue()
+
+
+def build_chunk(job: Tuple) -> List[Tuple[str, Any, int]]:
+    kind, options = job[0], job[1]
+    for_copy = options["copy"]
+    if kind == "hardware":
+        first_id, size, seed = job[2:]
+        hardware = hardware_batch(first_id, size, seed, options["now"], options["run_tag"], options["zipf"])
+        chunks = [("hardware", render(hardware, HARDWARE_COLUMNS, for_copy), size)]
+        if options["history"] > 0:
+            history = history_batch(hardware, seed + 1, options["history"], options["zipf"])
+            chunks.append(("entity_changes", render(history, CHANGE_COLUMNS, for_copy), len(history["action"])))
+        return chunks
+    size, seed = job[2:]
+    logs = access_log_batch(size, seed, options["now"], options["log_days"], options["max_device_id"], options["zipf"])
+    return [("access_logs", render(logs, ACCESS_LOG_COLUMNS, for_copy), size), ("request_rollups", rollup_batch(logs), size)]
+
+
+TABLES = {
+    "hardware": (Hardware.__table__, HARDWARE_COLUMNS),
+    "entity_changes": (EntityChange.__table__, CHANGE_COLUMNS),
+    "access_logs": (AccessLog.__table__, ACCESS_LOG_COLUMNS),
+}
+
+
+def load(connection, table_name: str, chunk: Any, for_copy: bool) -> None:
+    table, columns = TABLES[table_name]
+    if for_copy:
+        with connection.connection.cursor() as cursor:
+            cursor.copy_expert(f"COPY {table_name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", io.StringIO(chunk))
+    else:
+        connection.execute(insert(table), chunk)
+
+
+def run_jobs(jobs: List[Tuple], workers: int) -> Iterable[List[Tuple[str, Any, int]]]:
+    if workers <= 1:
+        yield from map(build_chunk, jobs)
+        return
+    with multiprocessing.Pool(workers) as pool:
+        # generation runs ahead in the workers while this process loads finished batches in order
+        yield from pool.imap(build_chunk, jobs)
+
+
+def rollup_batch(logs: Dict[str, Any]) -> Dict[RollupKey, dict]:
+    """Hourly rollups of one access log batch, recorded per route template with latency histograms."""
+    accumulator = RollupAccumulator()
+    timestamps = logs["timestamp"].astype("datetime64[us]").tolist()
+    for timestamp, route, method, status_code, response_time_ms in zip(
+        timestamps, logs["route"], logs["method"], logs["status_code"], logs["response_time_ms"]
+    ):
+        accumulator.record(timestamp.replace(tzinfo=timezone.utc), route, method, status_code, response_time_ms)
+    return accumulator.drain()
+
+
+def seed(
+    count: int = 1000,
+    history: float = 0.0,
+    access_logs: int = 0,
+    log_days: int = 30,
+    batch_size: int = 20000,
+    workers: Optional[int] = None,
+    zipf: float = 1.1,
+    seed_value: int = 42,
+) -> None:
+    create_db_and_tables()
+    for_copy = engine.dialect.name == "postgresql"
+    workers = workers if workers is not None else max((os.cpu_count() or 2) - 1, 1)
+
+    with engine.connect() as connection:
+        first_id = (connection.execute(select(func.max(Hardware.id))).scalar() or 0) + 1
+    options = {
+        "copy": for_copy,
+        "now": np.datetime64(datetime.now(timezone.utc).replace(tzinfo=None), "s"),
+        "run_tag": f"{seed_value:04x}{first_id:x}",
+        "zipf": zipf,
+        "history": history,
+        "log_days": log_days,
+        "max_device_id": first_id - 1 + count,
+    }
+
+    jobs = [
+        ("hardware", options, first_id + start, min(batch_size, count - start), seed_value + start)
+        for start in range(0, count, batch_size)
+    ]
+    jobs += [
+        ("access_logs", options, min(batch_size, access_logs - start), seed_value + 7919 + start)
+        for start in range(0, access_logs, batch_size)
     ]
-    return random.choice(comments)
-
-
-def random_ticket(prefix: str = "TKT") -> str:
-    return f"{prefix}-{random.randint(100000, 999999)}"
-
-
-def random_center() -> str:
-    return random.choice(CENTERS)
-
-
-def random_admin() -> str:
-    return random.choice(ADMINS)
-
-
-def random_enduser() -> str:
-    return random.choice(ENDUSERS)
-
-
-def random_vendor_model(model: ModelEnum) -> str:
-    vendor = random.choice(VENDORS)
-    series = random.choice(SERIES)
-    return f"{vendor} {series}"
-
-
-def random_timestamp(days_back: int = 365) -> datetime:
-    now = datetime.now(timezone.utc)
-    delta_days = random.randint(0, days_back)
-    delta_seconds = random.randint(0, 86400)
-    return now - timedelta(days=delta_days, seconds=delta_seconds)
-
-
-def generate_hardware() -> Hardware:
-    model = random.choice(MODELS)
-    status = random.choice(STATUSES)
-
-    created_at = random_timestamp(365)
-    # updated_at should be at or after created_at
-    updated_at = created_at + timedelta(days=random.randint(0, 60), seconds=random.randint(0, 86400))
-    if updated_at > datetime.now(timezone.utc):
-        updated_at = datetime.now(timezone.utc)
-
-    shipped_at = None
-    if status == StatusEnum.SHIPPED:
-        # Shipped sometime after created_at
-        shipped_at = created_at + timedelta(days=random.randint(0, 30))
-        if shipped_at > updated_at:
-            updated_at = shipped_at
-
-    return Hardware(
-        hostname=random_hostname(model),
-        mac=random_mac() if random.random() < 0.85 else None,
-        ip=random_ip() if random.random() < 0.85 else None,
-        ticket=random_ticket("TKT") if random.random() < 0.6 else None,
-        po_ticket=random_ticket("PO") if random.random() < 0.4 else None,
-        uuid=random_uuid() if random.random() < 0.9 else None,
-        center=random_center() if random.random() < 0.85 else None,
-        serial_number=random_serial(),
-        model=model,
-        status=status,
-        enduser=(
-            random_enduser()
-            if status in {StatusEnum.RESERVED, StatusEnum.SHIPPED, StatusEnum.COMPLETED} and random.random() < 0.8
-            else None
-        ),
-        admin=random_admin(),
-        comment=random_comment() if random.random() < 0.5 else None,
-        missing=True if random.random() < 0.1 else False,
-        created_at=created_at,
-        updated_at=updated_at,
-        shipped_at=shipped_at,
-    )
-
 
-def seed(count: int = 1000) -> None:
-    create_db_and_tables()
-    created = 0
-    with Session(engine) as session:
-        for _ in range(count):
-            hw = generate_hardware()
-            session.add(hw)
-            created += 1
-            if created % 200 == 0:
-                session.commit()
-        session.commit()
-    print(f"Seeded {created} hardware records.")
+    if access_logs and for_copy:
+        with Session(engine) as db:
+            if is_partitioned(db):
+                ensure_month_partitions(db, months_ahead=0, months_back=log_days // 28 + 1)
+
+    started = time.perf_counter()
+    loaded = {name: 0 for name in TABLES}
+    rollups = RollupAccumulator()
+    with engine.begin() as connection:
+        for chunks in run_jobs(jobs, workers):
+            for table_name, chunk, rows in chunks:
+                if table_name == "request_rollups":
+                    # restore() adds the batch's counters to the ones collected so far
+                    rollups.restore(chunk)
+                    continue
+                load(connection, table_name, chunk, for_copy)
+                loaded[table_name] += rows
+            print(
+                f"\r{loaded['hardware']}/{count} hardware, {loaded['entity_changes']} changes, "
+                f"{loaded['access_logs']}/{access_logs} access logs",
+                end="",
+                flush=True,
+            )
+        if for_copy and count:
+            # ids were set explicitly, move the sequence past them
+            connection.execute(text("SELECT setval(pg_get_serial_sequence('hardware', 'id'), (SELECT max(id) FROM hardware))"))
+        if access_logs:
+            # merged like the app's flushes: counts and histograms add up, latency_max_ms keeps the maximum
+            with Session(bind=connection) as db:
+                merge_rollups(db, rollups.drain())
+
+    elapsed = time.perf_counter() - started
+    total = sum(loaded.values())
+    print(f"\nSeeded {loaded['hardware']} hardware records, {loaded['entity_changes']} entity changes and "
+          f"{loaded['access_logs']} access logs in {elapsed:.1f}s ({total / max(elapsed, 1e-9):.0f} rows/s).")
 
 
 if __name__ == "__main__":
-    import argparse
-
     parser = argparse.ArgumentParser(description="Seed dummy hardware data")
     parser.add_argument("--count", type=int, default=1000, help="Number of records to create (default: 1000)")
+    parser.add_argument("--history", type=float, default=0.0, help="Share of devices given an audit history (0-1)")
+    parser.add_argument("--access-logs", type=int, default=0, help="Number of access log rows to create")
+    parser.add_argument("--log-days", type=int, default=30, help="Days the access logs are spread over")
+    parser.add_argument("--batch-size", type=int, default=20000)
+    parser.add_argument("--workers", type=int, default=None, help="Generator processes (default: CPUs - 1)")
+    parser.add_argument("--zipf", type=float, default=1.1, help="Skew of centers, users, paths and devices")
+    parser.add_argument("--seed", type=int, default=42)
     args = parser.parse_args()
 
-    seed(args.count)
+    seed(
+        args.count,
+        history=args.history,
+        access_logs=args.access_logs,
+        log_days=args.log_days,
+        batch_size=args.batch_size,
+        workers=args.workers,
+        zipf=args.zipf,
+        seed_value=args.seed,
+    )
@@ -0,0 +1,76 @@
+"""Fixtures for the test suite.
+
+    pip install -r requirements-test.txt
+    pytest tests
+
+The app reads its configuration from the environment at import time, so it
+is set here before anything from app is imported. It is overwritten, not
+defaulted, so a .env next to the project never points the tests at a real
+database: they run against a throwaway SQLite file whose tables are
+recreated for every test.
+"""
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+TEST_DATA_DIR = tempfile.mkdtemp(prefix="inventory-tests-")
+
+TEST_ENV = {
+    # TestClient runs sync routes and streaming bodies in other threads
+    "DATABASE_URL": f"sqlite:///{TEST_DATA_DIR}/test.sqlite?check_same_thread=false",
+    "BASE_URL": "http://testserver",
+    "SECRET_KEY": "test-secret-key",
+    "APP_HOST": "127.0.0.1",
+    "APP_PORT": "8000",
+    "DEBUG": "false",
+    "LDAP_URL": "ldap://localhost",
+    "LDAP_BASE_DN": "DC=example,DC=org",
+    "LDAP_BIND_DN": "CN=test,DC=example,DC=org",
+    "LDAP_BIND_PASSWORD": "test",
+    "LDAP_DOMAIN": "example.org",
+    "ADMIN_GROUP": "CN=GG-Inventory-Admin,DC=example,DC=org",
+    "VISITOR_GROUP": "CN=GG-Inventory-Visitor,DC=example,DC=org",
+    # no background loops: tests drive the job queue themselves
+    "MAINTENANCE_ENABLED": "false",
+    "JOBS_ENABLED": "false",
+    "AUDIT_LOG_RULES": "",
+}
+
+os.environ.update(TEST_ENV)
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+import pytest  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+from sqlmodel import SQLModel  # noqa: E402
+
+import app.models  # noqa: E402,F401
+from app.audit.listeners import initialize_audit_listeners  # noqa: E402
+from app.core.db import engine  # noqa: E402
+
+
+# pysqlite opens transactions lazily and breaks SAVEPOINTs (begin_nested), the
+# SQLAlchemy docs' workaround: leave transaction control to SQLAlchemy
+@event.listens_for(engine, "connect")
+def _disable_pysqlite_transactions(dbapi_connection, connection_record):
+    dbapi_connection.isolation_level = None
+
+
+@event.listens_for(engine, "begin")
+def _begin_sqlite_transaction(connection):
+    connection.exec_driver_sql("BEGIN")
+
+
+@pytest.fixture(scope="session", autouse=True)
+def audit_listeners():
+    initialize_audit_listeners()
+
+
+@pytest.fixture
+def db_engine():
+    SQLModel.metadata.drop_all(engine)
+    SQLModel.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
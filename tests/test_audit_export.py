@@ -0,0 +1,56 @@
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.audit import codec
+from app.core.config import settings
+from app.core.db import SessionLocal
+from app.factory import create_app
+from app.models.entity_change import EntityChange
+from app.services.auth import AuthService, UserRole
+
+
+@pytest.fixture
+def admin_client(db_engine):
+    # the whole middleware stack of create_app, without the lifespan's background loops
+    client = TestClient(create_app())
+    token = AuthService().create_session_token({"username": "alice", "role": UserRole.ADMINISTRATOR, "user_id": None})
+    client.cookies.set(settings.session_cookie_name, token)
+    return client
+
+
+def add_change(db, entity_id: int, age: timedelta, old: str, new: str) -> int:
+    change = EntityChange(
+        timestamp=datetime.now(timezone.utc) - age,
+        action="UPDATE",
+        entity_name="Hardware",
+        entity_id=str(entity_id),
+        changes=codec.encode_update({"status": (old, new)}),
+        username="alice",
+    )
+    db.add(change)
+    db.flush()
+    return change.id
+
+
+def test_export_streams_settled_changes(admin_client):
+    with SessionLocal() as db:
+        first = add_change(db, 1, timedelta(hours=2), "IN_STOCK", "RESERVED")
+        second = add_change(db, 2, timedelta(hours=1), "RESERVED", "IMAGING")
+        # too young to export: a lower id could still be uncommitted
+        add_change(db, 3, timedelta(seconds=1), "IMAGING", "SHIPPED")
+        db.commit()
+
+    response = admin_client.get("/audit/export", params={"kind": "changes"}, follow_redirects=False)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    records = [json.loads(line) for line in response.text.splitlines()]
+    assert [record["id"] for record in records] == [first, second]
+    assert records[0]["entity_id"] == "1"
+    assert records[0]["changes"] == {"status": {"old": "IN_STOCK", "new": "RESERVED"}}
+
+    response = admin_client.get("/audit/export", params={"kind": "changes", "since_id": first})
+    assert [json.loads(line)["id"] for line in response.text.splitlines()] == [second]
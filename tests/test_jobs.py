@@ -0,0 +1,56 @@
+from app.core.config import settings
+from app.core.db import SessionLocal
+from app.core.jobs import JobQueue
+from app.models.hardware import Hardware, ModelEnum, StatusEnum
+from app.models.job import SUCCEEDED, Job
+from app.services.jobs import HARDWARE_IMPORT, register_job_handlers
+
+
+def import_item(index: int, **overrides) -> dict:
+    item = {
+        "hostname": f"nb-{index:04d}",
+        "serial_number": f"SN{index:06d}",
+        "model": ModelEnum.Notebook.value,
+        "status": StatusEnum.IN_STOCK.value,
+        "center": "HQ",
+        "missing": False,
+    }
+    item.update(overrides)
+    return item
+
+
+def test_import_job_runs_in_chunks(db_engine, monkeypatch):
+    monkeypatch.setattr(settings, "job_import_chunk_size", 2)
+    with SessionLocal() as db:
+        db.add(Hardware(**import_item(0, model=ModelEnum.Notebook, status=StatusEnum.IN_STOCK), admin="alice"))
+        db.commit()
+
+    # 7 rows in 4 chunks: 5 new devices, one update of SN000000 and one invalid row
+    items = [import_item(index) for index in range(6)] + [import_item(6, model="Toaster")]
+    queue = JobQueue(db_engine)
+    register_job_handlers(queue)
+    job_id = queue.enqueue(
+        HARDWARE_IMPORT,
+        {"items": items, "total_rows": 8, "errors": ["Row 9: Missing serial number"]},
+        username="alice",
+        total=len(items),
+    )
+
+    assert queue.run_next()
+    assert not queue.run_next()
+
+    with SessionLocal() as db:
+        job = db.get(Job, job_id)
+        assert job.status == SUCCEEDED
+        assert job.error is None
+        assert job.attempts == 1
+        assert job.progress_done == job.progress_total == len(items)
+        assert job.finished_at is not None
+        assert job.result["total_rows"] == 8
+        assert job.result["created"] == 5
+        assert job.result["updated"] == 1
+        assert job.result["errors"][0] == "Row 9: Missing serial number"
+        assert len(job.result["errors"]) == 2
+        assert job.result["errors"][1].startswith("Serial SN000006:")
+
+        assert db.query(Hardware).count() == 6